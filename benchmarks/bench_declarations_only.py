@@ -0,0 +1,80 @@
+"""Benchmark declarations-only extraction against a full parse.
+
+Runs nimdocinfo with and without ``--declarations-only`` over the given Nim
+files. Without arguments it uses a synthetic implementation-heavy module plus
+the largest modules of the Nim standard library, when the library can be
+located through ``nim dump``.
+
+Usage:
+    python benchmarks/bench_declarations_only.py [FILE.nim ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from synthetic import write_module  # noqa: E402
+
+from mkdocstrings_handlers.nim.collector import NimCollector  # noqa: E402
+
+
+def stdlib_modules(count: int) -> list[Path]:
+    """Return the largest pure-library modules of the installed Nim, if found."""
+    try:
+        result = subprocess.run(
+            ["nim", "dump", "--dump.format:json", "-"],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+        libpath = Path(json.loads(result.stdout)["libpath"])
+    except (OSError, ValueError, KeyError, subprocess.TimeoutExpired):
+        return []
+    modules = sorted((libpath / "pure").glob("*.nim"), key=lambda p: p.stat().st_size)
+    return modules[-count:]
+
+
+def best_time(args: list[str], runs: int) -> float:
+    """Return the best wall time of running args."""
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(args, check=True, capture_output=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*", type=Path)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = args.files or [
+            write_module(Path(tmp) / "synthetic.nim", 5_000, body_lines=40),
+            *stdlib_modules(5),
+        ]
+        binary = str(NimCollector([], Path(tmp))._ensure_nimdocinfo_compiled())
+
+        print(f"{'module':<24} {'KB':>8} {'full (s)':>10} {'decls (s)':>10} {'speedup':>8}")
+        for path in files:
+            full = best_time([binary, str(path)], args.runs)
+            decls = best_time([binary, "--declarations-only", str(path)], args.runs)
+            size_kb = path.stat().st_size / 1024
+            print(
+                f"{path.name:<24} {size_kb:>8.0f} {full:>10.3f} {decls:>10.3f} {full / decls:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark nimdocinfo serialization on a large synthetic module.
+
+Measures wall time and peak RSS of the extractor on a synthetic module
+(50,000 entries by default). Pass ``--baseline`` with the path of another
+nimdocinfo binary (for example one built from an older checkout) to compare
+the two side by side.
+
+Usage:
+    python benchmarks/bench_json_output.py [--entries N] [--baseline PATH]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from synthetic import write_module  # noqa: E402
+
+from mkdocstrings_handlers.nim.collector import NimCollector  # noqa: E402
+
+
+def measure(binary: Path, source: Path, runs: int) -> tuple[float, int, int]:
+    """Run binary on source and return (best seconds, peak RSS KiB, output bytes)."""
+    best = float("inf")
+    peak_rss = 0
+    output_size = 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.Popen([str(binary), str(source)], stdout=subprocess.PIPE)
+        assert proc.stdout is not None
+        output_size = len(proc.stdout.read())
+        _, status, rusage = os.wait4(proc.pid, 0)
+        elapsed = time.perf_counter() - start
+        if status != 0:
+            raise SystemExit(f"{binary} exited with status {status}")
+        best = min(best, elapsed)
+        peak_rss = max(peak_rss, rusage.ru_maxrss)
+    return best, peak_rss, output_size
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=50_000)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--baseline", type=Path, help="nimdocinfo binary to compare against")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = write_module(Path(tmp) / "synthetic.nim", args.entries)
+        binaries = {"current": NimCollector([], Path(tmp))._ensure_nimdocinfo_compiled()}
+        if args.baseline:
+            binaries["baseline"] = args.baseline
+
+        print(f"{args.entries} entries, {source.stat().st_size / 1e6:.1f} MB source")
+        print(f"{'binary':<10} {'time (s)':>10} {'peak RSS (MiB)':>16} {'output (MB)':>12}")
+        for label, binary in binaries.items():
+            seconds, rss_kib, size = measure(binary, source, args.runs)
+            print(f"{label:<10} {seconds:>10.2f} {rss_kib / 1024:>16.1f} {size / 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
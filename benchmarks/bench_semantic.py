@@ -0,0 +1,81 @@
+"""Benchmark the semantic backend against the AST extractor.
+
+For each module, times:
+
+- ``ast``: nimdocinfo alone (the default backend)
+- ``cold``: ``nim jsondoc`` with an empty nimcache
+- ``recompile``: ``nim jsondoc`` with a populated nimcache (module changed)
+- ``warm``: jsondoc output reused from the nimcache (module unchanged)
+
+Without arguments it uses a synthetic module.
+
+Usage:
+    python benchmarks/bench_semantic.py [FILE.nim ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from synthetic import write_module  # noqa: E402
+
+from mkdocstrings_handlers.nim import semantic  # noqa: E402
+from mkdocstrings_handlers.nim.collector import NimCollector  # noqa: E402
+
+
+def timed(func, *args) -> float:
+    """Return the wall time of calling func(*args)."""
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*", type=Path)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = args.files or [write_module(Path(tmp) / "synthetic.nim", 2_000, body_lines=10)]
+        binary = str(NimCollector([], Path(tmp))._ensure_nimdocinfo_compiled())
+        nimcache = Path(tmp) / "nimcache"
+
+        def extract(path: Path) -> None:
+            subprocess.run([binary, str(path)], check=True, capture_output=True)
+
+        def jsondoc(path: Path) -> None:
+            # Keyed on the module alone: the benchmark modules import nothing from the project
+            inputs_key = hashlib.sha1(path.read_bytes()).hexdigest()
+            semantic.run_jsondoc(
+                path, nimcache=nimcache, search_paths=[], timeout=600, inputs_key=inputs_key
+            )
+
+        print(
+            f"{'module':<24} {'ast (s)':>9} {'cold (s)':>9} {'recompile (s)':>14} {'warm (s)':>9}"
+        )
+        for path in files:
+            ast = cold = recompile = warm = float("inf")
+            for _ in range(args.runs):
+                ast = min(ast, timed(extract, path))
+                shutil.rmtree(nimcache, ignore_errors=True)
+                cold = min(cold, timed(jsondoc, path))
+                # Keep the compiler's cache but drop the reusable output
+                shutil.rmtree(nimcache / "jsondoc")
+                recompile = min(recompile, timed(jsondoc, path))
+                warm = min(warm, timed(jsondoc, path))
+            print(f"{path.name:<24} {ast:>9.3f} {cold:>9.3f} {recompile:>14.3f} {warm:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark handler startup.
+
+Times, for a project in a git repository:
+
+- ``import``: importing ``mkdocstrings_handlers.nim`` in a fresh interpreter
+- ``get_handler``: constructing a handler, as mkdocs does on every
+  (re)build of ``mkdocs serve``
+- ``first options``: the first ``get_options`` call, which detects the git
+  branch for source links
+
+Usage:
+    python benchmarks/bench_startup.py [--runs N] [--cache-backend sqlite]
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from mkdocstrings_handlers.nim import get_handler
+
+
+def import_time(runs: int) -> float:
+    """Return the best wall time of importing the handler in a new interpreter."""
+    baseline = best_time([sys.executable, "-c", "pass"], runs)
+    return best_time([sys.executable, "-c", "import mkdocstrings_handlers.nim"], runs) - baseline
+
+
+def best_time(args: list[str], runs: int) -> float:
+    """Return the best wall time of running args."""
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(args, check=True, capture_output=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--cache-backend", default="directory")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / "src").mkdir()
+        subprocess.run(["git", "init", "-q", "-b", "main"], cwd=root, check=True)
+        tool_config = SimpleNamespace(config_file_path=str(root / "mkdocs.yml"))
+        handler_config = {
+            "paths": ["src"],
+            "options": {
+                "source_url": "https://github.com/owner/repo",
+                "cache_dir": ".cache",
+                "cache_backend": args.cache_backend,
+            },
+        }
+
+        construct = first_options = float("inf")
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            handler = get_handler(handler_config, tool_config, mdx=[], mdx_config={})
+            middle = time.perf_counter()
+            handler.get_options({})
+            end = time.perf_counter()
+            handler.teardown()
+            construct = min(construct, middle - start)
+            first_options = min(first_options, end - middle)
+
+    print(f"{'import':<16} {import_time(args.runs) * 1000:>8.1f} ms")
+    print(f"{'get_handler':<16} {construct * 1000:>8.1f} ms")
+    print(f"{'first options':<16} {first_options * 1000:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Check that full handler runs scale linearly with project size.
+
+For each size, a synthetic project is generated, with modules varying in
+entry count, case-object depth and doc comment length. A fresh interpreter
+then runs the handler over every module as mkdocs does (``get_handler``,
+then ``collect`` and ``render`` per identifier) and reports its wall time
+and peak RSS, so each size is measured from a cold start.
+
+Exits with status 1 if the time per module grows by more than
+``--max-growth`` from one size to the next, or if the handler process
+needs more than ``--max-rss-mb`` at any size.
+
+Usage:
+    python benchmarks/scaling.py [--sizes 10,100,1000,10000] [--max-growth 1.5]
+                                 [--max-rss-mb 2048] [--project-mode]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from synthetic import write_module  # noqa: E402
+
+from mkdocstrings_handlers.nim.collector import NimCollector  # noqa: E402
+
+# Modules per package directory of a generated project
+PACKAGE_SIZE = 100
+
+
+def generate_project(root: Path, modules: int) -> list[str]:
+    """Write a synthetic project of the given size and return its identifiers."""
+    identifiers = []
+    for i in range(modules):
+        package = f"pkg{i // PACKAGE_SIZE}"
+        write_module(
+            root / "src" / package / f"mod{i}.nim",
+            5 + (i * 7) % 36,
+            doc_lines=1 + (i * 3) % 8,
+            case_depth=i % 4,
+        )
+        identifiers.append(f"{package}.mod{i}")
+    return identifiers
+
+
+def peak_rss_mb(who: int) -> float:
+    """Return the peak RSS of this process or its children, in MB."""
+    peak = resource.getrusage(who).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def worker(root: Path, identifiers: list[str], project_mode: bool) -> None:
+    """Collect and render every identifier, then print timings as JSON."""
+    from markdown import Markdown
+
+    from mkdocstrings_handlers.nim import get_handler
+
+    start = time.perf_counter()
+    handler = get_handler(
+        {"paths": ["src"], "options": {"cache_dir": False, "project_mode": project_mode}},
+        SimpleNamespace(config_file_path=str(root / "mkdocs.yml")),
+        mdx=["toc"],
+        mdx_config={},
+    )
+    handler._update_env(Markdown(extensions=["toc"]), config={})
+    options = handler.get_options({})
+    for identifier in identifiers:
+        handler.render(handler.collect(identifier, options), options)
+    handler.teardown()
+    seconds = time.perf_counter() - start
+
+    print(
+        json.dumps(
+            {
+                "seconds": seconds,
+                "rss_mb": peak_rss_mb(resource.RUSAGE_SELF),
+                "extractor_rss_mb": peak_rss_mb(resource.RUSAGE_CHILDREN),
+            }
+        )
+    )
+
+
+def measure(modules: int, project_mode: bool) -> dict[str, float]:
+    """Generate a project and measure one cold handler run over it."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        identifiers = generate_project(root, modules)
+        (root / "identifiers.json").write_text(json.dumps(identifiers))
+        command = [sys.executable, __file__, "--worker", str(root)]
+        if project_mode:
+            command.append("--project-mode")
+        result = subprocess.run(command, check=True, capture_output=True, text=True)
+    measured: dict[str, float] = json.loads(result.stdout.strip().splitlines()[-1])
+    return measured
+
+
+def main() -> None:
+    """Run the harness."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10,100,1000,10000")
+    parser.add_argument("--max-growth", type=float, default=1.5)
+    parser.add_argument("--max-rss-mb", type=float, default=2048)
+    parser.add_argument("--project-mode", action="store_true")
+    parser.add_argument("--worker", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        identifiers = json.loads((args.worker / "identifiers.json").read_text())
+        worker(args.worker, identifiers, args.project_mode)
+        return
+
+    # Compile nimdocinfo up front so the first size does not pay for it
+    NimCollector([], Path.cwd())._ensure_nimdocinfo_compiled()
+
+    failures = []
+    previous: tuple[int, float] | None = None
+    print(f"{'modules':>8} {'seconds':>9} {'ms/module':>10} {'RSS MB':>8} {'nimdocinfo MB':>14}")
+    for modules in (int(size) for size in args.sizes.split(",")):
+        measured = measure(modules, args.project_mode)
+        per_module = measured["seconds"] / modules
+        print(
+            f"{modules:>8} {measured['seconds']:>9.2f} {per_module * 1000:>10.2f} "
+            f"{measured['rss_mb']:>8.0f} {measured['extractor_rss_mb']:>14.0f}"
+        )
+        if previous is not None and per_module > previous[1] * args.max_growth:
+            failures.append(
+                f"time per module grew {per_module / previous[1]:.1f}x "
+                f"from {previous[0]} to {modules} modules"
+            )
+        if measured["rss_mb"] > args.max_rss_mb:
+            failures.append(
+                f"peak RSS {measured['rss_mb']:.0f} MB at {modules} modules "
+                f"exceeds {args.max_rss_mb:.0f} MB"
+            )
+        previous = (modules, per_module)
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
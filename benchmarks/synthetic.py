@@ -0,0 +1,70 @@
+"""Synthetic Nim source generators shared by the benchmarks."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+
+def generate_module(
+    entries: int,
+    *,
+    doc_lines: int = 2,
+    body_lines: int = 0,
+    case_depth: int = 0,
+) -> str:
+    """Generate the source of a synthetic Nim module.
+
+    Entries cycle through procs, object types and consts so every extractor
+    code path is exercised.
+
+    Args:
+        entries: Number of documented top-level entries.
+        doc_lines: Doc comment lines per proc and type (at least one).
+        body_lines: Statements in each proc body (exercises body parsing).
+        case_depth: Nesting depth of case-object branches in object types.
+
+    Returns:
+        Nim source code.
+    """
+    lines = ["## Synthetic module for benchmarking.", ""]
+    for i in range(entries):
+        doc = [f"  ## Entry {i} documentation line {j}." for j in range(max(doc_lines, 1))]
+        kind = i % 3
+        if kind == 0:
+            lines.append(f"proc proc{i}*(a: int, b: string): int =")
+            lines.extend(doc)
+            lines.append("  ##")
+            lines.append("  ## :param a: First argument")
+            lines.append("  ## :returns: A number")
+            lines.extend(f"  let v{j} = a + {j}" for j in range(body_lines))
+            lines.append("  result = a")
+        elif kind == 1:
+            lines.append(f"type Type{i}* = object")
+            lines.extend(doc)
+            lines.append(f"  field{i}*: int  ## A field")
+            lines.extend(_case_branches(f"k{i}", case_depth, indent=1))
+        else:
+            lines.append(f"const Const{i}* = {i}  ## Entry {i} constant.")
+        lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+def _case_branches(prefix: str, depth: int, indent: int) -> list[str]:
+    """Generate nested case-object branches up to the given depth."""
+    if depth <= 0:
+        return []
+    pad = "  " * indent
+    lines = [f"{pad}case {prefix}*: bool"]
+    lines.append(f"{pad}of true:")
+    lines.append(f"{pad}  {prefix}Yes*: int  ## Set when true")
+    lines.extend(_case_branches(prefix + "t", depth - 1, indent + 1))
+    lines.append(f"{pad}of false:")
+    lines.append(f"{pad}  {prefix}No*: string  ## Set when false")
+    return lines
+
+
+def write_module(path: Path, entries: int, **kwargs: int) -> Path:
+    """Write a synthetic module to path and return it."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(generate_module(entries, **kwargs))
+    return path
@@ -2,13 +2,20 @@
 
 from importlib.metadata import PackageNotFoundError, version
 
-from mkdocstrings_handlers.nim.collector import NimCollector, NimEntry, NimModule, NimParam
+from mkdocstrings_handlers.nim.collector import (
+    NimCollector,
+    NimEntry,
+    NimModule,
+    NimPackage,
+    NimParam,
+)
 from mkdocstrings_handlers.nim.docstring import (
     DocstringStyle,
     ParamDoc,
     ParsedDocstring,
     RaisesDoc,
     ReturnsDoc,
+    infer_docstring_style,
     parse_docstring,
 )
 from mkdocstrings_handlers.nim.handler import NimHandler, get_handler
@@ -25,9 +32,11 @@ __all__ = [
     "get_handler",
     "NimCollector",
     "NimModule",
+    "NimPackage",
     "NimEntry",
     "NimParam",
     "parse_docstring",
+    "infer_docstring_style",
     "DocstringStyle",
     "ParsedDocstring",
     "ParamDoc",
@@ -0,0 +1,7 @@
+"""Entry point for ``python -m mkdocstrings_handlers.nim``."""
+
+import sys
+
+from mkdocstrings_handlers.nim.cli import main
+
+sys.exit(main())
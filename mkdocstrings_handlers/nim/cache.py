@@ -0,0 +1,472 @@
+"""Persistent, content-addressed storage for extracted modules.
+
+Modification times do not survive a fresh checkout, so cross-build caches
+key files by their git blob hash instead: unchanged files have the same key
+in every checkout of every ref.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Union
+
+from mkdocstrings import get_logger
+
+from mkdocstrings_handlers.nim.lock import pid_alive
+
+if TYPE_CHECKING:
+    import sqlite3
+
+_logger = get_logger(__name__)
+
+# One entry of `git ls-files -s --debug -z`: mode, object, stage, path, then stat data
+_LS_FILES_ENTRY = re.compile(
+    r"\d+ ([0-9a-f]+) (\d)\t([^\0]*)\0"
+    r"  ctime: \d+:\d+\n"
+    r"  mtime: (\d+):(\d+)\n"
+    r".*?  size: (\d+)\t[^\n]*\n",
+    re.DOTALL,
+)
+
+
+def blob_hash(content: bytes) -> str:
+    """Return the git blob hash of content, as `git hash-object` would."""
+    header = f"blob {len(content)}\0".encode()
+    return hashlib.sha1(header + content).hexdigest()
+
+
+class GitIndex:
+    """Git blob hashes of the files in a work tree, read with one git call.
+
+    The index records each file's stat data alongside its blob hash. A file
+    whose stat data still matches is unchanged since it was staged or
+    checked out, so its recorded hash is used; anything else (untracked,
+    modified, or outside a repository) is hashed from its content. Git
+    smudges entries it cannot trust ("racily clean"), so they fail the stat
+    check and are hashed too.
+    """
+
+    def __init__(self, root: Path) -> None:
+        """Snapshot the index of the work tree containing root.
+
+        Args:
+            root: Directory whose tracked files (recursively) are looked up.
+        """
+        self._entries: dict[Path, tuple[str, int, int, int]] = {}
+        try:
+            result = subprocess.run(
+                ["git", "ls-files", "-s", "--debug", "-z"],
+                capture_output=True,
+                text=True,
+                cwd=root,
+                timeout=30,
+            )
+        except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
+            return
+        if result.returncode != 0:
+            return
+
+        for match in _LS_FILES_ENTRY.finditer(result.stdout):
+            blob, stage, path, mtime_s, mtime_ns, size = match.groups()
+            if stage == "0":
+                self._entries[(root / path).resolve()] = (
+                    blob,
+                    int(mtime_s),
+                    int(mtime_ns),
+                    int(size),
+                )
+
+    def __len__(self) -> int:
+        """Return the number of indexed files."""
+        return len(self._entries)
+
+    def file_hash(self, filepath: Path) -> str:
+        """Return the git blob hash of a file's current content.
+
+        Args:
+            filepath: Path to the file.
+
+        Returns:
+            The hash recorded in the index if the file is unchanged,
+            otherwise the hash of its content.
+
+        Raises:
+            OSError: If the file cannot be read.
+        """
+        filepath = filepath.resolve()
+        entry = self._entries.get(filepath)
+        if entry is not None:
+            blob, mtime_s, mtime_ns, size = entry
+            stat = filepath.stat()
+            seconds, nanoseconds = divmod(stat.st_mtime_ns, 1_000_000_000)
+            if (
+                seconds == mtime_s
+                # Git may be built without nanosecond timestamps
+                and mtime_ns in (0, nanoseconds)
+                # The index stores sizes modulo 2**32
+                and stat.st_size % 2**32 == size
+            ):
+                return blob
+        return blob_hash(filepath.read_bytes())
+
+
+class DirectoryStore:
+    """Extracted modules stored as JSON files in a directory.
+
+    Safe to share between concurrent builds: entries are written to a
+    temporary file and atomically renamed into place. Concurrent builds
+    missing the same key each compute it; see SQLiteStore to avoid that.
+    """
+
+    def __init__(self, root: Path) -> None:
+        """Initialize the store.
+
+        Args:
+            root: Directory holding the store; created on first write.
+        """
+        self.root = root
+
+    def _path(self, key: str, kind: str) -> Path:
+        return self.root / kind / key[:2] / f"{key}.json"
+
+    def get(self, key: str, kind: str = "module") -> dict[str, Any] | None:
+        """Return the data stored under key, or None.
+
+        Args:
+            key: Entry key.
+            kind: Namespace of the entry ("module" or "docstring").
+
+        Returns:
+            The stored data, or None if missing or unreadable.
+        """
+        try:
+            data: dict[str, Any] = json.loads(self._path(key, kind).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return data
+
+    def fetch(
+        self, key: str, compute: Callable[[], dict[str, Any]], kind: str = "module"
+    ) -> dict[str, Any]:
+        """Return the data stored under key, computing and storing it if missing.
+
+        Args:
+            key: Entry key.
+            compute: Produces the data on a miss.
+            kind: Namespace of the entry.
+
+        Returns:
+            The stored or computed data.
+        """
+        data = self.get(key, kind)
+        if data is None:
+            data = compute()
+            self.put(key, data, kind)
+        return data
+
+    def put(self, key: str, data: dict[str, Any], kind: str = "module") -> None:
+        """Store data under key, replacing any previous value.
+
+        Args:
+            key: Entry key.
+            data: JSON-serializable data.
+            kind: Namespace of the entry.
+        """
+        path = self._path(key, kind)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            # A cache that cannot be written only costs speed
+            _logger.debug(f"Could not write {path}: {e}")
+
+
+class SQLiteStore:
+    """Extracted modules and parsed docstrings in one SQLite database.
+
+    Built for several ``mkdocs build`` processes sharing a machine (``mike``
+    versions, language variants): the database runs in WAL mode so readers
+    never block, and a claims table makes each missing key computed by a
+    single process while the others wait for its result. A claim whose
+    owner died, or that is older than claim_timeout, is taken over. Data
+    cheaper to compute than a claim (parsed docstrings) is fetched without
+    one, so a miss takes a single write transaction.
+
+    The database is opened on first use, and trimmed to max_size bytes
+    then, dropping the least recently used entries first. Reads only record
+    access times in memory; they are written with the next put, or on close,
+    so warm builds do not take the write lock for every read.
+    """
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS entries ("
+        " kind TEXT NOT NULL, key TEXT NOT NULL, data TEXT NOT NULL,"
+        " size INTEGER NOT NULL, accessed_at REAL NOT NULL,"
+        " PRIMARY KEY (kind, key))",
+        "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)",
+        "CREATE TABLE IF NOT EXISTS claims ("
+        " kind TEXT NOT NULL, key TEXT NOT NULL, host TEXT NOT NULL,"
+        " pid INTEGER NOT NULL, claimed_at REAL NOT NULL,"
+        " PRIMARY KEY (kind, key))",
+    )
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        max_size: int = 512 * 1024 * 1024,
+        claim_timeout: float = 120.0,
+        poll_interval: float = 0.05,
+    ) -> None:
+        """Initialize the store; the database is created or opened on first use.
+
+        Args:
+            path: Database file.
+            max_size: Size in bytes the stored data is trimmed to on open.
+            claim_timeout: Seconds after which another process's claim is
+                considered abandoned.
+            poll_interval: Seconds between checks while waiting on a claim.
+        """
+        self.path = path
+        self.max_size = max_size
+        self.claim_timeout = claim_timeout
+        self.poll_interval = poll_interval
+        self._host = socket.gethostname()
+        # Reentrant: opening the database trims it, which takes the lock again
+        self._lock = threading.RLock()
+        self._connection: sqlite3.Connection | None = None
+        # (kind, key) -> time of the last read not yet written to accessed_at
+        self._touched: dict[tuple[str, str], float] = {}
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        """The database connection, opened (and the store trimmed) on first use."""
+        with self._lock:
+            if self._connection is None:
+                self._connection = self._connect()
+                self.trim()
+            return self._connection
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database, creating the schema if needed."""
+        import sqlite3
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(
+            str(self.path), timeout=30, isolation_level=None, check_same_thread=False
+        )
+        # auto_vacuum only takes effect before the first table is created
+        db.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        db.execute("PRAGMA journal_mode = WAL")
+        db.execute("PRAGMA synchronous = NORMAL")
+        for statement in self._SCHEMA:
+            db.execute(statement)
+        return db
+
+    def close(self) -> None:
+        """Record pending access times and close the database connection, if it was opened."""
+        with self._lock:
+            if self._connection is not None:
+                if self._touched:
+                    self._connection.execute("BEGIN IMMEDIATE")
+                    try:
+                        self._write_touched()
+                        self._connection.execute("COMMIT")
+                    except BaseException:
+                        self._connection.execute("ROLLBACK")
+                        raise
+                self._connection.close()
+                self._connection = None
+
+    def get(self, key: str, kind: str = "module") -> dict[str, Any] | None:
+        """Return the data stored under key, or None.
+
+        Args:
+            key: Entry key.
+            kind: Namespace of the entry ("module" or "docstring").
+
+        Returns:
+            The stored data, or None if missing.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data FROM entries WHERE kind = ? AND key = ?", (kind, key)
+            ).fetchone()
+            if row is None:
+                return None
+            self._touched[kind, key] = time.time()
+        data: dict[str, Any] = json.loads(row[0])
+        return data
+
+    def put(self, key: str, data: dict[str, Any], kind: str = "module") -> None:
+        """Store data under key, releasing this process's claim on it.
+
+        Args:
+            key: Entry key.
+            data: JSON-serializable data.
+            kind: Namespace of the entry.
+        """
+        text = json.dumps(data)
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                    (kind, key, text, len(text), time.time()),
+                )
+                self._db.execute(
+                    "DELETE FROM claims WHERE kind = ? AND key = ? AND host = ? AND pid = ?",
+                    (kind, key, self._host, os.getpid()),
+                )
+                self._write_touched()
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def _write_touched(self) -> None:
+        """Write the access times recorded by get, inside the caller's transaction."""
+        if not self._touched:
+            return
+        self._db.executemany(
+            "UPDATE entries SET accessed_at = ? WHERE kind = ? AND key = ?",
+            [(at, kind, key) for (kind, key), at in self._touched.items()],
+        )
+        self._touched.clear()
+
+    def fetch(
+        self,
+        key: str,
+        compute: Callable[[], dict[str, Any]],
+        kind: str = "module",
+        *,
+        claim: bool = True,
+    ) -> dict[str, Any]:
+        """Return the data stored under key, computing it at most once machine-wide.
+
+        The first process to miss claims the key and computes it; others
+        poll until the result is stored, the claim is released (the owner
+        failed, so they try to claim it themselves) or the claim goes stale.
+
+        Args:
+            key: Entry key.
+            compute: Produces the data on a miss.
+            kind: Namespace of the entry.
+            claim: Whether to claim the key first. Without a claim, a miss
+                takes a single write transaction (storing the result), and
+                concurrent processes may compute the same data: worth it
+                when computing costs less than waiting on the write lock.
+
+        Returns:
+            The stored or computed data.
+        """
+        deadline = time.monotonic() + self.claim_timeout
+        while True:
+            data = self.get(key, kind)
+            if data is not None:
+                return data
+            if not claim:
+                data = compute()
+                self.put(key, data, kind)
+                return data
+            if self._claim(key, kind):
+                try:
+                    data = compute()
+                except BaseException:
+                    self._release(key, kind)
+                    raise
+                self.put(key, data, kind)
+                return data
+            if time.monotonic() > deadline:
+                # Never wait forever on another process; compute without storing
+                return compute()
+            time.sleep(self.poll_interval)
+
+    def _claim(self, key: str, kind: str) -> bool:
+        """Try to become the single writer of a key, taking over stale claims."""
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT host, pid, claimed_at FROM claims WHERE kind = ? AND key = ?",
+                    (kind, key),
+                ).fetchone()
+                if row is not None:
+                    host, pid, claimed_at = row
+                    if now - claimed_at < self.claim_timeout and not (
+                        host == self._host and not pid_alive(pid)
+                    ):
+                        self._db.execute("COMMIT")
+                        return False
+                self._db.execute(
+                    "INSERT OR REPLACE INTO claims VALUES (?, ?, ?, ?, ?)",
+                    (kind, key, self._host, os.getpid(), now),
+                )
+                self._db.execute("COMMIT")
+                return True
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def _release(self, key: str, kind: str) -> None:
+        """Drop this process's claim on a key."""
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM claims WHERE kind = ? AND key = ? AND host = ? AND pid = ?",
+                (kind, key, self._host, os.getpid()),
+            )
+
+    def size(self) -> int:
+        """Return the total size in bytes of the stored data."""
+        with self._lock:
+            row = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return int(row[0])
+
+    def trim(self) -> None:
+        """Drop least recently used entries until the data fits in max_size.
+
+        Trims to 80% of max_size, so the next build does not trim again
+        straight away, and returns freed pages to the file system.
+        """
+        total = self.size()
+        if total <= self.max_size:
+            return
+
+        target = self.max_size * 0.8
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._db.execute(
+                    "SELECT kind, key, size FROM entries ORDER BY accessed_at"
+                ).fetchall()
+                doomed = []
+                for kind, key, size in rows:
+                    if total <= target:
+                        break
+                    doomed.append((kind, key))
+                    total -= size
+                self._db.executemany("DELETE FROM entries WHERE kind = ? AND key = ?", doomed)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("PRAGMA incremental_vacuum")
+        _logger.debug(f"Trimmed {len(doomed)} entries from {self.path}")
+
+
+# Either store can back the collector and the handler's docstring cache
+ModuleStore = Union[DirectoryStore, SQLiteStore]
@@ -0,0 +1,152 @@
+"""Command-line interface, run as ``python -m mkdocstrings_handlers.nim``.
+
+Subcommands:
+
+- ``build-extractor``: compile nimdocinfo ahead of time (e.g. in a Docker
+  image layer), so the first ``mkdocs build`` does not compile it.
+- ``warm-cache``: extract every project module into the persistent cache in
+  parallel, so the next ``mkdocs build`` starts with a hot cache.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+import yaml
+from mkdocstrings import CollectionError
+
+from mkdocstrings_handlers.nim.cache import SQLiteStore
+from mkdocstrings_handlers.nim.collector import NimCollector
+from mkdocstrings_handlers.nim.handler import NimHandler
+
+
+class _ConfigLoader(yaml.SafeLoader):  # type: ignore[misc]
+    """Loads mkdocs.yml, ignoring tags such as ``!ENV`` and ``!!python/name``."""
+
+
+_ConfigLoader.add_multi_constructor("", lambda _loader, _suffix, _node: None)
+
+
+def handler_config(config_file: Path) -> dict[str, Any]:
+    """Read the Nim handler configuration from mkdocs.yml.
+
+    Args:
+        config_file: Path to mkdocs.yml.
+
+    Returns:
+        The ``plugins.mkdocstrings.handlers.nim`` mapping (``paths`` and
+        ``options``), or an empty dict if it is not configured.
+
+    Raises:
+        CollectionError: If the file cannot be read or parsed.
+    """
+    try:
+        with open(config_file, encoding="utf-8") as f:
+            config = yaml.load(f, Loader=_ConfigLoader)
+    except (OSError, yaml.YAMLError) as e:
+        raise CollectionError(f"Could not read {config_file}: {e}") from e
+
+    plugins = config.get("plugins", []) if isinstance(config, dict) else []
+    if isinstance(plugins, dict):
+        plugins = [plugins]
+    for plugin in plugins:
+        if isinstance(plugin, dict) and isinstance(plugin.get("mkdocstrings"), dict):
+            nim = (plugin["mkdocstrings"].get("handlers") or {}).get("nim")
+            return nim if isinstance(nim, dict) else {}
+    return {}
+
+
+def _build_extractor(_args: argparse.Namespace) -> int:
+    binary = NimCollector([], Path.cwd())._ensure_nimdocinfo_compiled()
+    print(binary)
+    return 0
+
+
+def _warm_cache(args: argparse.Namespace) -> int:
+    config_file: Path = args.config_file
+    config = handler_config(config_file)
+    options = config.get("options") or {}
+    base_dir = config_file.parent
+    store = NimHandler._module_store(options, base_dir)
+    if store is None:
+        raise CollectionError("cache_dir is false in mkdocs.yml: there is no cache to warm")
+
+    collector = NimCollector(
+        config.get("paths") or ["src"],
+        base_dir,
+        declarations_only=options.get("declarations_only", False),
+        include=options.get("project_include"),
+        exclude=options.get("project_exclude"),
+        store=store,
+        structured_docs=options.get("native_docstrings", False),
+    )
+    try:
+        filepaths = collector.project_files()
+        result = collector.prefetch(filepaths, jobs=args.jobs)
+    finally:
+        if isinstance(store, SQLiteStore):
+            store.close()
+
+    for filepath, error in sorted(result.failed.items()):
+        print(f"{filepath}: {error}", file=sys.stderr)
+    print(
+        f"{len(filepaths)} modules: {len(result.extracted)} extracted, "
+        f"{len(result.cached)} already cached, {len(result.failed)} failed"
+    )
+    return 1 if result.failed else 0
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the command line interface.
+
+    Args:
+        argv: Arguments (defaults to ``sys.argv[1:]``).
+
+    Returns:
+        Exit status.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m mkdocstrings_handlers.nim",
+        description="Prepare mkdocstrings-nim ahead of a docs build.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build = subparsers.add_parser(
+        "build-extractor", help="Compile the nimdocinfo extractor and print its path."
+    )
+    build.set_defaults(run=_build_extractor)
+
+    warm = subparsers.add_parser(
+        "warm-cache",
+        help="Extract every project module into the persistent cache.",
+        description="Extract every module under the handler's paths (honouring "
+        "project_include / project_exclude) into the cache configured in mkdocs.yml.",
+    )
+    warm.add_argument(
+        "-f",
+        "--config-file",
+        type=Path,
+        default=Path("mkdocs.yml"),
+        help="MkDocs configuration file (default: mkdocs.yml).",
+    )
+    warm.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of extractor processes to run at once (default: CPU count).",
+    )
+    warm.set_defaults(run=_warm_cache)
+
+    args = parser.parse_args(argv)
+    try:
+        status: int = args.run(args)
+    except CollectionError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    return status
@@ -2,18 +2,35 @@
 
 from __future__ import annotations
 
+import contextlib
+import hashlib
+import itertools
 import json
 import os
+import re
 import shutil
 import subprocess
 import tempfile
+import time
 from collections import OrderedDict
+from collections.abc import Iterable
+from copy import deepcopy
 from dataclasses import dataclass, field
 from importlib.resources import as_file, files
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from mkdocstrings import CollectionError
+from mkdocstrings import CollectionError, get_logger
+
+from mkdocstrings_handlers.nim import semantic, tracing
+from mkdocstrings_handlers.nim.cache import GitIndex, ModuleStore
+from mkdocstrings_handlers.nim.docstring import ParamDoc, ParsedDocstring, ReturnsDoc
+from mkdocstrings_handlers.nim.lock import FileLock
+
+if TYPE_CHECKING:
+    from mkdocstrings_handlers.nim.pages import ModulePage
+
+_logger = get_logger(__name__)
 
 # Cache directory for compiled nimdocinfo binary
 _CACHE_DIR = Path(tempfile.gettempdir()) / "mkdocstrings-nim-cache"
@@ -21,11 +38,36 @@ _CACHE_DIR = Path(tempfile.gettempdir()) / "mkdocstrings-nim-cache"
 # Maximum number of modules to cache per collector instance
 _MAX_CACHE_SIZE = 128
 
+# Timeout (seconds) for compiling nimdocinfo
+_COMPILE_TIMEOUT = 120
+
+# Timeouts (seconds) for extracting one file and a whole project, plus an
+# allowance per MB of source so large generated files are not cut off
+_FILE_TIMEOUT = 60
+_PROJECT_TIMEOUT = 600
+_TIMEOUT_PER_MB = 60
+# Timeout (seconds) for sem-checking one module with the semantic backend
+_SEMANTIC_TIMEOUT = 300
+
+# Default nimcache of the semantic backend, relative to the project directory
+_DEFAULT_NIMCACHE = Path(".cache/mkdocstrings-nim/nimcache")
+
+# Extraction backends: parser-only, or parser overlaid with `nim jsondoc`
+BACKENDS = ("ast", "semantic")
+
 # Sentinel markers for JSON extraction (must match nimdocinfo.nim)
 _JSON_START_MARKER = "<<MKDOCSTRINGS_JSON_START>>"
 _JSON_END_MARKER = "<<MKDOCSTRINGS_JSON_END>>"
 
 
+class ExtractorError(CollectionError):
+    """nimdocinfo ran and rejected its input.
+
+    Unlike other collection errors (no compiler, a timeout), the failure
+    comes from the files extracted, so it is remembered until they change.
+    """
+
+
 @dataclass
 class NimParam:
     """A Nim parameter."""
@@ -63,6 +105,13 @@ class NimEntry:
     exported: bool = True  # True if symbol has * (public API)
     fields: list[NimField] = field(default_factory=list)  # For object/ref object types
     values: list[NimField] = field(default_factory=list)  # For enum types
+    file: str = ""  # Source file if not the module's own (e.g. an included file)
+    # Docstring as parsed by nimdocinfo with structured_docs, and the style it
+    # was parsed as ("" for prose, which parses the same in every style)
+    parsed_doc: ParsedDocstring | None = None
+    parsed_doc_style: str = ""
+    # Set by the handler for group_overloads: the entry's later overloads
+    overloads: list[NimEntry] = field(default_factory=list)
 
 
 @dataclass
@@ -73,21 +122,226 @@ class NimModule:
     file: str
     doc: str = ""
     entries: list[NimEntry] = field(default_factory=list)
+    reexports: list[NimEntry] = field(default_factory=list)  # Exported from imported modules
+    # Set by the handler for docstring_style "auto": the inferred style, and the
+    # number of docstrings that look like another style (plus, on prepared
+    # copies, those that failed to parse in the inferred style)
+    docstring_style: str = ""
+    misdetected_docstrings: int = 0
+    # Set by the handler for split_by: the pages the module is split across
+    pages: list[ModulePage] = field(default_factory=list)
+
+
+@dataclass
+class NimPackage:
+    """A set of documented Nim modules, collected for a wildcard identifier."""
+
+    name: str  # The wildcard identifier, e.g. "*" or "mypkg.*"
+    modules: list[NimModule] = field(default_factory=list)
+
+
+@dataclass
+class ExtractionStats:
+    """How nimdocinfo spent its time on one module (``collect_stats``)."""
+
+    file: str
+    read_ms: float = 0.0
+    parse_ms: float = 0.0
+    walk_ms: float = 0.0  # Excluding doc fields and serialization, interleaved with walking
+    doc_fields_ms: float = 0.0  # Parsing docstrings into fields (``structured_docs``)
+    serialize_ms: float = 0.0
+    ast_nodes: int = 0
+    entries: int = 0
+    output_bytes: int = 0
+    # Wall time of the whole nimdocinfo run, including process startup and
+    # reading its output; shared by every module of a project pass
+    process_ms: float = 0.0
+    run: int = 0  # Numbers nimdocinfo runs, telling project passes apart
+
+
+def _extraction_timeout(base: float, files: Iterable[Path]) -> float:
+    """Return the nimdocinfo timeout for extracting files.
+
+    Args:
+        base: Timeout for any amount of source.
+        files: Files extracted (unreadable ones are ignored).
+
+    Returns:
+        The base timeout plus an allowance for the size of the files.
+    """
+    size = 0
+    for path in files:
+        with contextlib.suppress(OSError):
+            size += path.stat().st_size
+    return base + _TIMEOUT_PER_MB * size / 1_000_000
+
+
+def summarize_stats(stats: list[ExtractionStats]) -> str:
+    """Summarize extraction stats in one line.
+
+    Args:
+        stats: Stats of the extracted modules.
+
+    Returns:
+        Totals per phase, and the time outside them (process startup and IPC).
+    """
+    process_ms = sum({s.run: s.process_ms for s in stats}.values())
+    runs = len({s.run for s in stats})
+    phases_ms = sum(
+        s.read_ms + s.parse_ms + s.walk_ms + s.doc_fields_ms + s.serialize_ms for s in stats
+    )
+    doc_fields_ms = sum(s.doc_fields_ms for s in stats)
+    doc_fields = f"doc fields {doc_fields_ms:.0f} ms, " if doc_fields_ms else ""
+    return (
+        f"nimdocinfo extracted {len(stats)} modules "
+        f"({sum(s.entries for s in stats)} entries, {sum(s.ast_nodes for s in stats)} AST nodes, "
+        f"{sum(s.output_bytes for s in stats) / 1024:.0f} KiB of JSON): "
+        f"read {sum(s.read_ms for s in stats):.0f} ms, parse {sum(s.parse_ms for s in stats):.0f} ms, "
+        f"walk {sum(s.walk_ms for s in stats):.0f} ms, "
+        f"{doc_fields}"
+        f"serialize {sum(s.serialize_ms for s in stats):.0f} ms, "
+        f"outside these {process_ms - phases_ms:.0f} ms "
+        f"over {runs} run{'s' if runs != 1 else ''}"
+    )
+
+
+@dataclass
+class PrefetchResult:
+    """Outcome of extracting files into the persistent store."""
+
+    extracted: list[Path] = field(default_factory=list)
+    cached: list[Path] = field(default_factory=list)  # Already stored, skipped
+    failed: dict[Path, str] = field(default_factory=dict)  # File -> error message
+
+
+def _is_current(binary: Path, *sources: Path) -> bool:
+    """Check that a compiled binary exists and is newer than all its sources."""
+    try:
+        binary_mtime = binary.stat().st_mtime
+    except OSError:
+        return False
+    return all(source.stat().st_mtime <= binary_mtime for source in sources)
+
+
+def _nim_files(root: Path) -> list[str]:
+    """List the .nim files under root, like nimdocinfo's projectFiles.
+
+    Symlinked files are listed; symlinked directories are not entered, so
+    a link back up the tree cannot list a file twice.
+
+    Returns:
+        Paths relative to root, ``/``-separated and sorted.
+    """
+    found = []
+    for directory, _subdirectories, filenames in os.walk(root):
+        for filename in filenames:
+            path = Path(directory, filename)
+            if filename.endswith(".nim") and path.is_file():
+                found.append(path.relative_to(root).as_posix())
+    return sorted(found)
+
+
+def _glob_regex(pattern: str) -> re.Pattern[str]:
+    """Translate a project glob to a regex, matching nimdocinfo's globMatch.
+
+    ``*`` and ``?`` match within one path segment, ``**`` matches across
+    segments, and ``**/`` also matches zero directories.
+    """
+    parts = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            parts.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            parts.append("[^/]")
+            i += 1
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("".join(parts) + r"\Z")
 
 
 class NimCollector:
     """Collects documentation from Nim source files."""
 
-    def __init__(self, paths: list[str], base_dir: Path):
+    def __init__(
+        self,
+        paths: list[str],
+        base_dir: Path,
+        *,
+        declarations_only: bool = False,
+        project_mode: bool = False,
+        include: list[str] | None = None,
+        exclude: list[str] | None = None,
+        backend: str = "ast",
+        store: ModuleStore | None = None,
+        structured_docs: bool = False,
+        collect_stats: bool = False,
+        nimcache: Path | None = None,
+    ):
         """Initialize the collector.
 
         Args:
             paths: Search paths for Nim source files.
             base_dir: Base directory of the project.
+            declarations_only: Skip parsing routine bodies (faster on large modules).
+            project_mode: Extract every module in one nimdocinfo pass on first collect.
+            include: Globs (relative to each search path) of modules in the project.
+            exclude: Globs (relative to each search path) of modules left out of the project.
+            backend: "ast" (parser only) or "semantic" (also sem-check with nim jsondoc).
+            store: Persistent store sharing nimdocinfo output between builds, keyed by
+                git blob hash so it survives fresh checkouts.
+            structured_docs: Have nimdocinfo also parse RST and Google docstrings.
+            collect_stats: Record nimdocinfo's timings and sizes in `stats`.
+            nimcache: Persistent nimcache of the semantic backend (default:
+                ``.cache/mkdocstrings-nim/nimcache`` in base_dir).
         """
         self.paths = paths
         self.base_dir = base_dir
-        self._cache: OrderedDict[str, tuple[float, NimModule]] = OrderedDict()
+        self.declarations_only = declarations_only
+        self.project_mode = project_mode
+        self.include = include or []
+        self.exclude = exclude or []
+        self.backend = backend
+        self.store = store
+        self.structured_docs = structured_docs
+        self.collect_stats = collect_stats
+        self.nimcache = nimcache or base_dir / _DEFAULT_NIMCACHE
+        # One record per module nimdocinfo extracted, if collect_stats is set
+        self.stats: list[ExtractionStats] = []
+        self._stats_runs = itertools.count(1)
+        # Read from git on first use of the store
+        self._git_index: GitIndex | None = None
+        self._extractor_fingerprint: str | None = None
+        # identifier -> (mtimes of every file the module was built from, module)
+        self._cache: OrderedDict[str, tuple[dict[Path, float], NimModule]] = OrderedDict()
+        # Raw extractor output per source file, shared by all modules including it
+        self._file_cache: dict[Path, tuple[float, dict[str, Any]]] = {}
+        # Semantic backend: module -> (key of the compiler's inputs, jsondoc output
+        # or None if the compiler failed)
+        self._semantic: dict[Path, tuple[str, dict[str, Any] | None]] = {}
+        self._nim_version: str | None = None
+        # Module graph: file -> (mtime, import name -> imported project file)
+        self._imports: dict[Path, tuple[float, dict[str, Path]]] = {}
+        self._max_cache_size = _MAX_CACHE_SIZE
+        # Identifiers found by the last project pass; None until one has run
+        self._project_identifiers: list[str] | None = None
+        # Failures, remembered until what they depend on changes:
+        # identifier -> (stamps of the search path directories, error message)
+        self._unresolved: dict[str, tuple[list[tuple[Path, float]], str]] = {}
+        # file -> (mtime, error message) for files nimdocinfo failed on
+        self._failed: dict[Path, tuple[float | None, str]] = {}
+        # (mtime of every project file, error message) if the last project pass failed
+        self._project_failure: tuple[dict[Path, float | None], str] | None = None
+        # Compiled extractor, once checked to be up to date
+        self._nimdocinfo_binary: Path | None = None
         # Use importlib.resources for reliable path resolution
         extractor_files = files("mkdocstrings_handlers.nim").joinpath("extractor")
         self._nimdocinfo_source = extractor_files.joinpath("nimdocinfo.nim")
@@ -95,6 +349,9 @@ class NimCollector:
     def _resolve_identifier(self, identifier: str) -> Path:
         """Resolve a module identifier to a file path.
 
+        A failed lookup is remembered until a file or directory appears in
+        one of the searched directories.
+
         Args:
             identifier: Module identifier like 'lockfreequeues.ops'
 
@@ -104,30 +361,66 @@ class NimCollector:
         Raises:
             CollectionError: If the file cannot be found.
         """
-        # Convert dots to path separators
+        # Convert dots to path separators, then try just the filename
         rel_path = identifier.replace(".", "/") + ".nim"
+        filename = identifier.split(".")[-1] + ".nim"
+        candidates = [self.base_dir / search_path / rel_path for search_path in self.paths]
+        candidates.extend(self.base_dir / search_path / filename for search_path in self.paths)
 
-        for search_path in self.paths:
-            full_path = self.base_dir / search_path / rel_path
-            if full_path.exists():
-                return full_path
+        stamps = [self._directory_stamp(candidate.parent) for candidate in candidates]
+        unresolved = self._unresolved.get(identifier)
+        if unresolved is not None and unresolved[0] == stamps:
+            raise CollectionError(unresolved[1])
 
-        # Try without nested path (just filename)
-        filename = identifier.split(".")[-1] + ".nim"
-        for search_path in self.paths:
-            full_path = self.base_dir / search_path / filename
+        for full_path in candidates:
             if full_path.exists():
+                self._unresolved.pop(identifier, None)
                 return full_path
 
-        raise CollectionError(f"Could not find Nim file for identifier: {identifier}")
+        message = f"Could not find Nim file for identifier: {identifier}"
+        self._unresolved[identifier] = (stamps, message)
+        raise CollectionError(message)
+
+    @staticmethod
+    def _directory_stamp(directory: Path) -> tuple[Path, float]:
+        """Return the nearest existing ancestor of a directory and its mtime.
+
+        Creating anything below the ancestor (a file, or the first missing
+        directory on the way to it) changes the result.
+        """
+        for ancestor in (directory, *directory.parents):
+            try:
+                return ancestor, ancestor.stat().st_mtime
+            except OSError:
+                continue
+        return directory, 0.0
 
     def _ensure_nimdocinfo_compiled(self) -> Path:
         """Ensure nimdocinfo is compiled and return path to binary.
 
         Copies Nim source files to a cache directory and compiles them there.
-        This avoids writing to the installed package directory.
+        This avoids writing to the installed package directory. The check
+        runs once per collector; later calls return the same binary.
+
+        Process-safe: one process compiles while holding a lock file, and
+        others wait for its binary instead of compiling their own. If the
+        lock cannot be acquired in time, the binary is compiled anyway; the
+        atomic rename keeps concurrent compiles safe.
+
+        Returns:
+            Path to the compiled nimdocinfo binary.
+
+        Raises:
+            CollectionError: If compilation fails.
+        """
+        if self._nimdocinfo_binary is not None:
+            return self._nimdocinfo_binary
+        with tracing.span("nimdocinfo compile"):
+            self._nimdocinfo_binary = self._compiled_nimdocinfo()
+        return self._nimdocinfo_binary
 
-        Thread-safe: Uses atomic rename pattern to handle concurrent compilation.
+    def _compiled_nimdocinfo(self) -> Path:
+        """Compile nimdocinfo unless the cached binary is current.
 
         Returns:
             Path to the compiled nimdocinfo binary.
@@ -146,46 +439,76 @@ class NimCollector:
             as_file(extractor_pkg.joinpath("extractor.nim")) as src_extractor,
         ):
             # Fast path: binary exists and is up-to-date
-            if cache_binary.exists():
-                binary_mtime = cache_binary.stat().st_mtime
-                if (
-                    src_main.stat().st_mtime <= binary_mtime
-                    and src_extractor.stat().st_mtime <= binary_mtime
-                ):
-                    return cache_binary
-
-            # Need to compile - use atomic rename pattern for thread safety
-            # Compile in a temp directory, then atomically rename
-            with tempfile.TemporaryDirectory(dir=_CACHE_DIR) as tmp_dir:
-                tmp_path = Path(tmp_dir)
-                tmp_main = tmp_path / "nimdocinfo.nim"
-                tmp_extractor = tmp_path / "extractor.nim"
-                tmp_binary = tmp_path / "nimdocinfo"
-
-                # Copy source files to temp directory
-                shutil.copy2(src_main, tmp_main)
-                shutil.copy2(src_extractor, tmp_extractor)
-
-                # Compile in temp directory
+            if _is_current(cache_binary, src_main, src_extractor):
+                return cache_binary
+
+            lock = FileLock(_CACHE_DIR / "nimdocinfo.lock", timeout=_COMPILE_TIMEOUT + 30)
+            try:
+                lock.acquire()
+            except TimeoutError:
+                _logger.warning(
+                    f"mkdocstrings-nim: timed out waiting for {lock.path}, compiling anyway"
+                )
+            else:
+                try:
+                    # Another process may have compiled it while we waited
+                    if _is_current(cache_binary, src_main, src_extractor):
+                        return cache_binary
+                    self._compile_nimdocinfo(src_main, src_extractor, cache_binary)
+                finally:
+                    lock.release()
+                return cache_binary
+
+            self._compile_nimdocinfo(src_main, src_extractor, cache_binary)
+            return cache_binary
+
+    @staticmethod
+    def _compile_nimdocinfo(src_main: Path, src_extractor: Path, cache_binary: Path) -> None:
+        """Compile nimdocinfo and atomically move the binary into place.
+
+        Args:
+            src_main: nimdocinfo.nim source.
+            src_extractor: extractor.nim source.
+            cache_binary: Destination of the binary.
+
+        Raises:
+            CollectionError: If compilation fails.
+        """
+        # Compile in a temp directory, then atomically rename
+        with tempfile.TemporaryDirectory(dir=_CACHE_DIR) as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            tmp_main = tmp_path / "nimdocinfo.nim"
+            tmp_extractor = tmp_path / "extractor.nim"
+            tmp_binary = tmp_path / "nimdocinfo"
+
+            # Copy source files to temp directory
+            shutil.copy2(src_main, tmp_main)
+            shutil.copy2(src_extractor, tmp_extractor)
+
+            # Compile in temp directory
+            try:
                 result = subprocess.run(
                     ["nim", "c", f"--outdir:{tmp_path}", str(tmp_main)],
                     capture_output=True,
                     text=True,
-                    timeout=120,  # First compile can be slow
+                    timeout=_COMPILE_TIMEOUT,  # First compile can be slow
                 )
+            except FileNotFoundError as e:
+                raise CollectionError(
+                    "Nim compiler not found. Install from https://nim-lang.org/install.html\n"
+                    "Then verify installation: nim --version"
+                ) from e
 
-                if result.returncode != 0:
-                    raise CollectionError(f"Failed to compile nimdocinfo:\n{result.stderr}")
-
-                # Atomic rename - if another process won the race, that's fine
-                try:
-                    os.replace(tmp_binary, cache_binary)
-                except OSError:
-                    # Another process may have beat us - check if binary exists
-                    if not cache_binary.exists():
-                        raise
+            if result.returncode != 0:
+                raise CollectionError(f"Failed to compile nimdocinfo:\n{result.stderr}")
 
-            return cache_binary
+            # Atomic rename - if another process won the race, that's fine
+            try:
+                os.replace(tmp_binary, cache_binary)
+            except OSError:
+                # Another process may have beat us - check if binary exists
+                if not cache_binary.exists():
+                    raise
 
     def _extract_json(self, stdout: str, filepath: Path) -> dict[str, Any]:
         """Extract JSON from stdout using sentinel markers.
@@ -221,50 +544,115 @@ class NimCollector:
         except json.JSONDecodeError as e:
             raise CollectionError(f"Invalid JSON from nimdocinfo: {e}") from e
 
-    def _run_nimdocinfo(self, filepath: Path) -> dict[str, Any]:
-        """Run nimdocinfo on a Nim file.
+    def _run_extractor(self, args: list[str], target: Path, timeout: float) -> dict[str, Any]:
+        """Run nimdocinfo with the given arguments.
 
         Args:
-            filepath: Path to the Nim source file.
+            args: Arguments after the binary path (flags are added here).
+            target: File or directory being extracted (for error messages).
+            timeout: Seconds before the extractor is abandoned.
 
         Returns:
             Parsed JSON output from nimdocinfo.
 
         Raises:
-            CollectionError: If nimdocinfo fails.
+            ExtractorError: If nimdocinfo exits with an error.
+            CollectionError: If nimdocinfo cannot be built or run, or times out.
         """
         try:
             binary_path = self._ensure_nimdocinfo_compiled()
-
-            result = subprocess.run(
-                [str(binary_path), str(filepath)],
-                capture_output=True,
-                text=True,
-                cwd=str(self.base_dir),
-                timeout=60,
-            )
+            command = [str(binary_path)]
+            if self.declarations_only:
+                command.append("--declarations-only")
+            if self.structured_docs:
+                command.append("--structured-docs")
+            if self.collect_stats:
+                command.append("--stats")
+            command.extend(args)
+
+            start = time.perf_counter()
+            with tracing.span("extract", target=target):
+                result = subprocess.run(
+                    command,
+                    capture_output=True,
+                    text=True,
+                    cwd=str(self.base_dir),
+                    timeout=timeout,
+                )
 
             if result.returncode != 0:
-                raise CollectionError(
+                raise ExtractorError(
                     f"nimdocinfo failed:\n{result.stderr}\n\n"
                     f"To debug, run manually:\n"
-                    f"  {binary_path} {filepath}"
+                    f"  {' '.join(command)}"
                 )
 
             # Extract JSON using sentinel markers
-            return self._extract_json(result.stdout, filepath)
+            with tracing.span("json decode", target=target, size=len(result.stdout)):
+                data = self._extract_json(result.stdout, target)
+            if self.collect_stats:
+                self._record_stats(data, (time.perf_counter() - start) * 1000)
+            return data
 
         except FileNotFoundError as e:
+            # The binary may have been removed since it was checked; check again next time
+            self._nimdocinfo_binary = None
             raise CollectionError(
                 "Nim compiler not found. Install from https://nim-lang.org/install.html\n"
                 "Then verify installation: nim --version"
             ) from e
         except subprocess.TimeoutExpired as e:
             raise CollectionError(
-                f"nimdocinfo timed out processing {filepath}. "
+                f"nimdocinfo timed out after {timeout:.0f} s processing {target}. "
                 "The file may be too complex or have circular imports."
             ) from e
 
+    def _record_stats(self, data: dict[str, Any], process_ms: float) -> None:
+        """Move the stats nimdocinfo reported out of its output into `stats`.
+
+        Args:
+            data: nimdocinfo output, for one module or a project; the stats
+                are removed, so cached output does not depend on them.
+            process_ms: Wall time of the nimdocinfo run.
+        """
+        run = next(self._stats_runs)
+        modules = data.get("modules")
+        for module_data in modules if isinstance(modules, list) else [data]:
+            reported = module_data.pop("stats", None)
+            if not isinstance(reported, dict):
+                continue
+            self.stats.append(
+                ExtractionStats(
+                    file=self._relative_file(module_data.get("file", "")),
+                    read_ms=reported.get("read_ms", 0.0),
+                    parse_ms=reported.get("parse_ms", 0.0),
+                    walk_ms=reported.get("walk_ms", 0.0),
+                    doc_fields_ms=reported.get("doc_fields_ms", 0.0),
+                    serialize_ms=reported.get("serialize_ms", 0.0),
+                    ast_nodes=reported.get("ast_nodes", 0),
+                    entries=reported.get("entries", 0),
+                    output_bytes=reported.get("output_bytes", 0),
+                    process_ms=process_ms,
+                    run=run,
+                )
+            )
+
+    def _run_nimdocinfo(self, filepath: Path) -> dict[str, Any]:
+        """Run nimdocinfo on a Nim file.
+
+        Args:
+            filepath: Path to the Nim source file.
+
+        Returns:
+            Parsed JSON output from nimdocinfo.
+
+        Raises:
+            CollectionError: If nimdocinfo fails.
+        """
+        return self._run_extractor(
+            [str(filepath)], filepath, _extraction_timeout(_FILE_TIMEOUT, [filepath])
+        )
+
     def _parse_module(self, data: dict[str, Any]) -> NimModule:
         """Parse JSON data into NimModule.
 
@@ -286,8 +674,28 @@ class NimCollector:
                 f"Got keys: {list(data.keys())}"
             )
 
+        with tracing.span("parse module", module=data["module"]):
+            return NimModule(
+                module=data["module"],
+                file=self._relative_file(data["file"]),
+                doc=data.get("doc", ""),
+                entries=self._parse_entries(data.get("entries", [])),
+            )
+
+    def _parse_entries(self, entries_data: list[dict[str, Any]]) -> list[NimEntry]:
+        """Parse the JSON entries of a module into NimEntry objects.
+
+        Args:
+            entries_data: Entry list from nimdocinfo.
+
+        Returns:
+            Parsed entries.
+
+        Raises:
+            CollectionError: If required fields are missing.
+        """
         entries = []
-        for i, entry_data in enumerate(data.get("entries", [])):
+        for i, entry_data in enumerate(entries_data):
             # Validate required entry-level fields
             entry_required = {"name", "kind", "line", "signature"}
             entry_missing = entry_required - entry_data.keys()
@@ -323,6 +731,21 @@ class NimCollector:
                 for v in entry_data.get("values", [])
             ]
 
+            doc_fields = entry_data.get("doc_fields")
+            parsed_doc: ParsedDocstring | None = None
+            parsed_doc_style = ""
+            if doc_fields is not None:
+                parsed_doc_style = doc_fields.get("style", "")
+                returns = doc_fields.get("returns")
+                parsed_doc = ParsedDocstring(
+                    description=doc_fields.get("description", ""),
+                    params=[
+                        ParamDoc(name=p["name"], description=p["description"])
+                        for p in doc_fields.get("params", [])
+                    ],
+                    returns=ReturnsDoc(description=returns) if returns is not None else None,
+                )
+
             entries.append(
                 NimEntry(
                     name=entry_data["name"],
@@ -337,55 +760,671 @@ class NimCollector:
                     exported=entry_data.get("exported", True),
                     fields=fields,
                     values=values,
+                    parsed_doc=parsed_doc,
+                    parsed_doc_style=parsed_doc_style,
                 )
             )
+        return entries
 
-        # Make file path relative to base_dir for source links
-        file_path = Path(data["file"])
+    def _relative_file(self, file: str | Path) -> str:
+        """Make a source file path relative to base_dir for source links."""
+        file_path = Path(file)
         try:
-            relative_file = file_path.relative_to(self.base_dir)
+            return str(file_path.relative_to(self.base_dir))
         except ValueError:
             # If path is not relative to base_dir, use as-is
-            relative_file = file_path
+            return str(file_path)
 
-        return NimModule(
-            module=data["module"],
-            file=str(relative_file),
-            doc=data.get("doc", ""),
-            entries=entries,
-        )
+    @staticmethod
+    def _file_stamp(filepath: Path) -> float | None:
+        """Return the modification time of a file, or None if it is gone."""
+        try:
+            return filepath.stat().st_mtime
+        except OSError:
+            return None
 
-    def collect(self, identifier: str) -> NimModule:
-        """Collect documentation for a module identifier.
+    def _extract_file(self, filepath: Path) -> dict[str, Any]:
+        """Return nimdocinfo output for a file, extracting it only if it changed.
 
-        Uses LRU cache to avoid re-parsing modules. Cache is bounded
-        to _MAX_CACHE_SIZE entries. Cache entries are invalidated when
-        the source file is modified.
+        Files nimdocinfo rejected are remembered too, and the error re-raised
+        without running it until the file changes. Other failures (no
+        compiler, a timeout) are not: the next call tries again.
 
         Args:
-            identifier: Module identifier like 'lockfreequeues.ops'
+            filepath: Path to the Nim source file.
 
         Returns:
-            NimModule with documentation.
+            Parsed JSON output from nimdocinfo.
+
+        Raises:
+            CollectionError: If nimdocinfo fails, now or on the unchanged file before.
         """
-        filepath = self._resolve_identifier(identifier)
-        current_mtime = filepath.stat().st_mtime
+        filepath = filepath.resolve()
+        mtime = self._file_stamp(filepath)
+        cached = self._file_cache.get(filepath)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        # Don't run the extractor again on a file it failed on until the file changes
+        failed = self._failed.get(filepath)
+        if failed is not None and failed[0] == mtime:
+            raise ExtractorError(failed[1])
+
+        key = self._store_key(filepath)
+        try:
+            if self.store is not None and key is not None:
+                data = self.store.fetch(key, lambda: self._run_nimdocinfo(filepath))
+                # Stored output may come from another checkout or file with the same content
+                data["file"] = str(filepath)
+                data["module"] = filepath.stem
+            else:
+                data = self._run_nimdocinfo(filepath)
+        except ExtractorError as e:
+            self._failed[filepath] = (mtime, str(e))
+            raise
+        self._failed.pop(filepath, None)
+
+        if mtime is not None:
+            self._file_cache[filepath] = (mtime, data)
+        return data
+
+    def _store_key(self, filepath: Path) -> str | None:
+        """Return the persistent store key of a file's extraction, or None.
+
+        Keys combine the git blob hash of the file with a fingerprint of the
+        extractor and its flags, so they are equal for equal content in any
+        checkout and change whenever the output could.
+
+        Args:
+            filepath: Path to the Nim source file.
+
+        Returns:
+            The key, or None if there is no store or the file is unreadable.
+        """
+        if self.store is None:
+            return None
+        if self._extractor_fingerprint is None:
+            extractor = files("mkdocstrings_handlers.nim").joinpath("extractor")
+            digest = hashlib.sha1()
+            for name in ("nimdocinfo.nim", "extractor.nim"):
+                digest.update(extractor.joinpath(name).read_bytes())
+            self._extractor_fingerprint = digest.hexdigest()
+
+        try:
+            blob = self._content_hash(filepath)
+        except OSError:
+            return None
+        flags = "declarations-only" if self.declarations_only else "full"
+        if self.structured_docs:
+            flags += ",structured-docs"
+        return hashlib.sha1(f"{self._extractor_fingerprint}:{flags}:{blob}".encode()).hexdigest()
+
+    def _content_hash(self, filepath: Path) -> str:
+        """Return the git blob hash of a file, read from the index when unchanged.
+
+        Raises:
+            OSError: If the file cannot be read.
+        """
+        if self._git_index is None:
+            self._git_index = GitIndex(self.base_dir)
+        return self._git_index.file_hash(filepath)
+
+    def _persist(self, key: str | None, data: dict[str, Any]) -> None:
+        """Save nimdocinfo output to the persistent store, if there is one."""
+        if self.store is not None and key is not None:
+            self.store.put(key, data)
+
+    def _jsondoc(self, filepath: Path) -> dict[str, Any] | None:
+        """Return ``nim jsondoc`` output for a module, if the semantic backend is on.
+
+        Only modules are sem-checked: include-only files cannot compile on
+        their own, and jsondoc lists their routines in their includers'.
+        The output is reused until the key of the compiler's inputs changes
+        (see _semantic_inputs_key), so editing an imported module also
+        refreshes the modules importing it.
+
+        Args:
+            filepath: Path to the Nim module.
+
+        Returns:
+            The compiler's output, or None with the AST backend or if the
+            compiler fails.
+        """
+        if self.backend != "semantic":
+            return None
+        try:
+            inputs_key = self._semantic_inputs_key(filepath)
+        except CollectionError as e:
+            # Not remembered: the compiler may be installed by the next build
+            _logger.warning(f"mkdocstrings-nim: semantic extraction of {filepath} failed: {e}")
+            return None
+        cached = self._semantic.get(filepath)
+        if cached is not None and cached[0] == inputs_key:
+            return cached[1]
+
+        jsondoc: dict[str, Any] | None
+        try:
+            jsondoc = semantic.run_jsondoc(
+                filepath,
+                nimcache=self.nimcache,
+                search_paths=self._project_roots(),
+                timeout=_SEMANTIC_TIMEOUT,
+                inputs_key=inputs_key,
+            )
+        except CollectionError as e:
+            # Modules that do not compile are still documented from the AST
+            _logger.warning(f"mkdocstrings-nim: semantic extraction of {filepath} failed: {e}")
+            jsondoc = None
+        self._semantic[filepath] = (inputs_key, jsondoc)
+        return jsondoc
+
+    def _semantic_inputs_key(self, filepath: Path) -> str:
+        """Return a fingerprint of everything ``nim jsondoc`` reads for a module.
+
+        Covers the compiler version, the search paths, and the content of the
+        module and of every project file it imports or includes, transitively.
+        Modules outside the project (the standard library, Nimble packages)
+        are assumed to change only with the compiler.
+
+        Args:
+            filepath: Path to the Nim source file.
+
+        Returns:
+            A hex digest.
+
+        Raises:
+            CollectionError: If the compiler is missing.
+        """
+        if self._nim_version is None:
+            self._nim_version = semantic.compiler_version(_SEMANTIC_TIMEOUT)
+        digest = hashlib.sha1(self._nim_version.encode())
+        for root in self._project_roots():
+            digest.update(f"\0path:{root.resolve()}".encode())
+        for dependency in sorted(self._source_dependencies(filepath)):
+            try:
+                content = self._content_hash(dependency)
+            except OSError:
+                content = "missing"
+            digest.update(f"\0{dependency}:{content}".encode())
+        return digest.hexdigest()
+
+    def _source_dependencies(self, filepath: Path) -> set[Path]:
+        """Return a file and the project files it imports or includes, transitively."""
+        found = {filepath}
+        pending = [filepath]
+        while pending:
+            current = pending.pop()
+            try:
+                data = self._extract_file(current)
+            except CollectionError:
+                continue  # Its own content is still part of the key
+            targets = list(self._module_imports(current, data).values())
+            for include in data.get("includes", []):
+                target = self._resolve_include(include["path"], current)
+                if target is not None:
+                    targets.append(target)
+            for target in targets:
+                if target not in found:
+                    found.add(target)
+                    pending.append(target)
+        return found
+
+    def _resolve_include(self, path: str, includer: Path) -> Path | None:
+        """Resolve an include target, as written in the source, to a file."""
+        target = includer.parent / path
+        if not target.suffix:
+            target = target.with_suffix(".nim")
+        return target.resolve() if target.is_file() else None
+
+    def _included_entries(
+        self,
+        data: dict[str, Any],
+        filepath: Path,
+        stamps: dict[Path, float],
+        active: set[Path],
+    ) -> list[NimEntry]:
+        """Return a file's entries with its included files spliced in.
+
+        Entries from an included file are placed at the position of the
+        include statement and tagged with the included file's path. Included
+        files are extracted once (see _extract_file) and parsed afresh for
+        every includer, since rendering mutates entries.
+
+        Args:
+            data: nimdocinfo output for filepath.
+            filepath: The file the entries come from.
+            stamps: Collects the mtime of every file read, for cache validation.
+            active: Files currently being expanded, to break include cycles.
+
+        Returns:
+            Entries in source order.
+        """
+        entries = self._parse_entries(data.get("entries", []))
+        includes = data.get("includes", [])
+        if not includes:
+            return entries
+
+        active = active | {filepath}
+        # Walk includes in reverse so earlier insertions don't shift later positions
+        for include in sorted(includes, key=lambda inc: inc["line"], reverse=True):
+            target = self._resolve_include(include["path"], filepath)
+            if target is None:
+                _logger.debug(f"Could not resolve include '{include['path']}' in {filepath}")
+                continue
+            if target in active:
+                _logger.warning(f"mkdocstrings-nim: include cycle through {target}, skipping")
+                continue
+
+            included_data = self._extract_file(target)
+            stamp = self._file_stamp(target)
+            if stamp is not None:
+                stamps[target] = stamp
+            included = self._included_entries(included_data, target, stamps, active)
+            relative_file = self._relative_file(target)
+            for entry in included:
+                entry.file = entry.file or relative_file
+
+            position = next(
+                (
+                    i
+                    for i, entry in enumerate(entries)
+                    if not entry.file and entry.line > include["line"]
+                ),
+                len(entries),
+            )
+            entries[position:position] = included
+        return entries
+
+    def _resolve_import(self, path: str, importer: Path) -> Path | None:
+        """Resolve an import target to a project file, or None (e.g. stdlib)."""
+        relative = Path(path if path.endswith(".nim") else path + ".nim")
+        for directory in [importer.parent, *self._project_roots()]:
+            target = directory / relative
+            if target.is_file():
+                return target.resolve()
+        return None
+
+    def _module_imports(self, filepath: Path, data: dict[str, Any]) -> dict[str, Path]:
+        """Return a file's edges in the module graph.
+
+        Edges are resolved once per version of the file and shared by every
+        module re-exporting from it.
+
+        Args:
+            filepath: The importing file.
+            data: nimdocinfo output for filepath.
+
+        Returns:
+            Mapping of module name (as used by ``export``) to imported project file.
+        """
+        mtime = self._file_stamp(filepath) or 0.0
+        cached = self._imports.get(filepath)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        imports: dict[str, Path] = {}
+        for item in data.get("imports", []):
+            target = self._resolve_import(item["path"], filepath)
+            if target is not None:
+                imports[Path(item["path"]).stem] = target
+        self._imports[filepath] = (mtime, imports)
+        return imports
+
+    def _reexported_entries(
+        self,
+        data: dict[str, Any],
+        filepath: Path,
+        stamps: dict[Path, float],
+        active: frozenset[Path],
+    ) -> list[NimEntry]:
+        """Return the entries a module re-exports from the modules it imports.
+
+        ``export mod`` re-exports every public symbol of an imported module,
+        ``export sym`` or ``export mod.sym`` only the named symbol (all of its
+        overloads). Imported modules come from the module cache, so each is
+        extracted at most once however many facades re-export it.
+
+        Args:
+            data: nimdocinfo output for filepath.
+            filepath: The re-exporting file.
+            stamps: Collects the mtime of every file read, for cache validation.
+            active: Files currently being assembled, to break export cycles.
+
+        Returns:
+            Copies of the re-exported entries, tagged with their source file.
+        """
+        exports = data.get("exports", [])
+        if not exports:
+            return []
+
+        imports = self._module_imports(filepath, data)
+        active = active | {filepath}
+        entries: list[NimEntry] = []
+        seen: set[tuple[str, int, str]] = set()
+        for export in exports:
+            name = export["path"]
+            excluded = set(export.get("except", []))
+            module_name, _, symbol = name.rpartition(".")
+            sources: list[tuple[Path, str | None]]
+            if name in imports:
+                sources = [(imports[name], None)]
+            elif module_name in imports:
+                sources = [(imports[module_name], symbol)]
+            else:
+                # A bare symbol may come from any imported module
+                sources = [(target, name) for target in imports.values()]
+
+            for target, wanted in sources:
+                if target in active:
+                    _logger.debug(f"Skipping cyclic re-export of {target} from {filepath}")
+                    continue
+                dep_stamps, dep = self._collect_file(target, active)
+                stamps.update(dep_stamps)
+                for entry in [*dep.entries, *dep.reexports]:
+                    if not entry.exported or entry.name in excluded:
+                        continue
+                    if wanted is not None and entry.name != wanted:
+                        continue
+                    copy = deepcopy(entry)
+                    copy.file = copy.file or dep.file
+                    key = (copy.file, copy.line, copy.name)
+                    if key not in seen:
+                        seen.add(key)
+                        entries.append(copy)
+        return entries
+
+    def _build_module(
+        self, filepath: Path, active: frozenset[Path] = frozenset()
+    ) -> tuple[dict[Path, float], NimModule]:
+        """Extract a module, following its include and export statements.
+
+        Args:
+            filepath: Path to the Nim source file.
+            active: Files currently being assembled, to break export cycles.
+
+        Returns:
+            Mtimes of every file the module was built from, and the module.
+        """
+        filepath = filepath.resolve()
+        data = self._extract_file(filepath)
+        stamps: dict[Path, float] = {}
+        stamp = self._file_stamp(filepath)
+        if stamp is not None:
+            stamps[filepath] = stamp
+        module = self._parse_module(data)
+        module.entries = self._included_entries(data, filepath, stamps, set())
+        jsondoc = self._jsondoc(filepath)
+        if jsondoc is not None:
+            # After the includes are spliced in, since jsondoc lists their routines too
+            generated = self._parse_entries(semantic.overlay(module.entries, jsondoc))
+            for entry in sorted(generated, key=lambda e: e.line, reverse=True):
+                position = next(
+                    (
+                        i
+                        for i, own in enumerate(module.entries)
+                        if not own.file and own.line > entry.line
+                    ),
+                    len(module.entries),
+                )
+                module.entries.insert(position, entry)
+        module.reexports = self._reexported_entries(data, filepath, stamps, active)
+        return stamps, module
+
+    def _collect_file(
+        self, filepath: Path, active: frozenset[Path] = frozenset(), identifier: str | None = None
+    ) -> tuple[dict[Path, float], NimModule]:
+        """Return a module from the cache, building it if missing or stale.
+
+        Args:
+            filepath: Path to the Nim source file.
+            active: Files currently being assembled, to break export cycles.
+            identifier: Cache key; derived from the search paths if not given.
+
+        Returns:
+            Mtimes of every file the module was built from, and the module.
+        """
+        if identifier is None:
+            roots = [root.resolve() for root in self._project_roots()]
+            identifier = self._identifier_for(filepath.resolve(), roots)
 
         if identifier in self._cache:
-            cached_mtime, cached_module = self._cache[identifier]
-            if cached_mtime == current_mtime:
+            stamps, cached_module = self._cache[identifier]
+            if self._is_fresh(stamps):
                 # Move to end for LRU behavior
                 self._cache.move_to_end(identifier)
-                return cached_module
-            # File changed, remove stale entry
+                return stamps, cached_module
+            # A file changed, remove stale entry
             del self._cache[identifier]
 
-        data = self._run_nimdocinfo(filepath)
-        module = self._parse_module(data)
+        stamps, module = self._build_module(filepath, active)
+        self._store(identifier, stamps, module)
+        return stamps, module
+
+    def _is_fresh(self, stamps: dict[Path, float]) -> bool:
+        """Check that none of the files a module was built from have changed."""
+        return all(self._file_stamp(path) == mtime for path, mtime in stamps.items())
 
-        # Evict oldest entries if cache is full
-        while len(self._cache) >= _MAX_CACHE_SIZE:
+    def _store(self, identifier: str, stamps: dict[Path, float], module: NimModule) -> None:
+        """Add a module to the LRU cache, evicting the oldest entries if full."""
+        self._cache.pop(identifier, None)
+        while len(self._cache) >= self._max_cache_size:
             self._cache.popitem(last=False)
+        self._cache[identifier] = (stamps, module)
+
+    def _project_roots(self) -> list[Path]:
+        """Return the existing search path directories."""
+        return [self.base_dir / p for p in self.paths if (self.base_dir / p).is_dir()]
+
+    @staticmethod
+    def _identifier_for(filepath: Path, roots: list[Path]) -> str:
+        """Return the dotted module identifier of a file under one of roots."""
+        for root in roots:
+            try:
+                relative = filepath.relative_to(root)
+            except ValueError:
+                continue
+            return ".".join(relative.with_suffix("").parts)
+        return filepath.stem
+
+    def project_files(self) -> list[Path]:
+        """List the module files a project pass would extract.
+
+        Returns:
+            The .nim files under the search paths matching the include and
+            exclude globs, in nimdocinfo's order.
+        """
+        includes = [_glob_regex(glob) for glob in self.include]
+        excludes = [_glob_regex(glob) for glob in self.exclude]
+        filepaths = []
+        for root in self._project_roots():
+            for relative in _nim_files(root):
+                if includes and not any(regex.match(relative) for regex in includes):
+                    continue
+                if any(regex.match(relative) for regex in excludes):
+                    continue
+                filepaths.append(root / relative)
+        return filepaths
+
+    def prefetch(self, filepaths: list[Path], *, jobs: int) -> PrefetchResult:
+        """Extract files into the persistent store in parallel.
+
+        Files whose extraction is already stored are skipped. The others are
+        extracted by up to jobs nimdocinfo processes at once, so a later
+        build finds every module in the store.
+
+        Args:
+            filepaths: Nim source files to extract.
+            jobs: Maximum number of concurrent extractor processes.
+
+        Returns:
+            Which files were extracted, already stored, or failed.
+
+        Raises:
+            CollectionError: If there is no store, or nimdocinfo cannot be compiled.
+        """
+        if self.store is None:
+            raise CollectionError("Cannot prefetch: the extraction cache is disabled")
+
+        result = PrefetchResult()
+        pending: dict[Path, str] = {}
+        for filepath in filepaths:
+            filepath = filepath.resolve()
+            key = self._store_key(filepath)
+            if key is None:
+                result.failed[filepath] = "Could not read file"
+            elif self.store.get(key) is not None:
+                result.cached.append(filepath)
+            else:
+                pending[filepath] = key
+        if not pending:
+            return result
+
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        # Compile up front rather than in the first worker
+        self._ensure_nimdocinfo_compiled()
+        # Threads suffice: the work happens in the extractor processes
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            futures = {pool.submit(self._run_nimdocinfo, path): path for path in pending}
+            for future in as_completed(futures):
+                filepath = futures[future]
+                try:
+                    data = future.result()
+                except CollectionError as e:
+                    result.failed[filepath] = str(e)
+                    continue
+                self._persist(pending[filepath], data)
+                result.extracted.append(filepath)
+        return result
+
+    def collect_project(self) -> dict[str, NimModule]:
+        """Extract every module under the search paths in one nimdocinfo pass.
+
+        Modules matching the include/exclude globs are extracted by a single
+        extractor process and added to the cache, so later collect() calls
+        for them are cache hits. The cache grows to hold the whole project.
+        Files that another project file includes are not modules of their
+        own: their entries are documented in their includers.
+
+        A failed pass is not retried until a project file is added, removed
+        or modified.
+
+        Returns:
+            Mapping of module identifier to NimModule, sorted by identifier.
+
+        Raises:
+            CollectionError: If extraction fails.
+        """
+        roots = self._project_roots()
+        if not roots:
+            self._project_identifiers = []
+            return {}
+
+        project_stamps = {path: self._file_stamp(path) for path in self.project_files()}
+        if self._project_failure is not None and self._project_failure[0] == project_stamps:
+            raise ExtractorError(self._project_failure[1])
+
+        args = [f"--project={root}" for root in roots]
+        args.extend(f"--include={glob}" for glob in self.include)
+        args.extend(f"--exclude={glob}" for glob in self.exclude)
+        try:
+            timeout = _extraction_timeout(_PROJECT_TIMEOUT, project_stamps)
+            data = self._run_extractor(args, roots[0], timeout)
+        except ExtractorError as e:
+            self._project_failure = (project_stamps, str(e))
+            raise
+        self._project_failure = None
+
+        modules_data = data.get("modules")
+        if not isinstance(modules_data, list):
+            raise CollectionError(
+                f"Invalid nimdocinfo project output: expected 'modules' list. "
+                f"Got keys: {list(data.keys())}"
+            )
+
+        self._max_cache_size = max(self._max_cache_size, len(modules_data))
+        # Seed the per-file cache first, so included and re-exported project files
+        # are not extracted again while modules are assembled
+        filepaths = []
+        for module_data in modules_data:
+            self._parse_module(module_data)  # Validate before caching
+            filepath = Path(module_data["file"]).resolve()
+            stamp = self._file_stamp(filepath)
+            self._persist(self._store_key(filepath), module_data)
+            if stamp is not None:
+                self._file_cache[filepath] = (stamp, module_data)
+            filepaths.append(filepath)
+
+        # Include-only files are documented within their includers, not as modules
+        included: set[Path | None] = set()
+        for filepath, module_data in zip(filepaths, modules_data):
+            for include in module_data.get("includes", []):
+                included.add(self._resolve_include(include["path"], filepath))
+
+        modules: dict[str, NimModule] = {}
+        for filepath in filepaths:
+            if filepath in included:
+                continue
+            identifier = self._identifier_for(filepath, [root.resolve() for root in roots])
+            modules[identifier] = self._collect_file(filepath, identifier=identifier)[1]
+
+        self._project_identifiers = sorted(modules)
+        return {identifier: modules[identifier] for identifier in self._project_identifiers}
+
+    def collect_package(self, identifier: str) -> NimPackage:
+        """Collect every project module matching a wildcard identifier.
+
+        Args:
+            identifier: ``*`` for the whole project, or ``prefix.*`` for a package.
+
+        Returns:
+            NimPackage with the matching modules, sorted by identifier.
+        """
+        prefix = identifier[:-1]  # "" or "mypkg."
+        if self._project_identifiers is None:
+            self.collect_project()
+        assert self._project_identifiers is not None
+
+        return NimPackage(
+            name=identifier,
+            modules=[
+                # Goes through collect() so modules edited since the project pass are refreshed
+                self.collect(module_identifier)
+                for module_identifier in self._project_identifiers
+                if module_identifier.startswith(prefix)
+            ],
+        )
+
+    def collect(self, identifier: str) -> NimModule:
+        """Collect documentation for a module identifier.
+
+        Uses LRU cache to avoid re-parsing modules. Cache is bounded
+        to _MAX_CACHE_SIZE entries (or the project size in project mode).
+        Cache entries are invalidated when the source file, or any file it
+        includes or re-exports from, is modified. Included files are
+        extracted once and shared by every module including them; symbols
+        re-exported from imported modules are taken from those modules'
+        cache entries.
+
+        In project mode, the first call extracts the whole project in one
+        pass; if that fails, modules are extracted one file at a time.
+
+        Args:
+            identifier: Module identifier like 'lockfreequeues.ops'
+
+        Returns:
+            NimModule with documentation.
+        """
+        if self.project_mode and self._project_identifiers is None:
+            try:
+                self.collect_project()
+            except CollectionError as e:
+                self._project_identifiers = []
+                _logger.warning(
+                    f"mkdocstrings-nim: project extraction failed, "
+                    f"falling back to per-module extraction: {e}"
+                )
 
-        self._cache[identifier] = (current_mtime, module)
-        return module
+        with tracing.span("resolve", identifier=identifier):
+            filepath = self._resolve_identifier(identifier)
+        return self._collect_file(filepath, identifier=identifier)[1]
@@ -0,0 +1,127 @@
+"""Entry bodies deferred to fragment files (the ``defer_bodies`` option).
+
+The page keeps each entry's heading and signature, and a collapsed
+placeholder in place of its body (docstring, parameters, fields, source
+link). Bodies are rendered into the page like any other HTML, so that
+mkdocs-autorefs resolves the cross-references they contain. Once the page is
+complete, a ``post_page`` hook moves them to one JSON file per page, which
+the page fetches the first time a placeholder is expanded.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Any
+
+from markupsafe import Markup
+from mkdocs.utils import get_relative_url
+
+# Directory of the fragment files, relative to the site root
+FRAGMENT_DIR = "assets/mkdocstrings-nim"
+
+# Name under which the post_page hook is added to the MkDocs plugins
+PLUGIN_NAME = "mkdocstrings-nim-deferred"
+
+# Element wrapping a body until the page is complete; bodies never contain it
+BODY_TAG = "nim-deferred-body"
+
+# Characters replaced in page paths to name their fragment files ("/" -> "_")
+_UNSAFE_CHARS = re.compile(r"[^\w.-]")
+
+_PLACEHOLDER = Markup(
+    '<details class="doc-deferred"><summary>Details</summary>'
+    f"<{BODY_TAG}>{{}}</{BODY_TAG}></details>"
+)
+
+_DEFERRED = re.compile(
+    r'<details class="doc-deferred"><summary>Details</summary>'
+    rf"<{BODY_TAG}>(.*?)</{BODY_TAG}></details>",
+    re.DOTALL,
+)
+
+
+def defer_body(body: str) -> Markup:
+    """Wrap a rendered body in its placeholder; for use inside templates.
+
+    Until the page is complete, the placeholder holds the body itself, so a
+    page built without the post_page hook still shows every body.
+
+    Args:
+        body: The entry's rendered body.
+
+    Returns:
+        The placeholder to render instead.
+    """
+    return _PLACEHOLDER.format(Markup(str(body).strip()))
+
+
+def move_bodies(html: str, site_dir: Path, page_url: str) -> str:
+    """Move the deferred bodies of a complete page to its fragment file.
+
+    The file is named after the page and a hash of its contents, so it is
+    never stale: a page rebuilt with other bodies gets another file, and
+    pages left unbuilt by ``mkdocs build --dirty`` keep theirs.
+
+    Args:
+        html: The page's final HTML, with autorefs resolved.
+        site_dir: Directory the site is built in.
+        page_url: URL of the page, relative to the site root.
+
+    Returns:
+        The page's HTML with empty placeholders pointing at the fragment file.
+    """
+    bodies = [match.group(1) for match in _DEFERRED.finditer(html)]
+    if not bodies:
+        return html
+
+    data = json.dumps(bodies, ensure_ascii=False)
+    digest = hashlib.sha1(data.encode()).hexdigest()[:12]
+    name = _UNSAFE_CHARS.sub("_", page_url.strip("/")) or "index"
+    filename = f"{name}-{digest}.json"
+    directory = site_dir / FRAGMENT_DIR
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / filename).write_text(data, encoding="utf-8")
+
+    # Relative to the page, so the site works under any prefix (mike versions, previews)
+    url = get_relative_url(f"{FRAGMENT_DIR}/{filename}", page_url)
+    keys = iter(range(len(bodies)))
+    return _DEFERRED.sub(
+        lambda _: (
+            f'<details class="doc-deferred" data-fragment="{url}" data-key="{next(keys)}">'
+            "<summary>Details</summary></details>"
+        ),
+        html,
+    )
+
+
+class DeferredBodiesHook:
+    """MkDocs ``post_page`` hook moving deferred bodies out of each page."""
+
+    def on_post_page(self, output: str, *, page: Any, config: Any) -> str:
+        """Move the page's deferred bodies to its fragment file.
+
+        Args:
+            output: The page's final HTML.
+            page: The MkDocs page.
+            config: The MkDocs configuration.
+
+        Returns:
+            The page's HTML.
+        """
+        if f"<{BODY_TAG}>" not in output:
+            return output
+        return move_bodies(output, Path(config["site_dir"]), page.url)
+
+
+def register(tool_config: Any) -> None:
+    """Add the post_page hook to the MkDocs plugins, once per build.
+
+    Args:
+        tool_config: The MkDocs configuration.
+    """
+    plugins = getattr(tool_config, "plugins", None)
+    if plugins is not None and PLUGIN_NAME not in plugins:
+        plugins[PLUGIN_NAME] = DeferredBodiesHook()
@@ -2,16 +2,27 @@
 
 from __future__ import annotations
 
+import re
+from collections import Counter
+from collections.abc import Iterable
 from dataclasses import dataclass, field
 from enum import Enum
+from typing import TYPE_CHECKING, Any
 
-import docstring_parser
-from docstring_parser import DocstringStyle as DPStyle
-from docstring_parser import ParseError
 from mkdocstrings import get_logger
 
+if TYPE_CHECKING:
+    from docstring_parser import DocstringStyle as DPStyle
+
 _logger = get_logger(__name__)
 
+# Bump when parse_docstring output changes, to invalidate persisted results
+PARSER_VERSION = 1
+
+
+class DocstringStyleError(ValueError):
+    """A docstring could not be parsed in the style expected for it."""
+
 
 class DocstringStyle(Enum):
     """Supported docstring styles."""
@@ -58,18 +69,124 @@ class ParsedDocstring:
     raises: list[RaisesDoc] = field(default_factory=list)
     examples: list[str] = field(default_factory=list)
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ParsedDocstring:
+        """Rebuild a parsed docstring from its ``dataclasses.asdict`` form.
+
+        Args:
+            data: Dictionary produced by ``dataclasses.asdict``.
+
+        Returns:
+            The parsed docstring.
+        """
+        returns = data.get("returns")
+        return cls(
+            description=data.get("description", ""),
+            params=[ParamDoc(**p) for p in data.get("params", [])],
+            returns=ReturnsDoc(**returns) if returns is not None else None,
+            raises=[RaisesDoc(**r) for r in data.get("raises", [])],
+            examples=list(data.get("examples", [])),
+        )
+
 
-# Map our style enum to docstring_parser's style enum
-_STYLE_MAP = {
-    DocstringStyle.RST: DPStyle.REST,
-    DocstringStyle.GOOGLE: DPStyle.GOOGLE,
-    DocstringStyle.NUMPY: DPStyle.NUMPYDOC,
-    DocstringStyle.EPYDOC: DPStyle.EPYDOC,
-    DocstringStyle.AUTO: DPStyle.AUTO,
+def _dp_style(style: DocstringStyle) -> DPStyle:
+    """Map our style enum to docstring_parser's style enum."""
+    # Imported on first parse rather than with the handler
+    from docstring_parser import DocstringStyle as DPStyle
+
+    return {
+        DocstringStyle.RST: DPStyle.REST,
+        DocstringStyle.GOOGLE: DPStyle.GOOGLE,
+        DocstringStyle.NUMPY: DPStyle.NUMPYDOC,
+        DocstringStyle.EPYDOC: DPStyle.EPYDOC,
+        DocstringStyle.AUTO: DPStyle.AUTO,
+    }.get(style, DPStyle.REST)
+
+
+# Lines that open a structured section in each style. NumPy comes before
+# Google: both use bare section names, NumPy underlines them.
+_SECTION_MARKERS = {
+    DocstringStyle.RST: re.compile(
+        r"^\s*:(param|parameter|arg|argument|key|keyword|type|raise|raises|except|exception"
+        r"|return|returns|rtype|yield|yields|ytype)\b",
+        re.MULTILINE,
+    ),
+    DocstringStyle.EPYDOC: re.compile(
+        r"^\s*@(param|type|keyword|return|rtype|raise|yield|ytype)\b", re.MULTILINE
+    ),
+    DocstringStyle.NUMPY: re.compile(
+        r"^\s*(Parameters|Other Parameters|Returns|Yields|Receives|Raises|Warns|Examples?"
+        r"|Attributes|Notes?|See Also)\s*\n\s*-{3,}\s*$",
+        re.MULTILINE,
+    ),
+    DocstringStyle.GOOGLE: re.compile(
+        r"^\s*(Args|Arguments|Parameters|Params|Returns?|Yields?|Raises|Exceptions?"
+        r"|Examples?|Attributes|Notes?)\s*:\s*$",
+        re.MULTILINE,
+    ),
 }
 
 
-def parse_docstring(doc: str, style: DocstringStyle = DocstringStyle.RST) -> ParsedDocstring:
+def summary_line(doc: str) -> str:
+    """Return the first paragraph of a docstring on one line, without parsing it.
+
+    Args:
+        doc: Raw docstring text.
+
+    Returns:
+        The lines before the first blank line or structured section, joined
+        with spaces.
+    """
+    lines = []
+    for line in doc.strip().splitlines():
+        if not line.strip() or any(marker.match(line) for marker in _SECTION_MARKERS.values()):
+            break
+        lines.append(line.strip())
+    return " ".join(lines)
+
+
+def detect_docstring_style(doc: str) -> DocstringStyle | None:
+    """Guess the style of one docstring from its section markers.
+
+    Args:
+        doc: Raw docstring text.
+
+    Returns:
+        The style with the most section markers, or None for a docstring
+        without structured sections.
+    """
+    best, best_count = None, 0
+    for style, marker in _SECTION_MARKERS.items():
+        count = len(marker.findall(doc))
+        if count > best_count:
+            best, best_count = style, count
+    return best
+
+
+def infer_docstring_style(docs: Iterable[str]) -> tuple[DocstringStyle, int]:
+    """Infer the style a module's docstrings are written in.
+
+    Each docstring is classified by its section markers, which is much
+    cheaper than letting docstring_parser try every style on it; the most
+    common style wins. Docstrings without sections don't count.
+
+    Args:
+        docs: The module's raw docstrings.
+
+    Returns:
+        The dominant style (RST if no docstring has sections), and the
+        number of structured docstrings that look like another style.
+    """
+    detected = [style for style in map(detect_docstring_style, docs) if style is not None]
+    if not detected:
+        return DocstringStyle.RST, 0
+    style = Counter(detected).most_common(1)[0][0]
+    return style, sum(1 for other in detected if other is not style)
+
+
+def parse_docstring(
+    doc: str, style: DocstringStyle = DocstringStyle.RST, *, fallback: bool = True
+) -> ParsedDocstring:
     """Parse a docstring according to the specified style.
 
     Uses the docstring_parser library for robust parsing of RST, Google,
@@ -78,18 +195,31 @@ def parse_docstring(doc: str, style: DocstringStyle = DocstringStyle.RST) -> Par
     Args:
         doc: Raw docstring text.
         style: Docstring style to use for parsing.
+        fallback: Whether to let docstring_parser detect the style if the
+            docstring does not parse in the given one. Off for styles
+            inferred for a module, which were chosen instead of detecting
+            each docstring's.
 
     Returns:
         Parsed docstring structure.
+
+    Raises:
+        DocstringStyleError: If the docstring does not parse in the given
+            style and fallback is off.
     """
     if not doc:
         return ParsedDocstring()
 
-    dp_style = _STYLE_MAP.get(style, DPStyle.REST)
+    import docstring_parser
+    from docstring_parser import ParseError
+
+    dp_style = _dp_style(style)
 
     try:
         parsed = docstring_parser.parse(doc, style=dp_style)
     except (ParseError, ValueError) as e:
+        if not fallback:
+            raise DocstringStyleError(f"Not a {style.value} docstring: {e}") from e
         # Fall back to auto-detection if specified style fails
         _logger.debug(f"Failed to parse docstring with {style}: {e}")
         try:
@@ -1,5 +1,5 @@
 ## AST extraction logic for nimdocinfo
-import std/[json, strutils, sequtils, os]
+import std/[json, strutils, sequtils, algorithm, os, monotimes, times, options]
 import compiler/[ast, parser, idents, options, pathutils, lineinfos, msgs, renderer, llstream]
 
 type
@@ -10,6 +10,15 @@ type
     exported*: bool
     branch*: string  ## Empty or "when kind = x" for case objects
 
+  DocFields* = object
+    ## A docstring parsed natively (`--structured-docs`), holding what the
+    ## handler would otherwise get from docstring_parser
+    style*: string  ## "rst", "google", or "" for prose (the same in every style)
+    description*: string
+    params*: seq[tuple[name, doc: string]]
+    hasReturns*: bool
+    returns*: string
+
   DocEntry* = object
     name*: string
     kind*: string
@@ -23,12 +32,46 @@ type
     exported*: bool  ## True if symbol has * (public API)
     fields*: seq[FieldInfo]  ## For object/ref object types
     values*: seq[FieldInfo]  ## For enum types
+    hasDocFields*: bool  ## True if `docFields` holds the parsed doc
+    docFields*: DocFields
+
+  ModuleRef* = object
+    ## A reference to another module, as written in the source
+    path*: string  ## e.g. "impl", "./private/impl", "impl.nim"
+    line*: int
+    excluded*: seq[string]  ## Names after `except`
+
+  ModuleRefs* = object
+    ## Module-level statements referring to other modules
+    includes*: seq[ModuleRef]
+    imports*: seq[ModuleRef]
+    exports*: seq[ModuleRef]  ## Module or symbol names
 
   ModuleDoc* = object
     module*: string
     file*: string
     doc*: string
     entries*: seq[DocEntry]
+    refs*: ModuleRefs
+
+  ExtractStats* = object
+    ## Where one module's extraction spent its time (`--stats`). Walking
+    ## excludes the doc field parsing and serialization interleaved with it.
+    readMs*, parseMs*, walkMs*, docFieldsMs*, serializeMs*: float
+    astNodes*: int
+    entries*: int
+    outputBytes*: int  ## JSON written for the module, up to its stats
+
+  EntryCallback* = proc (entry: DocEntry) {.closure.}
+    ## Receives each entry as soon as it is extracted
+
+  ParseContext* = object
+    ## Parser state shared by every file extracted in one process
+    conf*: ConfigRef
+    identCache*: IdentCache
+    declarationsOnly*: bool
+    structuredDocs*: bool
+    stats*: bool
 
 proc extractDocComment(n: PNode): string =
   ## Extract doc comment from a node
@@ -130,73 +173,62 @@ proc extractName(n: PNode): string =
       return $n[1][0].ident.s
   return ""
 
-proc extractObjectFields(recList: PNode, branch: string = ""): seq[FieldInfo] =
-  ## Extract fields from an object's record list
-  result = @[]
+proc addIdentDefsFields(fields: var seq[FieldInfo], defs: PNode, branch: string) =
+  ## Append one field per name of `name*, other: Type ## doc`
+  let typNode = defs[^2]
+  let typ = if typNode.kind == nkEmpty: "" else: $typNode
+  let doc = extractDocComment(defs)
+  # All names except last two (type and default value)
+  for i in 0..<defs.len - 2:
+    let nameNode = defs[i]
+    fields.add FieldInfo(
+      name: extractName(nameNode),
+      typ: typ,
+      doc: doc,
+      exported: isExported(nameNode),
+      branch: branch
+    )
+
+proc addObjectFields(fields: var seq[FieldInfo], recList: PNode, branch: string) =
+  ## Append the fields of an object's record list. Case branches and nested
+  ## record lists append to the same seq, so deeply nested case objects
+  ## cost time linear in their number of fields.
   if recList == nil:
     return
 
   for child in recList:
     case child.kind
     of nkIdentDefs:
-      # Field: name*: Type ## doc
-      let typNode = child[^2]
-      let typ = if typNode.kind == nkEmpty: "" else: $typNode
-      let doc = extractDocComment(child)
-      # All names except last two (type and default value)
-      for i in 0..<child.len - 2:
-        let nameNode = child[i]
-        result.add FieldInfo(
-          name: extractName(nameNode),
-          typ: typ,
-          doc: doc,
-          exported: isExported(nameNode),
-          branch: branch
-        )
+      fields.addIdentDefsFields(child, branch)
     of nkRecCase:
       # Case object: discriminator + branches
       # First child is the discriminator (nkIdentDefs)
       if child.len > 0 and child[0].kind == nkIdentDefs:
-        let discriminator = child[0]
-        let typNode = discriminator[^2]
-        let typ = if typNode.kind == nkEmpty: "" else: $typNode
-        let doc = extractDocComment(discriminator)
-        for i in 0..<discriminator.len - 2:
-          let nameNode = discriminator[i]
-          result.add FieldInfo(
-            name: extractName(nameNode),
-            typ: typ,
-            doc: doc,
-            exported: isExported(nameNode),
-            branch: ""  # Discriminator has no branch
-          )
+        fields.addIdentDefsFields(child[0], "")  # Discriminator has no branch
       # Remaining children are branches
       for i in 1..<child.len:
         let branchNode = child[i]
         case branchNode.kind
         of nkOfBranch:
           # nkOfBranch: [condition(s), nkRecList]
-          let branchCond = "when " & $branchNode[0]
           if branchNode.len > 1:
-            let branchFields = extractObjectFields(branchNode[^1], branchCond)
-            for f in branchFields:
-              result.add f
+            fields.addObjectFields(branchNode[^1], "when " & $branchNode[0])
         of nkElse:
           # nkElse: [nkRecList]
           if branchNode.len > 0:
-            let branchFields = extractObjectFields(branchNode[0], "else")
-            for f in branchFields:
-              result.add f
+            fields.addObjectFields(branchNode[0], "else")
         else:
           discard
     of nkRecList:
       # Nested record list
-      let nested = extractObjectFields(child, branch)
-      for f in nested:
-        result.add f
+      fields.addObjectFields(child, branch)
     else:
       discard
 
+proc extractObjectFields(recList: PNode): seq[FieldInfo] =
+  ## Extract fields from an object's record list
+  result.addObjectFields(recList, "")
+
 proc extractEnumValues(enumDef: PNode): seq[FieldInfo] =
   ## Extract values from an enum definition
   result = @[]
@@ -395,112 +427,821 @@ proc extractVar(n: PNode, kind: string): DocEntry =
 
   result.signature = sig
 
-proc walkAst(n: PNode, entries: var seq[DocEntry]) =
-  ## Walk AST and collect documentation entries
+proc modulePaths(n: PNode): seq[string] =
+  ## Expand the target of an include/import/export statement into module
+  ## paths, e.g. `a/b`, `./a`, `"a.nim"`, `std/[os, strutils]`, `a as b`
+  result = @[]
+  if n == nil:
+    return
+  case n.kind
+  of nkIdent:
+    result.add $n.ident.s
+  of nkStrLit, nkRStrLit, nkTripleStrLit:
+    result.add n.strVal
+  of nkAccQuoted:
+    var name = ""
+    for child in n:
+      name.add $child
+    result.add name
+  of nkSym:
+    result.add n.sym.name.s
+  of nkDotExpr:
+    # export mod.symbol
+    if n.len >= 2:
+      for left in modulePaths(n[0]):
+        for right in modulePaths(n[1]):
+          result.add left & "." & right
+  of nkPrefix:
+    # ./a and ../a
+    if n.len >= 2:
+      for rest in modulePaths(n[1]):
+        result.add $n[0] & rest
+  of nkInfix:
+    if n.len >= 3:
+      let op = $n[0]
+      if op == "/":
+        for left in modulePaths(n[1]):
+          for right in modulePaths(n[2]):
+            result.add left & "/" & right
+      elif op == "as":
+        result = modulePaths(n[1])
+  of nkBracket:
+    for child in n:
+      result.add modulePaths(child)
+  of nkImportAs:
+    if n.len > 0:
+      result = modulePaths(n[0])
+  else:
+    discard
+
+proc walkAst(n: PNode, refs: var ModuleRefs, emit: EntryCallback) =
+  ## Walk AST and emit documentation entries in source order,
+  ## recording references to other modules in refs
   if n == nil:
     return
 
   case n.kind
+  of nkIncludeStmt:
+    for child in n:
+      for path in modulePaths(child):
+        refs.includes.add ModuleRef(path: path, line: child.info.line.int)
+  of nkImportStmt:
+    for child in n:
+      for path in modulePaths(child):
+        refs.imports.add ModuleRef(path: path, line: child.info.line.int)
+  of nkImportExceptStmt, nkFromStmt:
+    # import a except b / from a import b: the module is the first child
+    if n.len > 0:
+      for path in modulePaths(n[0]):
+        refs.imports.add ModuleRef(path: path, line: n.info.line.int)
+  of nkExportStmt:
+    for child in n:
+      for path in modulePaths(child):
+        refs.exports.add ModuleRef(path: path, line: child.info.line.int)
+  of nkExportExceptStmt:
+    if n.len > 0:
+      var excluded: seq[string] = @[]
+      for i in 1 ..< n.len:
+        excluded.add modulePaths(n[i])
+      for path in modulePaths(n[0]):
+        refs.exports.add ModuleRef(path: path, line: n.info.line.int, excluded: excluded)
   of nkProcDef:
-    entries.add extractProc(n, "proc")
+    emit extractProc(n, "proc")
   of nkFuncDef:
-    entries.add extractProc(n, "func")
+    emit extractProc(n, "func")
   of nkIteratorDef:
-    entries.add extractProc(n, "iterator")
+    emit extractProc(n, "iterator")
   of nkTemplateDef:
-    entries.add extractProc(n, "template")
+    emit extractProc(n, "template")
   of nkMacroDef:
-    entries.add extractProc(n, "macro")
+    emit extractProc(n, "macro")
   of nkTypeDef:
-    entries.add extractType(n)
+    emit extractType(n)
   of nkConstDef:
-    entries.add extractConst(n)
+    emit extractConst(n)
   of nkVarSection:
     # var section contains nkIdentDefs
     for child in n:
       if child.kind == nkIdentDefs:
-        entries.add extractVar(child, "var")
+        emit extractVar(child, "var")
   of nkLetSection:
     # let section contains nkIdentDefs
     for child in n:
       if child.kind == nkIdentDefs:
-        entries.add extractVar(child, "let")
+        emit extractVar(child, "let")
   else:
     for child in n:
-      walkAst(child, entries)
+      walkAst(child, refs, emit)
+
+# Declarations-only mode
+#
+# Routine bodies are most of the source in implementation-heavy modules, but
+# walkAst never looks inside them except for a leading doc comment. This
+# line-based pre-pass blanks bodies out before parsing so the parser only sees
+# declarations. Blank lines stand in for removed lines so line numbers match.
+
+const routineKeywords = ["proc", "func", "iterator", "template", "macro", "method", "converter"]
 
-proc extractModule*(filepath: string): ModuleDoc =
+proc indentWidth(line: string): int =
+  ## Number of leading spaces on a line
+  while result < line.len and line[result] == ' ':
+    inc result
+
+proc isBlank(line: string): bool =
+  line.strip.len == 0
+
+proc isRoutineHeader(line: string): bool =
+  ## Check whether a line starts a routine definition
+  let stripped = line.strip(trailing = false)
+  for kw in routineKeywords:
+    if stripped.len > kw.len and stripped.startsWith(kw) and stripped[kw.len] in {' ', '`'}:
+      return true
+  return false
+
+proc codePart(line: string): string =
+  ## Line content without a trailing comment, ignoring `#` inside literals
+  var inString = false
+  var i = 0
+  while i < line.len:
+    let c = line[i]
+    if inString:
+      if c == '\\':
+        inc i  # skip escaped character
+      elif c == '"':
+        inString = false
+    elif c == '"':
+      inString = true
+    elif c == '\'' and i + 2 < line.len and line[i + 2] == '\'':
+      i += 2  # skip character literal such as '#'
+    elif c == '#':
+      return line[0 ..< i].strip
+    inc i
+  return line.strip
+
+proc stripRoutineBodies*(source: string): string =
+  ## Replace routine bodies with `discard`, keeping the leading doc comment
+  ## (read by extractProcDoc) and the line count of the original source
+  let lines = source.splitLines
+  var output = newSeqOfCap[string](lines.len)
+  var i = 0
+  while i < lines.len:
+    if not isRoutineHeader(lines[i]):
+      output.add lines[i]
+      inc i
+      continue
+
+    # Find the `=` ending a (possibly multi-line) header. Forward declarations
+    # and one-line routines have none and are left untouched.
+    let headerIndent = indentWidth(lines[i])
+    var bodyStart = -1
+    var j = i
+    while j < lines.len:
+      if j > i and not isBlank(lines[j]) and indentWidth(lines[j]) <= headerIndent:
+        break
+      if codePart(lines[j]).endsWith("="):
+        bodyStart = j + 1
+        break
+      inc j
+    if bodyStart < 0:
+      output.add lines[i]
+      inc i
+      continue
+
+    for k in i ..< bodyStart:
+      output.add lines[k]
+
+    var k = bodyStart
+    var keepingDocs = true
+    var inDocBlock = false
+    var inTripleString = false
+    var replaced = false
+    while k < lines.len:
+      let line = lines[k]
+      if not inTripleString and not isBlank(line) and indentWidth(line) <= headerIndent:
+        break
+      let stripped = line.strip
+      if keepingDocs and (inDocBlock or stripped.len == 0 or stripped.startsWith("##")):
+        output.add line
+        if stripped.startsWith("##[") and not stripped.contains("]##"):
+          inDocBlock = true
+        elif inDocBlock and stripped.contains("]##"):
+          inDocBlock = false
+      else:
+        keepingDocs = false
+        if not replaced and not inTripleString and stripped.len > 0:
+          output.add spaces(indentWidth(line)) & "discard"
+          replaced = true
+        else:
+          output.add ""
+        if line.count("\"\"\"") mod 2 == 1:
+          inTripleString = not inTripleString
+      inc k
+    i = k
+
+  result = output.join("\n")
+
+proc newParseContext*(declarationsOnly = false, structuredDocs = false,
+                      stats = false): ParseContext =
+  ## Create parser state to share across files
+  result.conf = newConfigRef()
+  result.conf.verbosity = 0
+  result.identCache = newIdentCache()
+  result.declarationsOnly = declarationsOnly
+  result.structuredDocs = structuredDocs
+  result.stats = stats
+
+proc parseSource(ctx: ParseContext, filepath: string, source: string): PNode =
+  ## Parse the source of a Nim file into an untyped AST
+  let fileIdx = fileInfoIdx(ctx.conf, AbsoluteFile(filepath))
+  var parser: Parser
+
+  var source = source
+  if ctx.declarationsOnly:
+    source = stripRoutineBodies(source)
+  openParser(parser, fileIdx, llStreamOpen(source), ctx.identCache, ctx.conf)
+
+  result = parseAll(parser)
+  closeParser(parser)
+
+proc parseFileAst(ctx: ParseContext, filepath: string): PNode =
+  ## Parse a Nim source file into an untyped AST
+  ctx.parseSource(filepath, readFile(filepath))
+
+proc countNodes(n: PNode): int =
+  ## Number of nodes in an AST
+  if n == nil:
+    return 0
+  result = 1
+  for child in n:
+    result += countNodes(child)
+
+proc elapsedMs(start: MonoTime): float =
+  ## Milliseconds since start
+  (getMonoTime() - start).inNanoseconds.float / 1e6
+
+proc moduleDocComment(ast: PNode): string =
+  ## Extract the module doc comment (first statement of the file)
+  if ast.len > 0 and ast[0].comment.len > 0:
+    return ast[0].comment.strip
+  return ""
+
+proc extractModule*(filepath: string, declarationsOnly = false): ModuleDoc =
   ## Extract all documentation from a Nim source file
   result.file = filepath
   result.module = filepath.splitFile.name
-  result.entries = @[]
 
-  # Parse the file
-  var conf = newConfigRef()
-  conf.verbosity = 0
+  let ast = newParseContext(declarationsOnly).parseFileAst(filepath)
+  result.doc = moduleDocComment(ast)
 
-  let fileIdx = fileInfoIdx(conf, AbsoluteFile(filepath))
-  var parser: Parser
+  var entries: seq[DocEntry] = @[]
+  var refs: ModuleRefs
+  walkAst(ast, refs) do (entry: DocEntry):
+    entries.add entry
+  result.entries = entries
+  result.refs = refs
 
+# Structured docstrings
+#
+# With `--structured-docs`, entry docs are also parsed here, by ports of the
+# parts of docstring_parser's ReST and Google parsers the handler uses: the
+# description, parameter descriptions and the return description. Docs in
+# other styles, and anything docstring_parser would reject, are left to the
+# handler to parse from the raw `doc`.
+
+const
+  GoogleTitles = ["Arguments", "Args", "Parameters", "Params", "Raises", "Exceptions",
+                  "Except", "Attributes", "Example", "Examples", "Returns", "Yields"]
+  GoogleParamTitles = ["Arguments", "Args", "Parameters", "Params", "Attributes"]
+  GoogleRaiseTitles = ["Raises", "Exceptions", "Except"]
+  RstParamKeys = ["param", "parameter", "arg", "argument", "attribute", "key", "keyword"]
+  RstReturnKeys = ["return", "returns", "yield", "yields"]
+  RstRaiseKeys = ["raises", "raise", "except", "exception"]
+
+proc cleanDoc(text: string): string =
+  ## Port of Python's `inspect.cleandoc` for text without tabs
+  var lines = text.split('\n')
+  var margin = high(int)
+  for i in 1 ..< lines.len:
+    let content = lines[i].strip(trailing = false).len
+    if content > 0:
+      margin = min(margin, lines[i].len - content)
+  lines[0] = lines[0].strip(trailing = false)
+  if margin < high(int):
+    for i in 1 ..< lines.len:
+      lines[i] = lines[i].substr(margin)
+  var first = 0
+  var last = lines.len - 1
+  while last >= 0 and lines[last].len == 0:
+    dec last
+  while first <= last and lines[first].len == 0:
+    inc first
+  result = lines[first .. last].join("\n")
+
+proc stripNewlines(text: string): string =
+  ## Python's `text.strip("\n")`
+  text.strip(chars = {'\n'})
+
+proc joinDescription(text: string): string =
+  ## Short and long description joined as `ParsedDocstring.description` is
+  let nl = text.find('\n')
+  if nl < 0:
+    return text
+  let short = text[0 ..< nl]
+  let long = text.substr(nl + 1).strip
+  if short.len == 0:
+    result = long
+  elif long.len == 0:
+    result = short
+  else:
+    result = short & "\n\n" & long
+
+proc cleanFieldDoc(desc: string): string =
+  ## Keep the first line of a field description and dedent the rest
+  let nl = desc.find('\n')
+  if nl < 0:
+    return desc
+  result = desc[0 ..< nl] & "\n" & cleanDoc(desc.substr(nl + 1))
+
+proc googleTitle(line: string): string =
+  ## The Google section a line opens, or ""
+  let stripped = line.strip(leading = false, chars = {' ', '\t', '\r', '\f', '\v'})
+  if stripped.endsWith(":") and stripped[0 ..< ^1] in GoogleTitles:
+    return stripped[0 ..< ^1]
+  return ""
+
+proc isUnderline(line: string): bool =
+  ## Check whether a line underlines a NumPy section title
+  let stripped = line.strip
+  stripped.len > 0 and stripped.allCharsInSet({'-'})
+
+proc parseRstFields(text: string, fields: var DocFields): bool =
+  ## Port of docstring_parser's ReST parser; false where it would raise
+  let lines = text.split('\n')
+  var metaStart = lines.len
+  for i, line in lines:
+    if line.startsWith(":"):
+      metaStart = i
+      break
+  fields.style = "rst"
+  fields.description = joinDescription(lines[0 ..< metaStart].join("\n"))
+
+  var hasRtype = false
+  var i = metaStart
+  while i < lines.len:
+    # A field runs until the next line starting with a colon
+    var chunk = lines[i]
+    inc i
+    while i < lines.len and not lines[i].startsWith(":"):
+      chunk.add '\n'
+      chunk.add lines[i]
+      inc i
+
+    let body = chunk.strip(trailing = false, chars = {':'})
+    let colon = body.find(':')
+    if colon < 0:
+      return false
+    let args = body[0 ..< colon].splitWhitespace
+    if args.len == 0:
+      return false
+    let desc = cleanFieldDoc(body.substr(colon + 1).strip)
+    let key = args[0]
+    if key == "type" and args.len == 2:
+      discard
+    elif key == "rtype" and args.len <= 2:
+      hasRtype = true
+    elif key in RstParamKeys:
+      if args.len notin 2..3:
+        return false
+      fields.params.add (name: args[^1], doc: desc)
+    elif key in RstReturnKeys:
+      if args.len > 2:
+        return false
+      if not fields.hasReturns:
+        fields.hasReturns = true
+        fields.returns = desc
+    elif key in RstRaiseKeys:
+      if args.len > 2:
+        return false
+  # A lone `:rtype:` still gives a (description-less) return
+  if hasRtype:
+    fields.hasReturns = true
+  return true
+
+proc looksMultiple(text: string): bool =
+  ## Whether a Returns/Yields section starts with `name:` or `type:`
+  var i = 0
+  while i < text.len and text[i] in Whitespace:
+    inc i
+  let start = i
+  while i < text.len and text[i] notin Whitespace and text[i] != ':':
+    inc i
+  if i > start and i < text.len and text[i] == ':':
+    return true
+  let colon = text.find(':')
+  return colon > 0 and text[colon - 1] == ']'
+
+proc googleItemDoc(desc: string): string =
+  ## Clean the description after an item's colon
+  result = desc
+  if result.len > 0:
+    if result[0] == ' ':
+      result = result.substr(1)
+    result = cleanFieldDoc(result)
+  result = stripNewlines(result)
+
+proc googleArgName(before: string): string =
+  ## The name in `name (type)`, as docstring_parser's typed-arg pattern finds it
+  let close = before.rfind(')')
+  for paren in 1 ..< close:
+    if before[paren] == '(' and before[paren + 1 ..< close].strip.len > 0:
+      return before[0 ..< paren].strip(leading = false)
+  return before
+
+proc parseGoogleSections(text: string, fields: var DocFields): bool =
+  ## Port of docstring_parser's Google parser; false where it would raise
+  let lines = text.split('\n')
+  var titles: seq[tuple[line: int, title: string]]
+  for i, line in lines:
+    let title = googleTitle(line)
+    if title.len > 0:
+      titles.add (line: i, title: title)
+  let firstTitle = if titles.len > 0: titles[0].line else: lines.len
+  fields.style = "google"
+  fields.description = joinDescription(lines[0 ..< firstTitle].join("\n"))
+
+  var seen: seq[string]
+  for j, section in titles:
+    # docstring_parser keeps only the last of repeated sections
+    if section.title in seen:
+      return false
+    seen.add section.title
+
+    # A section ends at the next title or the first unindented line
+    let stop = if j + 1 < titles.len: titles[j + 1].line else: lines.len
+    var body: seq[string]
+    for k in section.line + 1 ..< stop:
+      if lines[k].len > 0 and lines[k][0] notin Whitespace:
+        break
+      body.add lines[k]
+    let chunk = stripNewlines(body.join("\n"))
+
+    if section.title in GoogleParamTitles or section.title in GoogleRaiseTitles:
+      # One item per line at the indentation of the first
+      var indent = 0
+      while indent < chunk.len and chunk[indent] in Whitespace:
+        if chunk[indent] == '\n':
+          return false
+        inc indent
+      if indent == chunk.len:
+        return false
+      var items: seq[string]
+      for line in chunk.split('\n'):
+        if line.len > indent and line[indent] notin Whitespace and
+            line[0 ..< indent] == chunk[0 ..< indent]:
+          items.add line.substr(indent)
+        else:
+          items[^1].add '\n'
+          items[^1].add line
+      for item in items:
+        let part = stripNewlines(item)
+        let colon = part.find(':')
+        if colon < 0:
+          return false
+        let before = part[0 ..< colon]
+        if '\n' in before:
+          return false
+        if section.title in GoogleParamTitles:
+          fields.params.add (name: googleArgName(before),
+                             doc: googleItemDoc(part.substr(colon + 1)))
+    elif section.title in ["Returns", "Yields"]:
+      if fields.hasReturns:
+        continue
+      let part = cleanDoc(chunk)
+      fields.hasReturns = true
+      if looksMultiple(part):
+        fields.returns = googleItemDoc(part.substr(part.find(':') + 1))
+      else:
+        fields.returns = part
+  return true
+
+proc parseDocFields*(doc: string, fields: var DocFields): bool =
+  ## Parse a docstring in ReST or Google style, as the handler would.
+  ## Returns false (leaving the doc to the handler) for empty docs, other
+  ## styles, mixed styles, and docs docstring_parser would reject.
+  if doc.len == 0 or '\t' in doc:
+    return false
+  let text = cleanDoc(doc)
+  var rst, google = false
+  for line in text.split('\n'):
+    if line.startsWith("@") or line.isUnderline:
+      return false  # Epydoc or NumPy
+    if line.startsWith(":"):
+      rst = true
+    elif googleTitle(line).len > 0:
+      google = true
+  if rst and google:
+    return false
+  if rst:
+    return parseRstFields(text, fields)
+  if google:
+    return parseGoogleSections(text, fields)
+  fields.style = ""
+  fields.description = joinDescription(text)
+  return true
+
+# JSON serialization
+#
+# Entries are serialized straight into a string buffer rather than through a
+# JsonNode tree, so output costs one pass and no intermediate allocations.
+
+proc addJsonKey(buf: var string, key: string) =
+  ## Append `, "key": ` to the buffer
+  buf.add ", \""
+  buf.add key
+  buf.add "\": "
+
+proc addStringList(buf: var string, key: string, items: seq[string]) =
+  ## Append a JSON array of strings under key
+  buf.addJsonKey key
+  buf.add '['
+  for i, item in items:
+    if i > 0:
+      buf.add ", "
+    escapeJson(item, buf)
+  buf.add ']'
+
+proc addFieldList(buf: var string, key: string, items: seq[FieldInfo]) =
+  ## Append a JSON array of fields/enum values under key
+  buf.addJsonKey key
+  buf.add '['
+  for i, item in items:
+    if i > 0:
+      buf.add ", "
+    buf.add "{\"name\": "
+    escapeJson(item.name, buf)
+    buf.addJsonKey "type"
+    escapeJson(item.typ, buf)
+    buf.addJsonKey "doc"
+    escapeJson(item.doc, buf)
+    buf.addJsonKey "exported"
+    buf.add $item.exported
+    buf.addJsonKey "branch"
+    escapeJson(item.branch, buf)
+    buf.add '}'
+  buf.add ']'
+
+proc addEntryJson*(buf: var string, entry: DocEntry) =
+  ## Append one entry as a JSON object to the buffer
+  buf.add "{\"name\": "
+  escapeJson(entry.name, buf)
+  buf.addJsonKey "kind"
+  escapeJson(entry.kind, buf)
+  buf.addJsonKey "line"
+  buf.add $entry.line
+  buf.addJsonKey "signature"
+  escapeJson(entry.signature, buf)
+  buf.addJsonKey "doc"
+  escapeJson(entry.doc, buf)
+  buf.addJsonKey "exported"
+  buf.add $entry.exported
+
+  if entry.params.len > 0:
+    buf.addJsonKey "params"
+    buf.add '['
+    for i, param in entry.params:
+      if i > 0:
+        buf.add ", "
+      buf.add "{\"name\": "
+      escapeJson(param.name, buf)
+      buf.addJsonKey "type"
+      escapeJson(param.typ, buf)
+      buf.add '}'
+    buf.add ']'
+
+  if entry.returns.len > 0:
+    buf.addJsonKey "returns"
+    escapeJson(entry.returns, buf)
+
+  if entry.pragmas.len > 0:
+    buf.addStringList "pragmas", entry.pragmas
+
+  if entry.raises.len > 0:
+    buf.addStringList "raises", entry.raises
+
+  if entry.fields.len > 0:
+    buf.addFieldList "fields", entry.fields
+
+  if entry.values.len > 0:
+    buf.addFieldList "values", entry.values
+
+  if entry.hasDocFields:
+    buf.addJsonKey "doc_fields"
+    buf.add "{\"style\": "
+    escapeJson(entry.docFields.style, buf)
+    buf.addJsonKey "description"
+    escapeJson(entry.docFields.description, buf)
+    buf.addJsonKey "params"
+    buf.add '['
+    for i, param in entry.docFields.params:
+      if i > 0:
+        buf.add ", "
+      buf.add "{\"name\": "
+      escapeJson(param.name, buf)
+      buf.addJsonKey "description"
+      escapeJson(param.doc, buf)
+      buf.add '}'
+    buf.add ']'
+    if entry.docFields.hasReturns:
+      buf.addJsonKey "returns"
+      escapeJson(entry.docFields.returns, buf)
+    buf.add '}'
+
+  buf.add '}'
+
+proc addRefList(buf: var string, key: string, items: seq[ModuleRef]) =
+  ## Append a JSON array of module references under key
+  buf.addJsonKey key
+  buf.add '['
+  for i, item in items:
+    if i > 0:
+      buf.add ", "
+    buf.add "{\"path\": "
+    escapeJson(item.path, buf)
+    buf.addJsonKey "line"
+    buf.add $item.line
+    if item.excluded.len > 0:
+      buf.addStringList "except", item.excluded
+    buf.add '}'
+  buf.add ']'
+
+proc addStats(buf: var string, stats: ExtractStats) =
+  ## Append extraction stats under "stats"
+  buf.addJsonKey "stats"
+  buf.add "{\"read_ms\": "
+  buf.add formatFloat(stats.readMs, ffDecimal, 3)
+  buf.addJsonKey "parse_ms"
+  buf.add formatFloat(stats.parseMs, ffDecimal, 3)
+  buf.addJsonKey "walk_ms"
+  buf.add formatFloat(stats.walkMs, ffDecimal, 3)
+  buf.addJsonKey "doc_fields_ms"
+  buf.add formatFloat(stats.docFieldsMs, ffDecimal, 3)
+  buf.addJsonKey "serialize_ms"
+  buf.add formatFloat(stats.serializeMs, ffDecimal, 3)
+  buf.addJsonKey "ast_nodes"
+  buf.add $stats.astNodes
+  buf.addJsonKey "entries"
+  buf.add $stats.entries
+  buf.addJsonKey "output_bytes"
+  buf.add $stats.outputBytes
+  buf.add '}'
+
+proc addModuleFooter(buf: var string, refs: ModuleRefs,
+                     stats = none(ExtractStats)) =
+  ## Close the entries array and append module references, and stats if given
+  buf.add ']'
+  buf.addRefList "includes", refs.includes
+  buf.addRefList "imports", refs.imports
+  buf.addRefList "exports", refs.exports
+  if stats.isSome:
+    var stats = stats.get
+    stats.outputBytes += buf.len
+    buf.addStats stats
+  buf.add "}\n"
+
+proc addModuleHeader(buf: var string, module, file, doc: string) =
+  ## Append the module-level fields and open the entries array
+  buf.add "{\"module\": "
+  escapeJson(module, buf)
+  buf.addJsonKey "file"
+  escapeJson(file, buf)
+  buf.addJsonKey "doc"
+  escapeJson(doc, buf)
+  buf.addJsonKey "entries"
+  buf.add '['
+
+proc writeJson*(doc: ModuleDoc, output: File) =
+  ## Serialize already-extracted module documentation to output
+  var buf = newStringOfCap(4096)
+  buf.addModuleHeader(doc.module, doc.file, doc.doc)
+  output.write buf
+  for i, entry in doc.entries:
+    buf.setLen 0
+    if i > 0:
+      buf.add ",\n"
+    buf.addEntryJson entry
+    output.write buf
+  buf.setLen 0
+  buf.addModuleFooter doc.refs
+  output.write buf
+
+proc streamModule*(ctx: ParseContext, filepath: string, output: File) =
+  ## Extract documentation from a Nim source file and stream it to output
+  ## as JSON while walking the AST, holding at most one entry in memory
+  var stats: ExtractStats
+  var phase = getMonoTime()
   let source = readFile(filepath)
-  openParser(parser, fileIdx, llStreamOpen(source), newIdentCache(), conf)
+  stats.readMs = phase.elapsedMs
+  phase = getMonoTime()
+  let ast = ctx.parseSource(filepath, source)
+  stats.parseMs = phase.elapsedMs
 
-  let ast = parseAll(parser)
-  closeParser(parser)
+  var buf = newStringOfCap(4096)
+  buf.addModuleHeader(filepath.splitFile.name, filepath, moduleDocComment(ast))
+  output.write buf
+  stats.outputBytes = buf.len
 
-  # Extract module doc comment
-  if ast.len > 0 and ast[0].comment.len > 0:
-    result.doc = ast[0].comment.strip
-
-  walkAst(ast, result.entries)
-
-proc toJson*(doc: ModuleDoc): JsonNode =
-  ## Convert module documentation to JSON
-  result = %*{
-    "module": doc.module,
-    "file": doc.file,
-    "doc": doc.doc,
-    "entries": []
-  }
-
-  for entry in doc.entries:
-    var entryJson = %*{
-      "name": entry.name,
-      "kind": entry.kind,
-      "line": entry.line,
-      "signature": entry.signature,
-      "doc": entry.doc,
-      "exported": entry.exported
-    }
-
-    if entry.params.len > 0:
-      entryJson["params"] = %entry.params.mapIt(%*{"name": it.name, "type": it.typ})
-
-    if entry.returns.len > 0:
-      entryJson["returns"] = %entry.returns
-
-    if entry.pragmas.len > 0:
-      entryJson["pragmas"] = %entry.pragmas
-
-    if entry.raises.len > 0:
-      entryJson["raises"] = %entry.raises
-
-    if entry.fields.len > 0:
-      entryJson["fields"] = %entry.fields.mapIt(%*{
-        "name": it.name,
-        "type": it.typ,
-        "doc": it.doc,
-        "exported": it.exported,
-        "branch": it.branch
-      })
-
-    if entry.values.len > 0:
-      entryJson["values"] = %entry.values.mapIt(%*{
-        "name": it.name,
-        "type": it.typ,
-        "doc": it.doc,
-        "exported": it.exported,
-        "branch": it.branch
-      })
-
-    result["entries"].add entryJson
+  var first = true
+  var refs: ModuleRefs
+  phase = getMonoTime()
+  walkAst(ast, refs) do (entry: DocEntry):
+    var entry = entry
+    if ctx.structuredDocs:
+      let docFieldsStart = getMonoTime()
+      entry.hasDocFields = parseDocFields(entry.doc, entry.docFields)
+      stats.docFieldsMs += docFieldsStart.elapsedMs
+    let serializeStart = getMonoTime()
+    buf.setLen 0
+    if not first:
+      buf.add ",\n"
+    first = false
+    buf.addEntryJson entry
+    output.write buf
+    stats.outputBytes += buf.len
+    inc stats.entries
+    stats.serializeMs += serializeStart.elapsedMs
+  stats.walkMs = phase.elapsedMs - stats.docFieldsMs - stats.serializeMs
+  buf.setLen 0
+  if ctx.stats:
+    stats.astNodes = countNodes(ast)
+    buf.addModuleFooter(refs, some(stats))
+  else:
+    buf.addModuleFooter refs
+  output.write buf
+
+proc streamModule*(filepath: string, output: File, declarationsOnly = false) =
+  ## Extract documentation from a single Nim source file and stream it to output
+  newParseContext(declarationsOnly).streamModule(filepath, output)
+
+# Project mode
+#
+# Extracts every module under one or more directories in a single process,
+# sharing one ConfigRef and IdentCache across all files.
+
+proc globMatchAt(pattern, path: string, p, s: int): bool =
+  ## Match pattern[p..] against path[s..]
+  if p == pattern.len:
+    return s == path.len
+  if pattern[p] == '*':
+    if p + 1 < pattern.len and pattern[p + 1] == '*':
+      # `**` spans directories; `**/` also matches zero directories
+      let next = p + 2
+      if next < pattern.len and pattern[next] == '/' and globMatchAt(pattern, path, next + 1, s):
+        return true
+      for k in s .. path.len:
+        if globMatchAt(pattern, path, next, k):
+          return true
+      return false
+    # `*` stays within one path segment
+    for k in s .. path.len:
+      if globMatchAt(pattern, path, p + 1, k):
+        return true
+      if k < path.len and path[k] == '/':
+        return false
+    return false
+  if s < path.len and (pattern[p] == path[s] or (pattern[p] == '?' and path[s] != '/')):
+    return globMatchAt(pattern, path, p + 1, s + 1)
+  return false
+
+proc globMatch*(pattern, path: string): bool =
+  ## Match a `/`-separated relative path against a glob pattern.
+  ## `*` and `?` match within one path segment, `**` matches across segments.
+  globMatchAt(pattern, path, 0, 0)
+
+proc projectFiles*(dir: string, includes, excludes: seq[string]): seq[string] =
+  ## List the .nim files under dir (sorted, relative, `/`-separated) that
+  ## match at least one include glob (if any) and no exclude glob.
+  ## Symlinked files are listed; symlinked directories are not entered
+  ## (as `_nim_files` in the collector).
+  for path in walkDirRec(dir, yieldFilter = {pcFile, pcLinkToFile}, relative = true):
+    let rel = path.replace('\\', '/')
+    if not rel.endsWith(".nim") or not fileExists(dir / path):
+      continue
+    if includes.len > 0 and not includes.anyIt(globMatch(it, rel)):
+      continue
+    if excludes.anyIt(globMatch(it, rel)):
+      continue
+    result.add rel
+  result.sort()
+
+proc streamProject*(ctx: ParseContext, dirs, includes, excludes: seq[string], output: File) =
+  ## Extract every matching module under dirs and stream them to output
+  ## as `{"modules": [...]}`, one module at a time
+  output.write "{\"modules\": [\n"
+  var first = true
+  for dir in dirs:
+    for rel in projectFiles(dir, includes, excludes):
+      if not first:
+        output.write ",\n"
+      first = false
+      ctx.streamModule(dir / rel, output)
+  output.write "]}\n"
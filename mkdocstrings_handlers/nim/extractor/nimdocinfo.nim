@@ -1,22 +1,70 @@
 ## nimdocinfo - Extract documentation from Nim source files
-import std/[json, os]
+import std/[os, parseopt]
 import extractor
 
 const
   JsonStartMarker* = "<<MKDOCSTRINGS_JSON_START>>"
   JsonEndMarker* = "<<MKDOCSTRINGS_JSON_END>>"
 
+  Usage = """Usage:
+  nimdocinfo [--declarations-only] [--structured-docs] [--stats] <file.nim>
+  nimdocinfo [--declarations-only] [--structured-docs] [--stats] --project:<dir> [--project:<dir>...]
+             [--include:<glob>...] [--exclude:<glob>...]
+
+  --stats adds phase timings and sizes to each module's output"""
+
 when isMainModule:
-  if paramCount() < 1:
-    echo "Usage: nimdocinfo <file.nim>"
+  var filepath = ""
+  var declarationsOnly = false
+  var structuredDocs = false
+  var stats = false
+  var projectDirs, includes, excludes: seq[string]
+
+  for kind, key, val in getopt():
+    case kind
+    of cmdArgument:
+      filepath = key
+    of cmdLongOption, cmdShortOption:
+      case key
+      of "declarations-only":
+        declarationsOnly = true
+      of "structured-docs":
+        structuredDocs = true
+      of "stats":
+        stats = true
+      of "project":
+        projectDirs.add val
+      of "include":
+        includes.add val
+      of "exclude":
+        excludes.add val
+      else:
+        echo "Error: Unknown option: ", key
+        echo Usage
+        quit(1)
+    of cmdEnd:
+      discard
+
+  let ctx = newParseContext(declarationsOnly, structuredDocs, stats)
+
+  if projectDirs.len > 0:
+    for dir in projectDirs:
+      if not dirExists(dir):
+        echo "Error: Directory not found: ", dir
+        quit(1)
+    echo JsonStartMarker
+    ctx.streamProject(projectDirs, includes, excludes, stdout)
+    echo JsonEndMarker
+    quit(0)
+
+  if filepath.len == 0:
+    echo Usage
     quit(1)
 
-  let filepath = paramStr(1)
   if not fileExists(filepath):
     echo "Error: File not found: ", filepath
     quit(1)
 
-  let doc = extractModule(filepath)
   echo JsonStartMarker
-  echo doc.toJson.pretty
+  ctx.streamModule(filepath, stdout)
   echo JsonEndMarker
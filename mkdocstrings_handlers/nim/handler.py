@@ -2,16 +2,41 @@
 
 from __future__ import annotations
 
+import hashlib
+import os
 import re
 import subprocess
-from collections.abc import Mapping, MutableMapping
+from collections import OrderedDict
+from collections.abc import Hashable, Mapping, MutableMapping
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import asdict, replace
 from pathlib import Path
 from typing import Any, ClassVar
+from xml.etree.ElementTree import Element
 
+from markupsafe import Markup
 from mkdocstrings import BaseHandler, CollectorItem, HandlerOptions, get_logger
 
-from mkdocstrings_handlers.nim.collector import NimCollector, NimEntry, NimModule
-from mkdocstrings_handlers.nim.docstring import DocstringStyle, parse_docstring
+from mkdocstrings_handlers.nim import deferred, profiling, tracing, watcher
+from mkdocstrings_handlers.nim.cache import DirectoryStore, ModuleStore, SQLiteStore
+from mkdocstrings_handlers.nim.collector import (
+    BACKENDS,
+    NimCollector,
+    NimEntry,
+    NimModule,
+    NimPackage,
+    summarize_stats,
+)
+from mkdocstrings_handlers.nim.docstring import (
+    PARSER_VERSION,
+    DocstringStyle,
+    DocstringStyleError,
+    ParsedDocstring,
+    infer_docstring_style,
+    parse_docstring,
+    summary_line,
+)
+from mkdocstrings_handlers.nim.pages import SPLIT_MODES, is_page, module_pages, page_name
 
 _logger = get_logger(__name__)
 
@@ -20,6 +45,43 @@ _SOURCE_URL_PATTERN = re.compile(
     r"^https?://[^/]+/[^/]+/[^/]+/?$"  # https://host/org/repo or https://host/org/repo/
 )
 
+# Maximum number of converted docstrings to memoize per Markdown instance
+_MAX_MARKDOWN_CACHE_SIZE = 1024
+
+# Default location of the extraction cache, relative to the project directory
+_DEFAULT_CACHE_DIR = ".cache/mkdocstrings-nim"
+
+# Seconds a collect waits for the watcher to finish re-extracting saved files
+_WATCH_WAIT = 60
+
+# Entry kinds whose overloads group_overloads merges
+_OVERLOADABLE_KINDS = frozenset({"proc", "func", "iterator", "template", "macro"})
+
+# Contents of .git/HEAD when no branch is checked out
+_DETACHED_HEAD = re.compile(r"[0-9a-f]{40}|[0-9a-f]{64}")
+
+
+def _find_git_dir(start: Path) -> Path | None:
+    """Return the git directory of the repository containing start, or None."""
+    for directory in (start, *start.parents):
+        dot_git = directory / ".git"
+        if dot_git.is_dir():
+            return dot_git
+        if dot_git.is_file():
+            # Worktrees and submodules: ".git" is a file holding "gitdir: <path>"
+            content = dot_git.read_text(encoding="utf-8").strip()
+            if content.startswith("gitdir:"):
+                return directory / content[len("gitdir:") :].strip()
+    return None
+
+
+def _autoref_context(kwargs: Mapping[str, Any]) -> Hashable:
+    """Return what an autoref hook contributes to converted Markdown, for memo keys."""
+    hook = kwargs.get("autoref_hook")
+    if hook is None:
+        return None
+    return (type(hook), tuple(hook.get_context().as_dict().items()))
+
 
 class NimHandler(BaseHandler):
     """The Nim handler class."""
@@ -55,19 +117,95 @@ class NimHandler(BaseHandler):
         )
         self.paths = paths or ["src"]
         self.base_dir = base_dir
-        self.config_options = self._validate_and_enhance_config(config_options or {}, base_dir)
-        self.collector = NimCollector(self.paths, base_dir)
+        self.config_options = self._validate_and_enhance_config(config_options or {})
+        self.collector = self._new_collector()
+        # Background re-extraction of saved files, started on first collect
+        self._watcher: watcher.Watcher | None = None
+        # Converted Markdown and the headings it reported, keyed by (text,
+        # heading_level, html_id, strip_paragraph, autoref context). Only valid for the Markdown instance it was produced
+        # with (see do_convert_markdown).
+        self._markdown_cache: OrderedDict[
+            tuple[Hashable, ...], tuple[Markup, tuple[Element, ...]]
+        ] = OrderedDict()
+        self._markdown_cache_md: Any = None
+        # Git branch for source links, detected on first use (see get_options)
+        self._detected_source_ref: str | None = None
+        trace_file = self.config_options.get("trace_file") or os.environ.get(tracing.TRACE_ENV_VAR)
+        if trace_file:
+            tracing.start(base_dir / trace_file)
+        profile_dir = self.config_options.get("profile_dir") or os.environ.get(
+            profiling.PROFILE_ENV_VAR
+        )
+        self._profiler = profiling.Profiler(base_dir / profile_dir) if profile_dir else None
+        # Last item collected while profiling, and its identifier, so that
+        # rendering it is added to the same profile
+        self._profiled_item: tuple[CollectorItem, str] | None = None
+
+    def _new_collector(self) -> NimCollector:
+        """Create a collector for the handler's paths and options."""
+        return NimCollector(
+            self.paths,
+            self.base_dir,
+            declarations_only=self.config_options.get("declarations_only", False),
+            project_mode=self.config_options.get("project_mode", False),
+            include=self.config_options.get("project_include"),
+            exclude=self.config_options.get("project_exclude"),
+            backend=self.config_options["backend"],
+            store=self._module_store(self.config_options, self.base_dir),
+            structured_docs=self.config_options.get("native_docstrings", False),
+            collect_stats=self.config_options.get("extractor_stats", False),
+            nimcache=self._cache_root(self.config_options, self.base_dir) / "nimcache",
+        )
+
+    def _wait_for_watcher(self) -> None:
+        """Start watching sources if enabled, and let pending re-extractions finish.
+
+        The watcher outlives this handler: under ``mkdocs serve``, the
+        handlers of later rebuilds with the same configuration share it.
+        """
+        if self._watcher is None:
+            if self.collector.store is None:
+                _logger.warning(
+                    "mkdocstrings-nim: watch needs the extraction cache, but cache_dir is false"
+                )
+                self.config_options["watch"] = False
+                return
+            key = (
+                str(self.base_dir.resolve()),
+                repr(self.paths),
+                repr(sorted(self.config_options.items())),
+            )
+            self._watcher = watcher.watch(key, self._new_collector)
+        if not self._watcher.wait_idle(_WATCH_WAIT):
+            _logger.debug("mkdocstrings-nim: collecting before the watcher finished extracting")
 
     @staticmethod
     def _detect_git_branch(base_dir: Path) -> str | None:
         """Detect the current git branch.
 
+        Reads ``.git/HEAD`` directly, and only runs git for layouts it does
+        not understand (``GIT_DIR`` set, reftable repositories).
+
         Args:
-            base_dir: Directory to run git command in.
+            base_dir: Directory inside the repository.
 
         Returns:
             Branch name or None if not in a git repo or detection fails.
         """
+        if "GIT_DIR" not in os.environ:
+            try:
+                git_dir = _find_git_dir(base_dir.resolve())
+                if git_dir is None:
+                    return None
+                head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+            except OSError:
+                head = ""
+            branch = head[len("ref: refs/heads/") :] if head.startswith("ref: refs/heads/") else ""
+            if branch and branch != ".invalid":  # reftable stores a placeholder HEAD
+                return branch
+            if _DETACHED_HEAD.fullmatch(head):
+                return None
+
         try:
             result = subprocess.run(
                 ["git", "rev-parse", "--abbrev-ref", "HEAD"],
@@ -84,36 +222,97 @@ class NimHandler(BaseHandler):
             pass
         return None
 
-    def _validate_and_enhance_config(
-        self, config: dict[str, Any], base_dir: Path
-    ) -> dict[str, Any]:
-        """Validate configuration and auto-detect missing values.
+    def _source_ref(self) -> str:
+        """Return the git branch source links point at, detecting it once.
+
+        Returns:
+            The current branch, or "main" if it cannot be detected.
+        """
+        if self._detected_source_ref is None:
+            branch = self._detect_git_branch(self.base_dir)
+            if branch:
+                _logger.debug(f"Auto-detected source_ref: {branch}")
+            else:
+                branch = "main"  # fallback default
+                if self.config_options.get("show_source", True) and self.config_options.get(
+                    "source_url"
+                ):
+                    _logger.warning(
+                        "mkdocstrings-nim: Could not auto-detect git branch for source_ref. "
+                        "Defaulting to 'main'. Set source_ref explicitly if this is incorrect."
+                    )
+            self._detected_source_ref = branch
+        return self._detected_source_ref
+
+    @staticmethod
+    def _cache_root(config: Mapping[str, Any], base_dir: Path) -> Path:
+        """Return the project's cache directory, even if the extraction cache is disabled.
 
         Args:
-            config: Raw configuration options.
+            config: Handler options; reads cache_dir.
             base_dir: Project base directory.
 
         Returns:
-            Enhanced configuration with auto-detected values.
+            base_dir / cache_dir, or base_dir / .cache/mkdocstrings-nim if unset or false.
+        """
+        cache_dir = config.get("cache_dir")
+        if cache_dir in (None, True, False):
+            cache_dir = _DEFAULT_CACHE_DIR
+        return base_dir / cache_dir
+
+    @staticmethod
+    def _module_store(config: Mapping[str, Any], base_dir: Path) -> ModuleStore | None:
+        """Create the persistent store of extracted modules.
+
+        Args:
+            config: Handler options; reads cache_dir (directory relative to
+                base_dir, None for .cache/mkdocstrings-nim, or False to disable),
+                cache_backend and cache_max_size.
+            base_dir: Project base directory.
+
+        Returns:
+            The store, or None if disabled.
+        """
+        if config.get("cache_dir") is False:
+            return None
+        root = NimHandler._cache_root(config, base_dir)
+
+        cache_backend = config.get("cache_backend", "directory")
+        if cache_backend == "sqlite":
+            max_size = int(config.get("cache_max_size", 512)) * 1024 * 1024
+            return SQLiteStore(root / "extractions.sqlite3", max_size=max_size)
+        if cache_backend != "directory":
+            _logger.warning(
+                f"Unknown cache_backend '{cache_backend}', falling back to 'directory'. "
+                "Valid options: ['directory', 'sqlite']"
+            )
+        return DirectoryStore(root)
+
+    def _validate_and_enhance_config(self, config: dict[str, Any]) -> dict[str, Any]:
+        """Validate configuration and normalize values.
+
+        Does no file system or subprocess work, so constructing the handler
+        stays cheap; source_ref is detected later, by get_options.
+
+        Args:
+            config: Raw configuration options.
+
+        Returns:
+            Validated configuration.
         """
         config = config.copy()
+
+        backend = config.get("backend", "ast")
+        if backend not in BACKENDS:
+            _logger.warning(
+                f"Unknown backend '{backend}', falling back to 'ast'. Valid options: {list(BACKENDS)}"
+            )
+            backend = "ast"
+        config["backend"] = backend
+
         show_source = config.get("show_source", True)
         source_url = config.get("source_url")
-        source_ref = config.get("source_ref")
-
-        # Auto-detect source_ref from git if not set
-        if source_ref is None:
-            detected_branch = self._detect_git_branch(base_dir)
-            if detected_branch:
-                config["source_ref"] = detected_branch
-                _logger.debug(f"Auto-detected source_ref: {detected_branch}")
-            else:
-                config["source_ref"] = "main"  # fallback default
-                if show_source and source_url:
-                    _logger.warning(
-                        "mkdocstrings-nim: Could not auto-detect git branch for source_ref. "
-                        "Defaulting to 'main'. Set source_ref explicitly if this is incorrect."
-                    )
+        # An unset source_ref is detected from git when options are first requested
 
         # Validate source_url format
         if source_url:
@@ -166,53 +365,231 @@ class NimHandler(BaseHandler):
             "source_url": None,  # e.g., "https://github.com/owner/repo"
             "source_ref": None,  # auto-detected from git, or set explicitly
             "type_field_doc_style": "inline",  # "inline" or "docstring"
+            "show_reexports": True,  # Document symbols a module re-exports with `export`
+            "declarations_only": False,  # Skip routine bodies when extracting (handler-level)
+            "native_docstrings": False,  # Parse RST/Google docstrings in nimdocinfo (handler-level)
+            "project_mode": False,  # Extract all modules in one pass (handler-level)
+            "project_include": [],  # Module globs for project mode / wildcards (handler-level)
+            "project_exclude": [],  # Module globs to leave out (handler-level)
+            "backend": "ast",  # "ast" or "semantic" (nim jsondoc) (handler-level)
+            "cache_dir": None,  # Persistent extraction cache; false disables (handler-level)
+            "cache_backend": "directory",  # "directory" or "sqlite" (handler-level)
+            "cache_max_size": 512,  # MB; sqlite cache is trimmed to this size (handler-level)
+            "trace_file": None,  # Write a trace-event timeline of the build (handler-level)
+            "profile_dir": None,  # Write cProfile output per identifier (handler-level)
+            "extractor_stats": False,  # Log nimdocinfo phase timings and sizes (handler-level)
+            "split_by": None,  # Split modules across pages: "kind" or "alpha"
+            "page": None,  # Page of a split module to render; unset renders the index
+            "summary_only": False,  # Render a table of symbols instead of their documentation
+            "group_overloads": False,  # Render a routine's overloads as one block
+            "defer_bodies": False,  # Load entry bodies from a fragment file on expand
+            "watch": False,  # Re-extract saved files in the background (handler-level)
         }
-        return {**defaults, **self.config_options, **local_options}
+        options = {**defaults, **self.config_options, **local_options}
+        if options["source_ref"] is None:
+            options["source_ref"] = self._source_ref()
+        self._validate_split(options)
+        return options
 
-    def _parse_entry_docstring(self, entry: NimEntry, style: DocstringStyle) -> None:
-        """Parse docstring and update entry with structured documentation.
+    @staticmethod
+    def _validate_split(options: dict[str, Any]) -> None:
+        """Check the split_by and page options, resetting invalid values.
 
         Args:
-            entry: The entry to update.
-            style: Docstring style to use.
+            options: Combined options (modified in place).
         """
-        if not entry.doc:
+        split_by = options["split_by"]
+        if split_by is not None and split_by not in SPLIT_MODES:
+            _logger.warning(
+                f"mkdocstrings-nim: unknown split_by '{split_by}', modules are not split. "
+                f"Valid options: {list(SPLIT_MODES)}"
+            )
+            options["split_by"] = split_by = None
+        page = options["page"]
+        if page is None:
             return
+        if split_by is None:
+            _logger.warning(f"mkdocstrings-nim: page '{page}' is ignored without split_by")
+            options["page"] = None
+        elif not is_page(str(page), split_by):
+            _logger.warning(
+                f"mkdocstrings-nim: '{page}' is not a page of split_by: {split_by}, "
+                "rendering the index instead"
+            )
+            options["page"] = None
 
-        parsed = parse_docstring(entry.doc, style)
+    def do_convert_markdown(
+        self,
+        text: str,
+        heading_level: int,
+        html_id: str = "",
+        *,
+        strip_paragraph: bool = False,
+        **kwargs: Any,
+    ) -> Markup:
+        """Render Markdown text, memoizing the result; for use inside templates.
+
+        Overloads and re-declared symbols frequently share identical docstrings,
+        so conversions are memoized by content and heading context. Autorefs
+        found while converting are annotated with the hook's context, so that
+        context is part of the key too. Headings the conversion reports for
+        the table of contents are memoized with the HTML and reported again
+        on every hit. The memo is bounded to _MAX_MARKDOWN_CACHE_SIZE entries
+        and is dropped whenever mkdocstrings installs a new Markdown instance
+        (once per page), since conversion output depends on the page being
+        rendered.
 
-        # Replace raw docstring with just the description (without field lists)
-        entry.doc = parsed.description
+        Args:
+            text: The text to convert.
+            heading_level: The base heading level to start all Markdown headings from.
+            html_id: The HTML id of the element that's considered the parent of this element.
+            strip_paragraph: Whether to exclude the `<p>` tag from around the whole output.
+            **kwargs: Additional arguments for BaseHandler.do_convert_markdown.
 
-        # Update params with descriptions from docstring
-        for param in entry.params:
-            for doc_param in parsed.params:
-                if param.name == doc_param.name:
-                    param.description = doc_param.description
-                    break
+        Returns:
+            An HTML string.
+        """
+        md = self._md
+        if md is not self._markdown_cache_md:
+            self._markdown_cache.clear()
+            self._markdown_cache_md = md
+
+        key = (text, heading_level, html_id, strip_paragraph, _autoref_context(kwargs))
+        cached = self._markdown_cache.get(key)
+        if cached is not None:
+            self._markdown_cache.move_to_end(key)
+            html, headings = cached
+            self._headings.extend(headings)
+            return html
+
+        reported = len(self._headings)
+        html = super().do_convert_markdown(
+            text, heading_level, html_id, strip_paragraph=strip_paragraph, **kwargs
+        )
 
-        # Add returns description
-        if parsed.returns:
-            entry.returns_doc = parsed.returns.description
+        while len(self._markdown_cache) >= _MAX_MARKDOWN_CACHE_SIZE:
+            self._markdown_cache.popitem(last=False)
 
-    def collect(self, identifier: str, options: HandlerOptions) -> CollectorItem:
-        """Collect documentation for an identifier.
+        self._markdown_cache[key] = (html, tuple(self._headings[reported:]))
+        return html
+
+    def _parse_docstring(
+        self, doc: str, style: DocstringStyle, *, fallback: bool = True
+    ) -> ParsedDocstring:
+        """Parse a docstring, sharing results through the SQLite store if enabled.
+
+        Only the SQLite store caches docstrings: a file per docstring would
+        cost more than parsing it.
 
         Args:
-            identifier: Module or item identifier.
-            options: Collection options.
+            doc: Raw docstring text.
+            style: Docstring style to use.
+            fallback: Whether to detect the style if the docstring does not
+                parse in the given one (see parse_docstring).
 
         Returns:
-            Collected documentation data.
+            Parsed docstring structure.
+
+        Raises:
+            DocstringStyleError: If the docstring does not parse in the given
+                style and fallback is off.
         """
-        _logger.debug(f"Collecting {identifier}")
-        module = self.collector.collect(identifier)
+        store = self.collector.store
+        with tracing.span("parse docstring", style=style.value):
+            if not isinstance(store, SQLiteStore):
+                return parse_docstring(doc, style, fallback=fallback)
+            mode = "fallback" if fallback else "strict"
+            key = hashlib.sha1(f"{PARSER_VERSION}:{style.value}:{mode}:{doc}".encode()).hexdigest()
+            # Parsing is cheaper than claiming the key: a miss takes one write
+            data = store.fetch(
+                key,
+                lambda: asdict(parse_docstring(doc, style, fallback=fallback)),
+                kind="docstring",
+                claim=False,
+            )
+            return ParsedDocstring.from_dict(data)
 
-        # Filter non-exported entries unless show_private is True
-        show_private = options.get("show_private", False)
-        if not show_private:
-            module.entries = [e for e in module.entries if e.exported]
+    def _parse_entry_docstring(
+        self, entry: NimEntry, style: DocstringStyle, *, inferred: bool = False
+    ) -> NimEntry:
+        """Parse an entry's docstring into structured documentation.
+
+        Docstrings nimdocinfo already parsed in the same style
+        (``native_docstrings``) are not parsed again.
 
+        Args:
+            entry: The entry, as collected (left unchanged).
+            style: Docstring style to use.
+            inferred: Whether style was inferred for the module, in which
+                case the docstring is not parsed again in another style.
+
+        Returns:
+            A copy of the entry with its docstring reduced to the description,
+            and parameter and return descriptions filled in.
+
+        Raises:
+            DocstringStyleError: If style was inferred and the docstring does
+                not parse in it.
+        """
+        if not entry.doc:
+            return entry
+
+        if entry.parsed_doc is not None and entry.parsed_doc_style in ("", style.value):
+            parsed = entry.parsed_doc
+        else:
+            parsed = self._parse_docstring(entry.doc, style, fallback=not inferred)
+        descriptions = {param.name: param.description for param in reversed(parsed.params)}
+        return replace(
+            entry,
+            # Replace raw docstring with just the description (without field lists)
+            doc=parsed.description,
+            params=[
+                replace(param, description=descriptions[param.name])
+                if param.name in descriptions
+                else param
+                for param in entry.params
+            ],
+            returns_doc=parsed.returns.description if parsed.returns else entry.returns_doc,
+        )
+
+    def _module_docstring_style(self, module: NimModule) -> DocstringStyle:
+        """Return the docstring style inferred for a module, inferring it once.
+
+        The decision is kept on the collected module, so it lasts until the
+        collector rebuilds the module from changed sources.
+
+        Args:
+            module: The collected module.
+
+        Returns:
+            The module's dominant docstring style.
+        """
+        if not module.docstring_style:
+            style, misdetected = infer_docstring_style(
+                entry.doc for entry in [*module.entries, *module.reexports] if entry.doc
+            )
+            module.docstring_style = style.value
+            module.misdetected_docstrings = misdetected
+            if misdetected:
+                _logger.info(
+                    f"mkdocstrings-nim: {module.module}: parsing docstrings as {style.value}; "
+                    f"{misdetected} docstring(s) look like another style"
+                )
+        return DocstringStyle(module.docstring_style)
+
+    def _prepare_module(self, module: NimModule, options: HandlerOptions) -> NimModule:
+        """Filter entries and parse docstrings of a collected module.
+
+        The collected module is cached by the collector and is not modified;
+        a prepared copy is returned.
+
+        Args:
+            module: The collected module.
+            options: Collection options.
+
+        Returns:
+            A copy of the module, ready for rendering.
+        """
         # Parse docstrings with configured style
         style_str = options.get("docstring_style", "rst")
         try:
@@ -223,10 +600,146 @@ class NimHandler(BaseHandler):
                 f"Valid options: {[s.value for s in DocstringStyle]}"
             )
             style = DocstringStyle.RST
-        for entry in module.entries:
-            self._parse_entry_docstring(entry, style)
+        inferred = style is DocstringStyle.AUTO
+        if inferred:
+            style = self._module_docstring_style(module)
+
+        # Filter non-exported entries unless show_private is True
+        show_private = options.get("show_private", False)
+        entries = [e for e in module.entries if show_private or e.exported]
+        show_reexports = options.get("show_reexports", True)
+        reexports = module.reexports
+
+        # A split module keeps the entries of the requested page, or none for
+        # its index, so only their docstrings are parsed
+        split_by = options.get("split_by")
+        pages = []
+        if split_by:
+            pages = module_pages(
+                module.module, [*entries, *(reexports if show_reexports else [])], split_by
+            )
+            page = options.get("page")
+            entries = [e for e in entries if page_name(e, split_by) == page]
+            reexports = [e for e in reexports if page_name(e, split_by) == page]
+
+        if options.get("group_overloads"):
+            entries = self._group_overloads(entries)
+            reexports = self._group_overloads(reexports)
+
+        if options.get("summary_only"):
+            # Summaries show the first paragraph of each docstring, unparsed
+            return replace(
+                module,
+                doc=summary_line(module.doc),
+                entries=[replace(e, doc=summary_line(e.doc)) for e in entries],
+                reexports=[replace(e, doc=summary_line(e.doc)) for e in reexports],
+                pages=pages,
+            )
+
+        misdetected = 0
+
+        def parse_one(entry: NimEntry) -> NimEntry:
+            nonlocal misdetected
+            try:
+                return self._parse_entry_docstring(entry, style, inferred=inferred)
+            except DocstringStyleError as e:
+                # The inferred style does not fit this docstring: keep its text
+                misdetected += 1
+                _logger.debug(f"mkdocstrings-nim: {module.module}.{entry.name}: {e}")
+                return replace(entry, doc=entry.doc.strip())
+
+        def parse(entry: NimEntry) -> NimEntry:
+            parsed = parse_one(entry)
+            if entry.overloads:
+                parsed = replace(parsed, overloads=[parse_one(e) for e in entry.overloads])
+            return parsed
+
+        if show_reexports:
+            reexports = [parse(e) for e in reexports]
+        entries = [parse(e) for e in entries]
+
+        return replace(
+            module,
+            entries=entries,
+            reexports=reexports,
+            pages=pages,
+            misdetected_docstrings=module.misdetected_docstrings + misdetected,
+        )
+
+    @staticmethod
+    def _group_overloads(entries: list[NimEntry]) -> list[NimEntry]:
+        """Merge the overloads of each routine into its first declaration.
+
+        Args:
+            entries: Entries in declaration order (left unchanged).
+
+        Returns:
+            The entries with each later overload of a (kind, name) pair moved
+            into the ``overloads`` of the first, which keeps its position.
+        """
+        grouped: list[NimEntry] = []
+        firsts: dict[tuple[str, str], NimEntry] = {}
+        for entry in entries:
+            if entry.kind not in _OVERLOADABLE_KINDS:
+                grouped.append(entry)
+                continue
+            first = firsts.get((entry.kind, entry.name))
+            if first is None:
+                first = firsts[entry.kind, entry.name] = replace(entry, overloads=[])
+                grouped.append(first)
+            else:
+                first.overloads.append(entry)
+        return grouped
+
+    def collect(self, identifier: str, options: HandlerOptions) -> CollectorItem:
+        """Collect documentation for an identifier.
 
-        return module
+        A wildcard identifier (``*`` or ``mypkg.*``) collects every matching
+        module of the project.
+
+        Args:
+            identifier: Module or item identifier.
+            options: Collection options.
+
+        Returns:
+            Collected documentation data.
+        """
+        _logger.debug(f"Collecting {identifier}")
+        if self.config_options.get("watch") and watcher.serving():
+            self._wait_for_watcher()
+        with tracing.span("collect", identifier=identifier), self._profile(identifier):
+            item: CollectorItem
+            if identifier == "*" or identifier.endswith(".*"):
+                item = self.collector.collect_package(identifier)
+                item.modules = [self._prepare_module(m, options) for m in item.modules]
+            else:
+                item = self._prepare_module(self.collector.collect(identifier), options)
+        if self._profiler is not None:
+            self._profiled_item = (item, identifier)
+        return item
+
+    def _profile(self, identifier: str) -> AbstractContextManager[None]:
+        """Profile a block under an identifier if profiling is on."""
+        if self._profiler is None:
+            return nullcontext()
+        return self._profiler.profile(identifier)
+
+    def teardown(self) -> None:
+        """Release resources, and write the trace and profiles, at the end of the build."""
+        if isinstance(self.collector.store, SQLiteStore):
+            self.collector.store.close()
+        tracing.stop()
+        if not watcher.serving():
+            # Under mkdocs serve, watchers outlive rebuilds and stop on shutdown
+            watcher.stop_all()
+        if self.collector.stats:
+            _logger.info(f"mkdocstrings-nim: {summarize_stats(self.collector.stats)}")
+        if self._profiler is not None:
+            summary = self._profiler.write()
+            if summary:
+                _logger.info(
+                    f"mkdocstrings-nim: profiles written to {self._profiler.directory}\n{summary}"
+                )
 
     def render(
         self,
@@ -244,16 +757,43 @@ class NimHandler(BaseHandler):
         Returns:
             Rendered HTML string.
         """
-        if not isinstance(data, NimModule):
-            raise TypeError(f"Expected NimModule, got {type(data)}")
-
-        template = self.env.get_template("module.html.jinja")
-        return template.render(
-            module=data,
-            config=options,
-            heading_level=options.get("heading_level", 2),
-            root=True,
-        )
+        name = data.name if isinstance(data, NimPackage) else getattr(data, "module", "")
+        # Profile rendering under the identifier the item was collected for
+        profile_key = name
+        if self._profiled_item is not None and self._profiled_item[0] is data:
+            profile_key = self._profiled_item[1]
+        summary_only = options.get("summary_only", False)
+        defer_body = deferred.defer_body if options.get("defer_bodies") else None
+        with tracing.span("render", module=name), self._profile(profile_key):
+            if isinstance(data, NimPackage):
+                template = self.env.get_template(
+                    "summary.html.jinja" if summary_only else "package.html.jinja"
+                )
+                html = template.render(
+                    package=data,
+                    config=options,
+                    heading_level=options.get("heading_level", 2),
+                    root=True,
+                    defer_body=defer_body,
+                )
+            elif isinstance(data, NimModule):
+                template = self.env.get_template(
+                    "summary.html.jinja" if summary_only else "module.html.jinja"
+                )
+                html = template.render(
+                    module=data,
+                    config=options,
+                    heading_level=options.get("heading_level", 2),
+                    root=True,
+                    defer_body=defer_body,
+                )
+            else:
+                raise TypeError(f"Expected NimModule, got {type(data)}")
+
+            if defer_body is not None and f"<{deferred.BODY_TAG}>" in html:
+                # Bodies move to a fragment file once the page is complete (see deferred)
+                html = self.env.get_template("deferred.html.jinja").render(html=Markup(html))
+            return html
 
 
 def get_handler(
@@ -274,6 +814,9 @@ def get_handler(
     base_dir = Path(getattr(tool_config, "config_file_path", "./mkdocs.yml")).parent
     paths = handler_config.get("paths", ["src"])
     options = handler_config.get("options", {})
+    deferred.register(tool_config)
+    if options.get("watch"):
+        watcher.register(tool_config)
 
     return NimHandler(
         paths=paths,
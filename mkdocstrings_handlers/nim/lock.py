@@ -0,0 +1,122 @@
+"""Cross-process file locks."""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import socket
+import time
+from pathlib import Path
+from types import TracebackType
+
+
+def pid_alive(pid: int) -> bool:
+    """Check whether a process exists on this machine."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # Exists, but belongs to someone else
+        return True
+    return True
+
+
+class FileLock:
+    """An exclusive lock held by creating a lock file.
+
+    The lock file is created with ``O_CREAT | O_EXCL``, so only one process
+    can hold it, and records the holder's host, pid and start time. A lock
+    whose holder died (same host) or that is older than stale_after is
+    removed by the next process waiting on it.
+
+    Usage:
+        with FileLock(path, timeout=60):
+            ...
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        timeout: float,
+        stale_after: float = 600.0,
+        poll_interval: float = 0.1,
+    ) -> None:
+        """Initialize the lock.
+
+        Args:
+            path: Lock file to create.
+            timeout: Seconds to wait for the lock before raising TimeoutError.
+            stale_after: Seconds after which a held lock is considered abandoned.
+            poll_interval: Seconds between attempts.
+        """
+        self.path = path
+        self.timeout = timeout
+        self.stale_after = stale_after
+        self.poll_interval = poll_interval
+        self._host = socket.gethostname()
+
+    def acquire(self) -> None:
+        """Wait until the lock is acquired.
+
+        Raises:
+            TimeoutError: If the lock is still held by another process after timeout.
+        """
+        deadline = time.monotonic() + self.timeout
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        while True:
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                self._remove_if_stale()
+            else:
+                with os.fdopen(fd, "w") as f:
+                    f.write(f"{self._host}\n{os.getpid()}\n{time.time()}\n")
+                return
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Timed out waiting for lock {self.path}")
+            time.sleep(self.poll_interval)
+
+    def release(self) -> None:
+        """Release the lock."""
+        with contextlib.suppress(FileNotFoundError):
+            self.path.unlink()
+
+    def _remove_if_stale(self) -> None:
+        """Remove the lock file if its holder is gone or it is too old."""
+        try:
+            content = self.path.read_text()
+        except OSError:
+            return
+        try:
+            host, pid, created = content.split()
+            stale = time.time() - float(created) > self.stale_after or (
+                host == self._host and not pid_alive(int(pid))
+            )
+        except ValueError:
+            # Holder is still writing it, or it is corrupt: judge by age
+            try:
+                stale = time.time() - self.path.stat().st_mtime > self.stale_after
+            except OSError:
+                return
+        if not stale:
+            return
+        try:
+            # Re-check right before removing, to narrow the race with a new holder
+            if self.path.read_text() == content:
+                self.path.unlink()
+        except OSError:
+            pass
+
+    def __enter__(self) -> FileLock:
+        self.acquire()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.release()
@@ -0,0 +1,121 @@
+"""Splitting a module's documentation across several pages.
+
+With ``split_by``, each entry of a module belongs to one named page: a group
+of kinds (``split_by: kind``) or the initial of its name (``split_by:
+alpha``). A directive with a ``page`` option renders that page's entries;
+one without renders an index linking to every page.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from mkdocstrings_handlers.nim.collector import NimEntry
+
+SPLIT_MODES = ("kind", "alpha")
+
+# Pages of split_by: kind, in index order: name -> (title, entry kinds)
+KIND_PAGES = {
+    "types": ("Types", ("type",)),
+    "procs": ("Procs", ("proc", "func", "iterator")),
+    "templates": ("Templates and macros", ("template", "macro")),
+    "consts": ("Constants and variables", ("const", "let", "var")),
+}
+
+# Page of entries no other page takes (unknown kinds, names not starting with a letter)
+OTHER_PAGE = "other"
+
+
+@dataclass
+class ModulePage:
+    """One page of a split module."""
+
+    name: str  # e.g. "procs" or "a", as given to the page option
+    title: str
+    entries: int
+    html_id: str  # Heading id of the page, e.g. "mymodule--procs"
+
+
+def page_name(entry: NimEntry, split_by: str) -> str:
+    """Return the name of the page an entry belongs to.
+
+    Args:
+        entry: The entry.
+        split_by: ``"kind"`` or ``"alpha"``.
+
+    Returns:
+        The page name.
+    """
+    if split_by == "kind":
+        for name, (_, kinds) in KIND_PAGES.items():
+            if entry.kind in kinds:
+                return name
+        return OTHER_PAGE
+    initial = entry.name[:1].lower()
+    return initial if initial.isascii() and initial.isalpha() else OTHER_PAGE
+
+
+def page_title(name: str, split_by: str) -> str:
+    """Return the title of a page.
+
+    Args:
+        name: Page name.
+        split_by: ``"kind"`` or ``"alpha"``.
+
+    Returns:
+        The page title.
+    """
+    if name == OTHER_PAGE:
+        return "Other"
+    if split_by == "kind":
+        return KIND_PAGES[name][0]
+    return name.upper()
+
+
+def is_page(name: str, split_by: str) -> bool:
+    """Return whether a name is a page of a split mode (which may be empty).
+
+    Args:
+        name: Page name.
+        split_by: ``"kind"`` or ``"alpha"``.
+
+    Returns:
+        True if entries could belong to the page.
+    """
+    if name == OTHER_PAGE:
+        return True
+    if split_by == "kind":
+        return name in KIND_PAGES
+    return len(name) == 1 and name.isascii() and name.isalpha() and name.islower()
+
+
+def module_pages(module_name: str, entries: Iterable[NimEntry], split_by: str) -> list[ModulePage]:
+    """List the pages a module's entries are split across.
+
+    Args:
+        module_name: Module name, for the pages' heading ids.
+        entries: Entries to split.
+        split_by: ``"kind"`` or ``"alpha"``.
+
+    Returns:
+        The non-empty pages, kind groups in `KIND_PAGES` order or initials
+        in alphabetical order, with the other page last.
+    """
+    counts = Counter(page_name(entry, split_by) for entry in entries)
+    if split_by == "kind":
+        names = [name for name in KIND_PAGES if name in counts]
+    else:
+        names = sorted(name for name in counts if name != OTHER_PAGE)
+    if OTHER_PAGE in counts:
+        names.append(OTHER_PAGE)
+    return [
+        ModulePage(
+            name=name,
+            title=page_title(name, split_by),
+            entries=counts[name],
+            html_id=f"{module_name}--{name}",
+        )
+        for name in names
+    ]
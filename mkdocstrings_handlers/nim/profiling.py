@@ -0,0 +1,81 @@
+"""Per-identifier profiling of collect and render with cProfile."""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import pstats
+import re
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+# Environment variable naming a profile directory, for builds whose mkdocs.yml
+# cannot be changed (relative to the mkdocs.yml directory)
+PROFILE_ENV_VAR = "MKDOCSTRINGS_NIM_PROFILE"
+
+# Characters replaced in identifiers to name their profile files ("*" -> "_")
+_UNSAFE_CHARS = re.compile(r"[^\w.-]")
+
+
+class Profiler:
+    """Profiles the work done for each identifier, across collect and render."""
+
+    def __init__(self, directory: Path, *, top: int = 20) -> None:
+        """Initialize the profiler.
+
+        Args:
+            directory: Directory the ``.prof`` files and summary are written to.
+            top: Number of modules and functions listed in the summary.
+        """
+        self.directory = directory
+        self.top = top
+        self._profiles: dict[str, cProfile.Profile] = {}
+        # identifier -> wall time spent in collect and render
+        self._times: dict[str, float] = {}
+
+    @contextmanager
+    def profile(self, identifier: str) -> Iterator[None]:
+        """Profile a block, adding to the identifier's profile.
+
+        Args:
+            identifier: Identifier the work is done for.
+
+        Yields:
+            Nothing.
+        """
+        profile = self._profiles.setdefault(identifier, cProfile.Profile())
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            self._times[identifier] = self._times.get(identifier, 0.0) + time.perf_counter() - start
+
+    def write(self) -> str:
+        """Write one ``.prof`` file per identifier and a summary of the slowest.
+
+        Returns:
+            The summary (also written to ``summary.txt``), or an empty string
+            if nothing was profiled.
+        """
+        if not self._profiles:
+            return ""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for identifier, profile in self._profiles.items():
+            profile.dump_stats(self.directory / f"{_UNSAFE_CHARS.sub('_', identifier)}.prof")
+
+        slowest = sorted(self._times.items(), key=lambda item: item[1], reverse=True)[: self.top]
+        lines = [f"Slowest of {len(self._times)} identifiers (collect + render):"]
+        lines.extend(f"  {seconds:8.3f} s  {identifier}" for identifier, seconds in slowest)
+
+        stream = io.StringIO()
+        stats = pstats.Stats(*self._profiles.values(), stream=stream)
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(self.top)
+        lines.append(f"Slowest functions (own time, all identifiers):\n{stream.getvalue().strip()}")
+
+        summary = "\n".join(lines)
+        (self.directory / "summary.txt").write_text(summary + "\n", encoding="utf-8")
+        return summary
@@ -0,0 +1,231 @@
+"""Semantic extraction backend using ``nim jsondoc``.
+
+The AST extractor only sees what is written in the source. Running the
+compiler's documentation generator sem-checks the module, which resolves
+``auto`` return types, infers ``raises`` effects and expands templates and
+macros that generate routines. Its output is overlaid on the AST extractor's
+so docstrings, fields and source positions keep coming from the AST.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import re
+import subprocess
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from markupsafe import Markup
+from mkdocstrings import CollectionError
+
+if TYPE_CHECKING:
+    from mkdocstrings_handlers.nim.collector import NimEntry
+
+# jsondoc routine kinds to nimdocinfo entry kinds (methods and converters render as procs)
+_ROUTINE_KINDS = {
+    "skProc": "proc",
+    "skFunc": "func",
+    "skMethod": "proc",
+    "skConverter": "proc",
+    "skIterator": "iterator",
+    "skTemplate": "template",
+    "skMacro": "macro",
+}
+
+# Return types the AST extractor cannot resolve
+_UNRESOLVED_RETURNS = {"", "auto"}
+
+_RAISES_PATTERN = re.compile(r"^raises:\s*\[(.*)\]$")
+
+# Routine name followed by the export marker, e.g. "proc `+`*(a, b: V): V"
+_EXPORTED_PATTERN = re.compile(r"^\s*\w+\s+(`[^`]+`|[^\s(\[{*]+)\s*\*")
+
+
+def compiler_version(timeout: int) -> str:
+    """Return the first line of ``nim --version``.
+
+    Args:
+        timeout: Seconds before the compiler is abandoned.
+
+    Returns:
+        The compiler's version line.
+
+    Raises:
+        CollectionError: If the compiler is missing or does not answer.
+    """
+    try:
+        completed = subprocess.run(
+            ["nim", "--version"], capture_output=True, text=True, timeout=timeout
+        )
+    except FileNotFoundError as e:
+        raise CollectionError(
+            "Nim compiler not found. Install from https://nim-lang.org/install.html"
+        ) from e
+    except subprocess.TimeoutExpired as e:
+        raise CollectionError("nim --version timed out") from e
+    if completed.returncode != 0:
+        raise CollectionError(f"nim --version failed:\n{completed.stderr}")
+    return completed.stdout.strip().split("\n", 1)[0]
+
+
+def run_jsondoc(
+    filepath: Path,
+    *,
+    nimcache: Path,
+    search_paths: list[Path],
+    timeout: int,
+    inputs_key: str,
+) -> dict[str, Any]:
+    """Run ``nim jsondoc`` on a module.
+
+    The compiler writes its intermediate files to the persistent nimcache, and
+    the JSON output is kept there too, along with the key of the inputs it was
+    produced from: it is reused until that key changes.
+
+    Args:
+        filepath: Path to the Nim source file.
+        nimcache: Persistent nimcache directory of the project.
+        search_paths: Directories added to the compiler's module search path.
+        timeout: Seconds before the compiler is abandoned.
+        inputs_key: Fingerprint of everything the output depends on: the
+            compiler version, the search paths, and the content of the
+            module and of the project modules it imports or includes.
+
+    Returns:
+        Parsed jsondoc output.
+
+    Raises:
+        CollectionError: If the compiler fails.
+    """
+    key = hashlib.sha1(str(filepath.resolve()).encode()).hexdigest()[:16]
+    output = nimcache / "jsondoc" / f"{filepath.stem}-{key}.json"
+    output_key = output.with_suffix(".key")
+    result: dict[str, Any]
+    with contextlib.suppress(OSError, json.JSONDecodeError):
+        if output_key.read_text(encoding="utf-8") == inputs_key:
+            result = json.loads(output.read_text(encoding="utf-8"))
+            return result
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output_key.unlink(missing_ok=True)
+    command = [
+        "nim",
+        "jsondoc",
+        "--hints:off",
+        "--warnings:off",
+        "--docInternal",
+        f"--nimcache:{nimcache}",
+        f"--out:{output}",
+        *[f"--path:{path}" for path in search_paths],
+        str(filepath),
+    ]
+    try:
+        completed = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+    except FileNotFoundError as e:
+        raise CollectionError(
+            "Nim compiler not found. Install from https://nim-lang.org/install.html"
+        ) from e
+    except subprocess.TimeoutExpired as e:
+        raise CollectionError(f"nim jsondoc timed out processing {filepath}") from e
+
+    if completed.returncode != 0 or not output.exists():
+        raise CollectionError(
+            f"nim jsondoc failed:\n{completed.stderr}\n\n"
+            f"To debug, run manually:\n"
+            f"  {' '.join(command)}"
+        )
+
+    try:
+        result = json.loads(output.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as e:
+        output.unlink()
+        raise CollectionError(f"Invalid JSON from nim jsondoc: {e}") from e
+    output_key.write_text(inputs_key, encoding="utf-8")
+    return result
+
+
+def _inferred_raises(pragmas: list[str]) -> list[str] | None:
+    """Return the exceptions listed in a rendered ``raises`` pragma, if any."""
+    for pragma in pragmas:
+        match = _RAISES_PATTERN.match(pragma.strip())
+        if match:
+            return [name.strip() for name in match.group(1).split(",") if name.strip()]
+    return None
+
+
+def _generated_entry(item: dict[str, Any], kind: str) -> dict[str, Any]:
+    """Build a nimdocinfo entry for a routine only the compiler sees.
+
+    jsondoc's ``description`` is already HTML; the raw doc comment is used
+    instead where the compiler provides it, and the description's text
+    otherwise, so the docstring pipeline never converts HTML again.
+    """
+    signature = item.get("signature", {})
+    code = item.get("code", "")
+    doc = item.get("rawDescription")
+    if doc is None:
+        doc = Markup(item.get("description", "")).striptags()
+    return {
+        "name": item["name"],
+        "kind": kind,
+        "line": item.get("line", 0),
+        "signature": code,
+        "doc": doc,
+        "params": [
+            {"name": arg["name"], "type": arg.get("type", "")}
+            for arg in signature.get("arguments", [])
+        ],
+        "returns": signature.get("return", ""),
+        "raises": _inferred_raises(signature.get("pragmas", [])) or [],
+        # --docInternal lists private routines too
+        "exported": _EXPORTED_PATTERN.match(code) is not None,
+    }
+
+
+def overlay(entries: list[NimEntry], jsondoc: dict[str, Any]) -> list[dict[str, Any]]:
+    """Overlay semantic information from jsondoc onto a module's entries.
+
+    Routines get their resolved return type when the source says ``auto``
+    (or nothing), and their inferred ``raises`` list when none is declared.
+    jsondoc lists the routines of included files along with the module's
+    own, so entries must already include them (see the collector's
+    _included_entries): a routine matching any entry is never generated.
+
+    Args:
+        entries: The module's entries, with its included files'; updated in place.
+        jsondoc: ``nim jsondoc`` output for the same module.
+
+    Returns:
+        nimdocinfo entries for the routines generated by templates or macros,
+        which only the compiler sees.
+    """
+    by_name: dict[str, list[NimEntry]] = {}
+    for entry in entries:
+        by_name.setdefault(entry.name, []).append(entry)
+
+    generated = []
+    for item in jsondoc.get("entries", []):
+        kind = _ROUTINE_KINDS.get(item.get("type", ""))
+        if kind is None:
+            continue
+
+        candidates = by_name.get(item["name"], [])
+        match = next((e for e in candidates if e.line == item.get("line")), None)
+        if match is None and len(candidates) == 1:
+            match = candidates[0]
+        if match is None:
+            if not candidates:
+                generated.append(_generated_entry(item, kind))
+            continue
+
+        signature = item.get("signature", {})
+        returns = signature.get("return", "")
+        if returns and match.returns in _UNRESOLVED_RETURNS:
+            match.returns = returns
+        if not match.raises:
+            raises = _inferred_raises(signature.get("pragmas", []))
+            if raises:
+                match.raises = raises
+    return generated
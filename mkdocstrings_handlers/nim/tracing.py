@@ -0,0 +1,131 @@
+"""Trace-event export of build timings.
+
+Spans are recorded in the Chrome trace-event format and can be opened in
+Perfetto (https://ui.perfetto.dev) or ``chrome://tracing``. Tracing is off
+until `start` is called; `span` is then a no-op context manager.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from pathlib import Path
+from typing import Any
+
+# Environment variable naming a trace file, for builds whose mkdocs.yml
+# cannot be changed (relative to the mkdocs.yml directory)
+TRACE_ENV_VAR = "MKDOCSTRINGS_NIM_TRACE"
+
+
+class Tracer:
+    """Collects timed spans from any thread and writes them as trace events."""
+
+    def __init__(self, path: Path) -> None:
+        """Initialize the tracer.
+
+        Args:
+            path: File the trace is written to.
+        """
+        self.path = path
+        self._pid = os.getpid()
+        self._events: list[dict[str, Any]] = []
+        # Native thread id -> thread name, for the viewer's track labels
+        self._threads: dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, **args: Any) -> Iterator[None]:
+        """Record the time spent in a block as one complete event.
+
+        Args:
+            name: Span name.
+            **args: Details shown with the span (identifier, file, ...).
+
+        Yields:
+            Nothing.
+        """
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            tid = threading.get_native_id()
+            event = {
+                "name": name,
+                "cat": "mkdocstrings-nim",
+                "ph": "X",
+                "ts": start / 1000,
+                "dur": (end - start) / 1000,
+                "pid": self._pid,
+                "tid": tid,
+                "args": args,
+            }
+            with self._lock:
+                self._events.append(event)
+                self._threads.setdefault(tid, threading.current_thread().name)
+
+    def write(self) -> None:
+        """Write the recorded spans to the trace file."""
+        with self._lock:
+            events = [
+                {"name": "process_name", "ph": "M", "pid": self._pid, "args": {"name": "mkdocs"}},
+                *(
+                    {
+                        "name": "thread_name",
+                        "ph": "M",
+                        "pid": self._pid,
+                        "tid": tid,
+                        "args": {"name": name},
+                    }
+                    for tid, name in self._threads.items()
+                ),
+                *self._events,
+            ]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str)
+
+
+_tracer: Tracer | None = None
+
+
+def start(path: Path) -> Tracer:
+    """Start recording spans, replacing any tracer already running.
+
+    Args:
+        path: File the trace is written to by `stop`.
+
+    Returns:
+        The tracer.
+    """
+    global _tracer
+    _tracer = Tracer(path)
+    return _tracer
+
+
+def stop() -> None:
+    """Stop recording and write the trace, if tracing was started."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is not None:
+        tracer.write()
+
+
+def span(name: str, **args: Any) -> AbstractContextManager[None]:
+    """Time a block if tracing is on.
+
+    Args:
+        name: Span name.
+        **args: Details shown with the span.
+
+    Returns:
+        A context manager recording the span, or doing nothing.
+    """
+    tracer = _tracer
+    if tracer is None:
+        return nullcontext()
+    return tracer.span(name, **args)
@@ -0,0 +1,286 @@
+"""Background re-extraction of changed Nim files (the ``watch`` option).
+
+Under ``mkdocs serve`` every rebuild creates a new handler, whose collector
+finds changed files by their modification times and extracts them during the
+rebuild. A watcher lives as long as the ``mkdocs serve`` process instead: it
+re-extracts a ``.nim`` file into the persistent store as soon as the file is
+saved, so the rebuild that follows finds the extraction stored and only has
+to render.
+
+Watchers are only started once ``mkdocs serve`` is serving, which a hook
+added to the MkDocs plugins learns from the ``on_serve`` event; the same hook
+stops them on ``on_shutdown``. Changes are observed with watchdog (inotify on
+Linux) when it is installed, and by polling modification times otherwise.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections.abc import Callable, Hashable
+from pathlib import Path
+from typing import Any
+
+from mkdocstrings import get_logger
+
+from mkdocstrings_handlers.nim.cache import SQLiteStore
+from mkdocstrings_handlers.nim.collector import NimCollector
+
+_logger = get_logger(__name__)
+
+# Seconds between scans when polling
+_POLL_INTERVAL = 1.0
+
+# Seconds to wait for further changes before extracting, so an editor saving
+# a file several times (or several files at once) causes one pass
+_DEBOUNCE = 0.1
+
+# watchdog events that may leave a file with new contents
+_CHANGE_EVENTS = frozenset({"created", "modified", "moved", "closed"})
+
+
+class Watcher:
+    """Re-extracts changed Nim files under a collector's search paths in the background."""
+
+    def __init__(self, collector: NimCollector, *, poll_interval: float = _POLL_INTERVAL) -> None:
+        """Initialize the watcher; nothing is watched until `start`.
+
+        Args:
+            collector: Collector extracting changed files into its store. It
+                should be used by the watcher alone, since it is not thread-safe.
+            poll_interval: Seconds between scans if watchdog is unavailable.
+        """
+        self.collector = collector
+        self.poll_interval = poll_interval
+        self.backend = ""  # "watchdog" or "polling", once started
+        self._changed: set[Path] = set()
+        self._extracting = False
+        self._condition = threading.Condition()
+        self._stopped = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._observer: Any = None
+
+    def start(self) -> None:
+        """Start watching the collector's search paths."""
+        roots = self.collector._project_roots()
+        try:
+            self._start_watchdog(roots)
+            self.backend = "watchdog"
+        except (ImportError, OSError) as e:
+            # Not installed, or out of inotify watches
+            _logger.debug(f"mkdocstrings-nim: watching by polling: {e}")
+            self._start_thread(self._poll, roots)
+            self.backend = "polling"
+        self._start_thread(self._extract_changes)
+
+    def stop(self) -> None:
+        """Stop watching, wait for the background threads to finish and close the store."""
+        self._stopped.set()
+        with self._condition:
+            self._condition.notify_all()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+        for thread in self._threads:
+            thread.join()
+        if isinstance(self.collector.store, SQLiteStore):
+            self.collector.store.close()
+
+    def notify(self, path: Path) -> None:
+        """Queue a file for extraction if it is a Nim module.
+
+        Args:
+            path: Path of a created or modified file.
+        """
+        if path.suffix != ".nim":
+            return
+        with self._condition:
+            self._changed.add(path)
+            self._condition.notify_all()
+
+    def wait_idle(self, timeout: float) -> bool:
+        """Wait until every queued change has been extracted.
+
+        Args:
+            timeout: Maximum number of seconds to wait.
+
+        Returns:
+            False if changes were still being extracted after timeout seconds.
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._changed and not self._extracting, timeout
+            )
+
+    def _start_thread(self, target: Callable[..., None], *args: Any) -> None:
+        thread = threading.Thread(
+            target=target, args=args, name=f"mkdocstrings-nim {target.__name__}", daemon=True
+        )
+        thread.start()
+        self._threads.append(thread)
+
+    def _start_watchdog(self, roots: list[Path]) -> None:
+        """Observe roots with watchdog.
+
+        Raises:
+            ImportError: If watchdog is not installed.
+            OSError: If the platform watcher cannot be set up.
+        """
+        from watchdog.events import FileSystemEvent, FileSystemEventHandler
+        from watchdog.observers import Observer
+
+        notify = self.notify
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event: FileSystemEvent) -> None:
+                if event.is_directory or event.event_type not in _CHANGE_EVENTS:
+                    return
+                notify(Path(os.fsdecode(getattr(event, "dest_path", "") or event.src_path)))
+
+        observer = Observer()
+        for root in roots:
+            observer.schedule(_Handler(), str(root), recursive=True)
+        observer.daemon = True
+        observer.start()
+        self._observer = observer
+
+    def _poll(self, roots: list[Path]) -> None:
+        """Queue files whose modification time changed, until stopped."""
+        stamps = self._scan(roots)
+        while not self._stopped.wait(self.poll_interval):
+            current = self._scan(roots)
+            for path, stamp in current.items():
+                if stamps.get(path) != stamp:
+                    self.notify(path)
+            stamps = current
+
+    @staticmethod
+    def _scan(roots: list[Path]) -> dict[Path, int]:
+        """Return the modification time of every Nim file under roots."""
+        stamps = {}
+        for root in roots:
+            for path in root.rglob("*.nim"):
+                try:
+                    stamps[path] = path.stat().st_mtime_ns
+                except OSError:
+                    continue
+        return stamps
+
+    def _extract_changes(self) -> None:
+        """Extract queued files, until stopped."""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._changed or self._stopped.is_set())
+                if self._stopped.is_set():
+                    return
+                self._extracting = True
+            time.sleep(_DEBOUNCE)
+            with self._condition:
+                paths, self._changed = self._changed, set()
+            try:
+                self._extract(sorted(paths))
+            finally:
+                with self._condition:
+                    self._extracting = False
+                    self._condition.notify_all()
+
+    def _extract(self, paths: list[Path]) -> None:
+        start = time.perf_counter()
+        extracted = 0
+        for path in paths:
+            if not path.is_file():
+                continue
+            try:
+                self.collector._extract_file(path)
+            except Exception as e:
+                # Files are often broken mid-edit; the rebuild reports the error,
+                # and the watcher must keep running whatever happens
+                _logger.debug(f"mkdocstrings-nim: could not extract {path}: {e}")
+                continue
+            extracted += 1
+        if extracted:
+            _logger.info(
+                f"mkdocstrings-nim: re-extracted {extracted} changed file(s) "
+                f"in {time.perf_counter() - start:.2f} s"
+            )
+
+
+# Name under which the serve hook is added to the MkDocs plugins
+PLUGIN_NAME = "mkdocstrings-nim-watch"
+
+# Running watchers, shared by the handlers of successive rebuilds
+_watchers: dict[Hashable, Watcher] = {}
+_watchers_lock = threading.Lock()
+
+# Whether mkdocs serve is serving, as reported by the serve hook
+_serving = False
+
+
+def serving() -> bool:
+    """Return whether ``mkdocs serve`` is serving the site, so watchers may run."""
+    return _serving
+
+
+def watch(key: Hashable, make_collector: Callable[[], NimCollector]) -> Watcher:
+    """Return the running watcher for a configuration, starting it on first use.
+
+    Args:
+        key: Identifies the configuration (search paths, extraction options).
+        make_collector: Creates the watcher's own collector.
+
+    Returns:
+        The watcher.
+    """
+    with _watchers_lock:
+        watcher = _watchers.get(key)
+        if watcher is None:
+            watcher = _watchers[key] = Watcher(make_collector())
+            watcher.start()
+            _logger.info(f"mkdocstrings-nim: watching Nim sources for changes ({watcher.backend})")
+        return watcher
+
+
+def stop_all() -> None:
+    """Stop every running watcher."""
+    with _watchers_lock:
+        watchers = list(_watchers.values())
+        _watchers.clear()
+    for watcher in watchers:
+        watcher.stop()
+
+
+class ServeHook:
+    """MkDocs hook enabling watchers while ``mkdocs serve`` runs, and stopping them after."""
+
+    def on_serve(self, server: Any, *, config: Any, builder: Any) -> Any:  # noqa: ARG002
+        """Let rebuilds start watchers from now on.
+
+        Args:
+            server: The live-reload server.
+            config: The MkDocs configuration.
+            builder: Rebuilds the site.
+
+        Returns:
+            The server.
+        """
+        global _serving
+        _serving = True
+        return server
+
+    def on_shutdown(self) -> None:
+        """Stop every running watcher when ``mkdocs serve`` ends."""
+        global _serving
+        _serving = False
+        stop_all()
+
+
+def register(tool_config: Any) -> None:
+    """Add the serve hook to the MkDocs plugins, once per build.
+
+    Args:
+        tool_config: The MkDocs configuration.
+    """
+    plugins = getattr(tool_config, "plugins", None)
+    if plugins is not None and PLUGIN_NAME not in plugins:
+        plugins[PLUGIN_NAME] = ServeHook()
@@ -115,3 +115,175 @@ class TestFullFlow:
         assert "Config" in html
         # Verify docstring content is present
         assert "sample library" in html.lower()
+
+
+class TestJsonSerialization:
+    """Tests for the extractor's streaming JSON output."""
+
+    def test_special_characters_round_trip(self, tmp_path):
+        """Test that quotes, backslashes, newlines and non-ASCII text survive serialization."""
+        from mkdocstrings_handlers.nim.collector import NimCollector
+
+        src = tmp_path / "src"
+        src.mkdir()
+        (src / "escapes.nim").write_text(
+            '## Module with "quotes" and \\\\ backslashes.\n'
+            "\n"
+            'const Greeting* = "h\\"i"  ## Says "hi" – politely\n'
+            "\n"
+            "proc tab*(s: string): string =\n"
+            "  ## Line one.\n"
+            "  ##\n"
+            "  ## Line {two} with <braces>.\n"
+            "  result = s\n",
+            encoding="utf-8",
+        )
+
+        module = NimCollector(["src"], tmp_path).collect("escapes")
+
+        assert module.doc == 'Module with "quotes" and \\\\ backslashes.'
+        greeting = next(e for e in module.entries if e.name == "Greeting")
+        assert greeting.doc == 'Says "hi" – politely'
+        assert greeting.signature == 'const Greeting = "h\\"i"'
+        tab = next(e for e in module.entries if e.name == "tab")
+        assert tab.doc == "Line one.\n\nLine {two} with <braces>."
+        assert [e.name for e in module.entries] == ["Greeting", "tab"]
+
+
+class TestDeclarationsOnly:
+    """Tests for declarations-only extraction mode."""
+
+    SOURCE = '''## Module doc.
+
+proc forward*(x: int): int
+  ## Forward declaration.
+
+proc multiline*(a: int,
+                b: string): int {.inline.} =
+  ## Multi-line header.
+  ##
+  ## :param a: First
+  let s = """
+not a header =
+proc fake*() =
+"""
+  proc nested(y: int): int =
+    result = y
+  result = nested(a) + s.len
+
+proc noDoc*(): int =
+  result = 1
+
+when defined(linux):
+  proc platform*(): string =
+    ## Platform name.
+    "linux"
+
+proc forward*(x: int): int =
+  x
+
+type Kind* = enum
+  kA, kB  ## Values
+
+const Answer* = 42  ## The answer
+'''
+
+    def test_matches_full_parse(self, tmp_path):
+        """Test that skipping bodies yields the same entries as a full parse."""
+        from mkdocstrings_handlers.nim.collector import NimCollector
+
+        src = tmp_path / "src"
+        src.mkdir()
+        (src / "decls.nim").write_text(self.SOURCE)
+
+        full = NimCollector(["src"], tmp_path).collect("decls")
+        fast = NimCollector(["src"], tmp_path, declarations_only=True).collect("decls")
+
+        assert fast == full
+        names = [e.name for e in fast.entries]
+        assert names == [
+            "forward",
+            "multiline",
+            "noDoc",
+            "platform",
+            "forward",
+            "Kind",
+            "Answer",
+        ]
+        multiline = fast.entries[1]
+        assert multiline.doc.startswith("Multi-line header.")
+        assert multiline.line == 6
+        assert fast.entries[3].doc == "Platform name."
+
+
+class TestProjectMode:
+    """Tests for extracting a whole project in one nimdocinfo pass."""
+
+    def test_project_pass_matches_per_file(self, tmp_path):
+        """Test that project extraction matches per-file extraction and honours globs."""
+        from mkdocstrings_handlers.nim.collector import NimCollector
+
+        src = tmp_path / "src"
+        (src / "pkg" / "private").mkdir(parents=True)
+        (src / "pkg" / "a.nim").write_text("## Module a.\n\nproc a*() = discard  ## A\n")
+        (src / "pkg" / "b.nim").write_text("## Module b.\n\nconst B* = 1  ## B\n")
+        (src / "pkg" / "private" / "c.nim").write_text("proc c*() = discard\n")
+        (src / "notes.txt").write_text("not nim")
+
+        project = NimCollector(["src"], tmp_path, exclude=["**/private/**"]).collect_project()
+
+        assert list(project) == ["pkg.a", "pkg.b"]
+        per_file = NimCollector(["src"], tmp_path)
+        for identifier, module in project.items():
+            assert module == per_file.collect(identifier)
+
+
+class TestIncludes:
+    """Tests for following include statements."""
+
+    def test_included_symbols_documented(self, tmp_path):
+        """Test that symbols from included files appear, tagged with their own file."""
+        from mkdocstrings_handlers.nim.collector import NimCollector
+
+        src = tmp_path / "src"
+        (src / "private").mkdir(parents=True)
+        (src / "private" / "impl.nim").write_text("\n\nproc helper*() = discard  ## Helper\n")
+        (src / "facade.nim").write_text(
+            "## Facade.\n\nproc first*() = discard\n\ninclude private/impl\n\nconst Last* = 1\n"
+        )
+
+        module = NimCollector(["src"], tmp_path).collect("facade")
+
+        assert [e.name for e in module.entries] == ["first", "helper", "Last"]
+        helper = module.entries[1]
+        assert helper.file == "src/private/impl.nim"
+        assert helper.line == 3
+        assert helper.doc == "Helper"
+
+
+class TestReexports:
+    """Tests for documenting re-exported symbols."""
+
+    def test_facade_documents_submodule_exports(self, tmp_path):
+        """Test that a facade module documents what it re-exports from submodules."""
+        from mkdocstrings_handlers.nim.collector import NimCollector
+
+        src = tmp_path / "src"
+        (src / "lib").mkdir(parents=True)
+        (src / "lib" / "core.nim").write_text(
+            "proc open*() = discard  ## Open\nproc close*() = discard\nproc hidden() = discard\n"
+        )
+        (src / "lib" / "utils.nim").write_text(
+            "proc helper*() = discard\nproc other*() = discard\n"
+        )
+        (src / "lib.nim").write_text(
+            "## Facade.\n\nimport std/os\nimport lib/[core, utils]\n"
+            "export core except close\nexport utils.helper\n"
+        )
+
+        module = NimCollector(["src"], tmp_path).collect("lib")
+
+        assert module.entries == []
+        assert [e.name for e in module.reexports] == ["open", "helper"]
+        assert module.reexports[0].file == "src/lib/core.nim"
+        assert module.reexports[0].doc == "Open"
@@ -0,0 +1,228 @@
+"""Stress tests for pathological module shapes.
+
+Generated bindings produce modules far outside what hand-written code does:
+tens of thousands of constants, deeply nested case objects and procs with
+hundreds of parameters. These tests check that extracting and rendering such
+modules stays within explicit time and memory budgets, so a regression to
+quadratic behavior fails loudly instead of slowing builds down.
+
+The budgets are generous (an order of magnitude above measured times) so the
+tests are not flaky on slow CI runners.
+"""
+
+import json
+import shutil
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from mkdocstrings_handlers.nim.collector import (
+    NimCollector,
+    NimEntry,
+    NimField,
+    NimModule,
+    NimParam,
+)
+from mkdocstrings_handlers.nim.handler import NimHandler
+
+CONSTS = 30_000
+CASE_DEPTH = 50
+PARAMS = 500
+
+requires_nim = pytest.mark.skipif(shutil.which("nim") is None, reason="requires the Nim compiler")
+
+
+def consts_source(count: int = CONSTS) -> str:
+    """Return a module declaring count documented constants."""
+    lines = ["## Generated constants.", "", "const"]
+    for i in range(count):
+        lines.append(f"  VALUE_{i}* = {i}  ## Constant number {i}.")
+    return "\n".join(lines) + "\n"
+
+
+def nested_case_source(depth: int = CASE_DEPTH) -> str:
+    """Return a module with an object whose case branches nest depth deep."""
+    lines = ["type", "  Kind* = enum", "    kA, kB", "", "  Deep* = object"]
+    indent = "    "
+    for level in range(depth):
+        lines.append(f"{indent}case kind{level}*: Kind")
+        lines.append(f"{indent}of kA:")
+        lines.append(f"{indent}  a{level}*: int  ## Field a at depth {level}.")
+        lines.append(f"{indent}of kB:")
+        indent += "  "
+    lines.append(f"{indent}leaf*: int  ## Innermost field.")
+    return "\n".join(lines) + "\n"
+
+
+def many_params_source(count: int = PARAMS) -> str:
+    """Return a module with a proc taking count parameters."""
+    params = ", ".join(f"p{i}: int" for i in range(count))
+    return f"proc wide*({params}): int =\n  ## Takes {count} parameters.\n  discard\n"
+
+
+def _handler(tmp_path: Path) -> NimHandler:
+    """Create a handler rendering without a Markdown pipeline."""
+    handler = NimHandler(paths=["src"], base_dir=tmp_path, mdx=[], mdx_config={})
+    handler.env.filters["convert_markdown"] = lambda text, *_args, **_kwargs: text
+    handler.env.filters["heading"] = lambda text, level, **kwargs: (
+        f'<h{level} id="{kwargs.get("id", "")}">{text}</h{level}>'
+    )
+    return handler
+
+
+def _render_seconds(handler: NimHandler, module: NimModule) -> float:
+    """Render a module and return the wall time."""
+    options = handler.get_options({})
+    start = time.perf_counter()
+    html = handler.render(module, options)
+    seconds = time.perf_counter() - start
+    assert html
+    return seconds
+
+
+def _render_peak_mb(handler: NimHandler, module: NimModule) -> float:
+    """Render a module and return the peak of memory allocated meanwhile."""
+    options = handler.get_options({})
+    tracemalloc.start()
+    try:
+        handler.render(module, options)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+class TestRenderStress:
+    """Rendering pathological modules stays within budget."""
+
+    def test_many_consts(self, tmp_path):
+        """Test rendering a module with 30k constants."""
+        module = NimModule(
+            module="consts",
+            file="consts.nim",
+            entries=[
+                NimEntry(
+                    name=f"VALUE_{i}",
+                    kind="const",
+                    line=i + 4,
+                    signature=f"VALUE_{i}* = {i}",
+                    doc=f"Constant number {i}.",
+                )
+                for i in range(CONSTS)
+            ],
+        )
+
+        assert _render_seconds(_handler(tmp_path), module) < 30
+
+    def test_many_params(self, tmp_path):
+        """Test rendering a proc with 500 parameters."""
+        params = [NimParam(name=f"p{i}", type="int") for i in range(PARAMS)]
+        entry = NimEntry(
+            name="wide",
+            kind="proc",
+            line=1,
+            signature=f"proc wide*({', '.join(f'p{i}: int' for i in range(PARAMS))}): int",
+            doc=f"Takes {PARAMS} parameters.",
+            params=params,
+            returns="int",
+        )
+        module = NimModule(module="wide", file="wide.nim", entries=[entry])
+        handler = _handler(tmp_path)
+
+        assert _render_seconds(handler, module) < 5
+        assert _render_peak_mb(handler, module) < 64
+
+    def test_deep_case_object(self, tmp_path):
+        """Test rendering an object with deeply nested case branches."""
+        fields = []
+        for level in range(CASE_DEPTH):
+            branch = "" if level == 0 else f"when kind{level - 1}: kB"
+            fields.append(NimField(name=f"kind{level}", type="Kind", branch=branch))
+            fields.append(NimField(name=f"a{level}", type="int", branch=f"when kind{level}: kA"))
+        entry = NimEntry(
+            name="Deep",
+            kind="type",
+            line=1,
+            signature="Deep* = object",
+            fields=fields,
+        )
+        module = NimModule(module="deep", file="deep.nim", entries=[entry])
+        handler = _handler(tmp_path)
+
+        assert _render_seconds(handler, module) < 5
+        assert _render_peak_mb(handler, module) < 64
+
+
+# Runs nimdocinfo on a file and prints its wall time and peak RSS, so the
+# extractor's memory is measured apart from the test process
+_MEASURE = """\
+import json, resource, subprocess, sys, time
+start = time.perf_counter()
+subprocess.run(sys.argv[1:], check=True, stdout=subprocess.DEVNULL)
+seconds = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+print(json.dumps({"seconds": seconds, "rss_mb": peak / 1024 / (1024 if sys.platform == "darwin" else 1)}))
+"""
+
+
+@requires_nim
+@pytest.mark.skipif(sys.platform == "win32", reason="peak RSS is measured with resource")
+class TestExtractionStress:
+    """Extracting pathological modules stays within budget."""
+
+    @pytest.fixture(scope="class")
+    def nimdocinfo(self, tmp_path_factory):
+        """Compile nimdocinfo once for the class."""
+        return NimCollector([], tmp_path_factory.mktemp("build"))._ensure_nimdocinfo_compiled()
+
+    def _measure(self, nimdocinfo: Path, source: Path) -> dict[str, float]:
+        result = subprocess.run(
+            [sys.executable, "-c", _MEASURE, str(nimdocinfo), str(source)],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        measured: dict[str, float] = json.loads(result.stdout)
+        return measured
+
+    @pytest.mark.parametrize(
+        ("name", "source", "seconds", "rss_mb"),
+        [
+            ("consts", consts_source, 30, 1024),
+            ("deep", nested_case_source, 10, 256),
+            ("wide", many_params_source, 10, 256),
+        ],
+    )
+    def test_within_budget(self, nimdocinfo, tmp_path, name, source, seconds, rss_mb):
+        """Test extraction time and extractor peak RSS."""
+        path = tmp_path / f"{name}.nim"
+        path.write_text(source())
+
+        measured = self._measure(nimdocinfo, path)
+
+        assert measured["seconds"] < seconds
+        assert measured["rss_mb"] < rss_mb
+
+    def test_shapes_extracted(self, tmp_path):
+        """Test that every constant, field and parameter comes through."""
+        src = tmp_path / "src"
+        src.mkdir()
+        (src / "consts.nim").write_text(consts_source())
+        (src / "deep.nim").write_text(nested_case_source())
+        (src / "wide.nim").write_text(many_params_source())
+        collector = NimCollector(["src"], tmp_path)
+
+        consts = collector.collect("consts")
+        assert len([e for e in consts.entries if e.kind == "const"]) == CONSTS
+
+        deep = next(e for e in collector.collect("deep").entries if e.name == "Deep")
+        assert len(deep.fields) == 2 * CASE_DEPTH + 1
+        assert deep.fields[-1].name == "leaf"
+        assert deep.fields[-1].branch == "when kB"
+
+        wide = next(e for e in collector.collect("wide").entries if e.name == "wide")
+        assert len(wide.params) == PARAMS
@@ -0,0 +1,120 @@
+"""Integration tests for docstrings parsed by nimdocinfo (``structured_docs``).
+
+nimdocinfo ports docstring_parser's ReST and Google parsers; each sample
+here must come out of nimdocinfo as the handler would parse it.
+"""
+
+import shutil
+
+import pytest
+
+from mkdocstrings_handlers.nim.collector import NimCollector
+from mkdocstrings_handlers.nim.docstring import DocstringStyle, parse_docstring
+
+pytestmark = pytest.mark.skipif(shutil.which("nim") is None, reason="requires the Nim compiler")
+
+SOURCE = """\
+## Samples of structured docstrings.
+
+proc rstMultiline*(a, b: int): int =
+  ## Adds two numbers.
+  ##
+  ## The sum is exact: integers
+  ## do not round.
+  ##
+  ## :param a: First operand, which may
+  ##     span several lines.
+  ## :type a: int
+  ## :param b: Second operand.
+  ## :type b: int
+  ## :returns: The sum of a
+  ##     and b.
+  ## :rtype: int
+  ## :raises OverflowDefect: If the sum overflows.
+  a + b
+
+proc rstRtypeOnly*(s: string): string =
+  ## Echoes s: unchanged.
+  ##
+  ## :param s: Text to echo, e.g. key: value.
+  ## :rtype: string
+  s
+
+proc googleMultiline*(path: string, mode: int): string =
+  ## Reads a file.
+  ##
+  ## Paths are resolved as follows: relative ones
+  ## against the working directory.
+  ##
+  ## Args:
+  ##     path: File to read, which may
+  ##         span several lines.
+  ##     mode (int): Open mode: 0 reads text.
+  ##
+  ## Returns:
+  ##     The contents of the file,
+  ##     decoded as UTF-8.
+  ##
+  ## Raises:
+  ##     IOError: If the file cannot be read.
+  ##     ValueError: If mode is unknown.
+  ##     OSError: If path is a directory.
+  path
+
+proc googleIndented*(x: int): int =
+  ## Doubles x.
+  ##
+  ##   An indented paragraph: kept as it is
+  ##   in the description.
+  ##
+  ## Args:
+  ##   x: Value to double.
+  ##
+  ## Returns:
+  ##   int: Twice x.
+  x * 2
+
+proc proseOnly*(): int =
+  ## Returns the answer: 42.
+  ##
+  ## Nothing else to say: really.
+  42
+"""
+
+SAMPLES = {
+    "rstMultiline": DocstringStyle.RST,
+    "rstRtypeOnly": DocstringStyle.RST,
+    "googleMultiline": DocstringStyle.GOOGLE,
+    "googleIndented": DocstringStyle.GOOGLE,
+    "proseOnly": DocstringStyle.RST,
+}
+
+
+@pytest.fixture(scope="module")
+def entries(tmp_path_factory):
+    """Extract the samples with nimdocinfo parsing their docstrings."""
+    root = tmp_path_factory.mktemp("structured")
+    (root / "src").mkdir()
+    (root / "src" / "samples.nim").write_text(SOURCE)
+    module = NimCollector(["src"], root, structured_docs=True).collect("samples")
+    return {entry.name: entry for entry in module.entries}
+
+
+@pytest.mark.parametrize(("name", "style"), SAMPLES.items())
+def test_matches_parse_docstring(entries, name, style):
+    """Test that nimdocinfo's doc_fields equal parse_docstring on the same text."""
+    entry = entries[name]
+    assert entry.parsed_doc is not None
+    assert entry.parsed_doc_style in ("", style.value)
+
+    expected = parse_docstring(entry.doc, style, fallback=False)
+    parsed = entry.parsed_doc
+    assert parsed.description == expected.description
+    assert [(p.name, p.description) for p in parsed.params] == [
+        (p.name, p.description) for p in expected.params
+    ]
+    if expected.returns is None:
+        assert parsed.returns is None
+    else:
+        assert parsed.returns is not None
+        assert parsed.returns.description == expected.returns.description
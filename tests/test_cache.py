@@ -0,0 +1,305 @@
+"""Tests for the persistent, git-keyed extraction cache."""
+
+import multiprocessing
+import subprocess
+import time
+
+import pytest
+
+from mkdocstrings_handlers.nim import cache
+from mkdocstrings_handlers.nim.cache import DirectoryStore, GitIndex, SQLiteStore, blob_hash
+from mkdocstrings_handlers.nim.collector import NimCollector
+from mkdocstrings_handlers.nim.docstring import DocstringStyle
+
+
+def _git(cwd, *args):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+def _hash_object(path):
+    return subprocess.run(
+        ["git", "hash-object", str(path)], capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Create a git repository with one committed Nim file."""
+    root = tmp_path / "repo"
+    (root / "src").mkdir(parents=True)
+    (root / "src" / "m.nim").write_text("proc a*() = discard\n")
+    _git(root, "init", "-q")
+    _git(root, "add", ".")
+    _git(root, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "init")
+    return root
+
+
+class TestGitIndex:
+    """Tests for git blob hash lookup."""
+
+    def test_blob_hash_matches_git(self, tmp_path):
+        """Test that content hashes match `git hash-object`."""
+        path = tmp_path / "x.nim"
+        path.write_text("const X* = 1\n")
+
+        assert blob_hash(path.read_bytes()) == _hash_object(path)
+
+    def test_unchanged_file_uses_index(self, mocker, repo):
+        """Test that unchanged tracked files are not read."""
+        index = GitIndex(repo)
+        spy = mocker.spy(cache, "blob_hash")
+
+        assert index.file_hash(repo / "src" / "m.nim") == _hash_object(repo / "src" / "m.nim")
+        spy.assert_not_called()
+
+    def test_modified_and_untracked_files_hashed(self, repo):
+        """Test that dirty and untracked files are hashed from their content."""
+        index = GitIndex(repo)
+        modified = repo / "src" / "m.nim"
+        modified.write_text("proc b*() = discard\n")
+        untracked = repo / "src" / "new.nim"
+        untracked.write_text("const N* = 1\n")
+
+        assert index.file_hash(modified) == _hash_object(modified)
+        assert index.file_hash(untracked) == _hash_object(untracked)
+
+    def test_outside_repository(self, tmp_path):
+        """Test that directories outside git fall back to content hashing."""
+        path = tmp_path / "x.nim"
+        path.write_text("const X* = 1\n")
+
+        index = GitIndex(tmp_path)
+
+        assert len(index) == 0
+        assert index.file_hash(path) == _hash_object(path)
+
+
+class TestDirectoryStore:
+    """Tests for the on-disk module store."""
+
+    def test_round_trip(self, tmp_path):
+        """Test that stored data can be read back."""
+        store = DirectoryStore(tmp_path / "store")
+        store.put("abc123", {"module": "m", "entries": []})
+
+        assert store.get("abc123") == {"module": "m", "entries": []}
+        assert store.get("missing") is None
+
+    def test_corrupt_entry_is_a_miss(self, tmp_path):
+        """Test that unreadable entries are treated as missing."""
+        store = DirectoryStore(tmp_path)
+        store.put("abc123", {})
+        (tmp_path / "module" / "ab" / "abc123.json").write_text("{not json")
+
+        assert store.get("abc123") is None
+
+
+class TestCollectorStore:
+    """Tests for sharing extractions between builds."""
+
+    def _collector(self, mocker, root, store):
+        collector = NimCollector(["src"], root, store=store)
+        path = (root / "src" / "m.nim").resolve()
+        output = {
+            "module": "m",
+            "file": str(path),
+            "entries": [{"name": "a", "kind": "proc", "line": 1, "signature": "proc a*()"}],
+        }
+        run = mocker.patch.object(collector, "_run_nimdocinfo", return_value=output)
+        return collector, run
+
+    def test_fresh_checkout_hits(self, mocker, tmp_path, repo):
+        """Test that a clone with new mtimes reuses the previous build's extraction."""
+        store = DirectoryStore(tmp_path / "store")
+        first, first_run = self._collector(mocker, repo, store)
+        first.collect("m")
+        clone = tmp_path / "clone"
+        _git(tmp_path, "clone", "-q", str(repo), str(clone))
+
+        second, second_run = self._collector(mocker, clone, store)
+        module = second.collect("m")
+
+        first_run.assert_called_once()
+        second_run.assert_not_called()
+        assert module.entries[0].name == "a"
+        assert module.file == "src/m.nim"
+
+    def test_changed_content_misses(self, mocker, tmp_path, repo):
+        """Test that editing a file invalidates its stored extraction."""
+        store = DirectoryStore(tmp_path / "store")
+        first, _ = self._collector(mocker, repo, store)
+        first.collect("m")
+        (repo / "src" / "m.nim").write_text("proc b*() = discard\n")
+
+        second, run = self._collector(mocker, repo, store)
+        second.collect("m")
+
+        run.assert_called_once()
+
+    def test_flags_are_part_of_key(self, tmp_path, repo):
+        """Test that output of different extractor flags is stored separately."""
+        store = DirectoryStore(tmp_path / "store")
+        full = NimCollector(["src"], repo, store=store)
+        fast = NimCollector(["src"], repo, store=store, declarations_only=True)
+        structured = NimCollector(["src"], repo, store=store, structured_docs=True)
+
+        keys = {c._store_key(repo / "src" / "m.nim") for c in (full, fast, structured)}
+        assert len(keys) == 3
+
+
+def _claim_and_extract(db, key, log):
+    """Fetch key from a store in another process, logging each computation."""
+    store = SQLiteStore(db)
+
+    def compute():
+        with open(log, "a") as f:
+            f.write("x")
+        time.sleep(0.3)
+        return {"key": key}
+
+    store.fetch(key, compute)
+    store.close()
+
+
+class TestSQLiteStore:
+    """Tests for the shared SQLite store."""
+
+    def test_round_trip_and_kinds(self, tmp_path):
+        """Test that entries are stored per kind."""
+        store = SQLiteStore(tmp_path / "db.sqlite3")
+        store.put("k", {"a": 1})
+        store.put("k", {"b": 2}, kind="docstring")
+
+        assert store.get("k") == {"a": 1}
+        assert store.get("k", kind="docstring") == {"b": 2}
+        assert store.get("missing") is None
+        assert store._db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_concurrent_processes_extract_once(self, tmp_path):
+        """Test that only one of several processes computes a missing key."""
+        db, log = tmp_path / "db.sqlite3", tmp_path / "log"
+        # Create the schema up front; connections must not be inherited across fork
+        store = SQLiteStore(db)
+        store.size()
+        store.close()
+        processes = [
+            multiprocessing.Process(target=_claim_and_extract, args=(db, "k", log))
+            for _ in range(4)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(30)
+
+        assert log.read_text() == "x"
+        assert SQLiteStore(db).get("k") == {"key": "k"}
+
+    def test_dead_owner_claim_taken_over(self, tmp_path):
+        """Test that a claim left by a process that died does not block others."""
+        store = SQLiteStore(tmp_path / "db.sqlite3", claim_timeout=60)
+        dead = subprocess.Popen(["true"])
+        dead.wait()
+        store._db.execute(
+            "INSERT INTO claims VALUES ('module', 'k', ?, ?, ?)",
+            (store._host, dead.pid, time.time()),
+        )
+
+        assert store.fetch("k", lambda: {"v": 1}) == {"v": 1}
+        assert store._db.execute("SELECT COUNT(*) FROM claims").fetchone()[0] == 0
+
+    def test_failed_compute_releases_claim(self, tmp_path):
+        """Test that a failing extraction lets the next caller retry."""
+        store = SQLiteStore(tmp_path / "db.sqlite3")
+
+        def fail():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            store.fetch("k", fail)
+        assert store.fetch("k", lambda: {"v": 2}) == {"v": 2}
+
+    def test_reads_do_not_write(self, tmp_path):
+        """Test that access times from reads are written with the next put, not by each read."""
+        store = SQLiteStore(tmp_path / "db.sqlite3")
+        store.put("k", {"a": 1})
+        accessed = store._db.execute("SELECT accessed_at FROM entries").fetchone()[0]
+        changes = store._db.total_changes
+
+        time.sleep(0.01)
+        for _ in range(3):
+            store.get("k")
+        assert store._db.total_changes == changes
+
+        store.put("other", {"b": 2})
+        row = store._db.execute("SELECT accessed_at FROM entries WHERE key = 'k'").fetchone()
+        assert row[0] > accessed
+
+    def test_trim_drops_least_recently_used(self, tmp_path):
+        """Test that opening an oversized store trims the oldest entries."""
+        db = tmp_path / "db.sqlite3"
+        store = SQLiteStore(db)
+        for key in ("old", "mid", "new"):
+            store.put(key, {"pad": "x" * 1000})
+            time.sleep(0.01)
+        store.get("old")  # Now the most recently used
+        store.close()
+
+        trimmed = SQLiteStore(db, max_size=2600)
+
+        assert trimmed.get("mid") is None
+        assert trimmed.get("old") is not None
+        assert trimmed.get("new") is not None
+        assert trimmed.size() <= 2600
+
+    def test_unclaimed_miss_writes_once(self, tmp_path):
+        """Test that a miss without a claim stores the result in one write transaction."""
+        store = SQLiteStore(tmp_path / "db.sqlite3")
+        statements = []
+        store._db.set_trace_callback(statements.append)
+
+        assert store.fetch("k", lambda: {"v": 1}, claim=False) == {"v": 1}
+        assert store.fetch("k", lambda: {"v": 2}, claim=False) == {"v": 1}
+
+        assert statements.count("BEGIN IMMEDIATE") == 1
+        assert store._db.execute("SELECT COUNT(*) FROM claims").fetchone()[0] == 0
+
+
+class TestDocstringCache:
+    """Tests for sharing parsed docstrings through the SQLite store."""
+
+    def test_parsed_once(self, mocker, tmp_path):
+        """Test that identical docstrings are parsed once across handlers."""
+        from mkdocstrings_handlers.nim import handler as handler_module
+        from mkdocstrings_handlers.nim.handler import NimHandler
+
+        options = {"cache_dir": str(tmp_path / "cache"), "cache_backend": "sqlite"}
+        spy = mocker.spy(handler_module, "parse_docstring")
+        doc = "Do it.\n\n:param x: The x\n:returns: Done"
+        results = []
+        for _ in range(2):
+            handler = NimHandler(
+                paths=["src"], base_dir=tmp_path, config_options=options, mdx=[], mdx_config={}
+            )
+            assert isinstance(handler.collector.store, SQLiteStore)
+            results.append(handler._parse_docstring(doc, DocstringStyle.RST))
+
+        assert spy.call_count == 1
+        assert results[0] == results[1]
+        assert results[1].params[0].description == "The x"
+
+    def test_miss_writes_once(self, tmp_path):
+        """Test that a docstring miss takes a single write transaction, with no claim."""
+        from mkdocstrings_handlers.nim.handler import NimHandler
+
+        options = {"cache_dir": str(tmp_path / "cache"), "cache_backend": "sqlite"}
+        handler = NimHandler(
+            paths=["src"], base_dir=tmp_path, config_options=options, mdx=[], mdx_config={}
+        )
+        store = handler.collector.store
+        statements = []
+        store._db.set_trace_callback(statements.append)
+
+        handler._parse_docstring("Do it.\n\n:param x: The x", DocstringStyle.RST)
+
+        assert statements.count("BEGIN IMMEDIATE") == 1
+        assert not any("claims VALUES" in statement for statement in statements)
@@ -0,0 +1,173 @@
+"""Tests for the command-line interface."""
+
+import threading
+import time
+
+import pytest
+from mkdocstrings import CollectionError
+
+from mkdocstrings_handlers.nim import cli
+from mkdocstrings_handlers.nim.cache import DirectoryStore
+from mkdocstrings_handlers.nim.collector import NimCollector
+
+MKDOCS_YML = """\
+site_name: test
+markdown_extensions:
+  - pymdownx.emoji:
+      emoji_index: !!python/name:material.extensions.emoji.twemoji
+plugins:
+  - search
+  - mkdocstrings:
+      handlers:
+        nim:
+          paths: [src]
+          options:
+            cache_dir: .cache
+            project_exclude: ["**/private/**"]
+            extra_css: !ENV [EXTRA_CSS, ""]
+"""
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Create a project with three modules, one of them excluded."""
+    (tmp_path / "src" / "pkg" / "private").mkdir(parents=True)
+    (tmp_path / "src" / "a.nim").write_text("proc a*() = discard\n")
+    (tmp_path / "src" / "pkg" / "b.nim").write_text("proc b*() = discard\n")
+    (tmp_path / "src" / "pkg" / "private" / "c.nim").write_text("proc c*() = discard\n")
+    (tmp_path / "mkdocs.yml").write_text(MKDOCS_YML)
+    return tmp_path
+
+
+def _fake_extract(filepath):
+    return {"module": filepath.stem, "file": str(filepath), "entries": []}
+
+
+class TestHandlerConfig:
+    """Tests for reading the handler configuration from mkdocs.yml."""
+
+    def test_reads_nim_handler(self, project):
+        """Test that the nim handler section is found, ignoring custom tags."""
+        config = cli.handler_config(project / "mkdocs.yml")
+
+        assert config["paths"] == ["src"]
+        assert config["options"]["cache_dir"] == ".cache"
+
+    def test_not_configured(self, tmp_path):
+        """Test that a config without the handler gives an empty mapping."""
+        (tmp_path / "mkdocs.yml").write_text("site_name: x\nplugins: [search]\n")
+
+        assert cli.handler_config(tmp_path / "mkdocs.yml") == {}
+
+
+class TestProjectFiles:
+    """Tests for listing project modules."""
+
+    def test_globs(self, project):
+        """Test that include/exclude globs match like nimdocinfo's."""
+        collector = NimCollector(["src"], project, exclude=["**/private/**"])
+        assert [p.name for p in collector.project_files()] == ["a.nim", "b.nim"]
+
+        collector = NimCollector(["src"], project, include=["pkg/**"])
+        assert [p.name for p in collector.project_files()] == ["b.nim", "c.nim"]
+
+        collector = NimCollector(["src"], project, include=["*.nim"])
+        assert [p.name for p in collector.project_files()] == ["a.nim"]
+
+    def test_symlinks(self, project):
+        """Test that symlinked files are listed and symlinked directories are not entered."""
+        (project / "src" / "alias.nim").symlink_to(project / "src" / "a.nim")
+        (project / "src" / "broken.nim").symlink_to(project / "src" / "missing.nim")
+        (project / "src" / "loop").symlink_to(project / "src", target_is_directory=True)
+        collector = NimCollector(["src"], project)
+
+        assert [p.relative_to(project).as_posix() for p in collector.project_files()] == [
+            "src/a.nim",
+            "src/alias.nim",
+            "src/pkg/b.nim",
+            "src/pkg/private/c.nim",
+        ]
+
+
+class TestPrefetch:
+    """Tests for extracting a project into the store in parallel."""
+
+    def test_extracts_missing_in_parallel(self, mocker, project):
+        """Test that uncached files are extracted concurrently and stored."""
+        store = DirectoryStore(project / "store")
+        collector = NimCollector(["src"], project, store=store)
+        mocker.patch.object(collector, "_ensure_nimdocinfo_compiled")
+        running, peak, lock = [0], [0], threading.Lock()
+
+        def extract(filepath):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.2)
+            with lock:
+                running[0] -= 1
+            return _fake_extract(filepath)
+
+        mocker.patch.object(collector, "_run_nimdocinfo", side_effect=extract)
+        result = collector.prefetch(collector.project_files(), jobs=3)
+
+        assert len(result.extracted) == 3
+        assert peak[0] > 1
+        for filepath in collector.project_files():
+            assert store.get(collector._store_key(filepath)) is not None
+
+    def test_skips_cached_and_reports_failures(self, mocker, project):
+        """Test that stored files are not extracted again and failures are collected."""
+        store = DirectoryStore(project / "store")
+        collector = NimCollector(["src"], project, store=store)
+        mocker.patch.object(collector, "_ensure_nimdocinfo_compiled")
+        a = (project / "src" / "a.nim").resolve()
+        store.put(collector._store_key(a), _fake_extract(a))
+
+        def extract(filepath):
+            if filepath.name == "c.nim":
+                raise CollectionError("syntax error")
+            return _fake_extract(filepath)
+
+        run = mocker.patch.object(collector, "_run_nimdocinfo", side_effect=extract)
+        result = collector.prefetch(collector.project_files(), jobs=2)
+
+        assert result.cached == [a]
+        assert [p.name for p in result.extracted] == ["b.nim"]
+        assert [p.name for p in result.failed] == ["c.nim"]
+        assert run.call_count == 2
+
+
+class TestMain:
+    """Tests for the subcommands."""
+
+    def test_warm_cache(self, mocker, project, capsys):
+        """Test that warm-cache fills the cache configured in mkdocs.yml."""
+        mocker.patch.object(NimCollector, "_ensure_nimdocinfo_compiled")
+        mocker.patch.object(NimCollector, "_run_nimdocinfo", side_effect=_fake_extract)
+
+        status = cli.main(["warm-cache", "-f", str(project / "mkdocs.yml"), "-j", "2"])
+
+        assert status == 0
+        assert "2 modules: 2 extracted, 0 already cached, 0 failed" in capsys.readouterr().out
+        assert len(list((project / ".cache" / "module").rglob("*.json"))) == 2
+
+        assert cli.main(["warm-cache", "-f", str(project / "mkdocs.yml")]) == 0
+        assert "0 extracted, 2 already cached" in capsys.readouterr().out
+
+    def test_build_extractor(self, mocker, tmp_path, capsys):
+        """Test that build-extractor compiles nimdocinfo and prints the binary."""
+        compile_ = mocker.patch.object(
+            NimCollector, "_ensure_nimdocinfo_compiled", return_value=tmp_path / "nimdocinfo"
+        )
+
+        assert cli.main(["build-extractor"]) == 0
+        compile_.assert_called_once()
+        assert capsys.readouterr().out.strip() == str(tmp_path / "nimdocinfo")
+
+    def test_errors_exit_nonzero(self, tmp_path, capsys):
+        """Test that errors are reported without a traceback."""
+        status = cli.main(["warm-cache", "-f", str(tmp_path / "missing.yml")])
+
+        assert status == 1
+        assert capsys.readouterr().err.startswith("error: Could not read")
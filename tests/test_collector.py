@@ -1,12 +1,23 @@
 """Tests for collector path resolution."""
 
+import json
+import os
+import subprocess
+from dataclasses import replace
 from importlib.resources import as_file
 from pathlib import Path
 
 import pytest
 from mkdocstrings import CollectionError
 
-from mkdocstrings_handlers.nim.collector import _JSON_END_MARKER, _JSON_START_MARKER, NimCollector
+from mkdocstrings_handlers.nim.collector import (
+    _JSON_END_MARKER,
+    _JSON_START_MARKER,
+    ExtractorError,
+    NimCollector,
+    summarize_stats,
+)
+from mkdocstrings_handlers.nim.docstring import ParamDoc, ParsedDocstring, ReturnsDoc
 
 
 def test_nimdocinfo_path_exists():
@@ -130,3 +141,601 @@ class TestParseModule:
         assert module.entries[0].pragmas == ["inline"]
         assert module.entries[0].raises == ["ValueError"]
         assert module.entries[0].exported is True
+
+
+class TestStructuredDocs:
+    """Tests for docstrings parsed by nimdocinfo."""
+
+    def test_doc_fields_parsed(self):
+        """Test that doc_fields become the entry's parsed docstring."""
+        collector = NimCollector(["src"], Path("."))
+        entry = {
+            "name": "foo",
+            "kind": "proc",
+            "line": 1,
+            "signature": "proc foo*(x: int): int",
+            "doc": "Foo.\n\n:param x: The x\n:returns: The foo",
+            "doc_fields": {
+                "style": "rst",
+                "description": "Foo.",
+                "params": [{"name": "x", "description": "The x"}],
+                "returns": "The foo",
+            },
+        }
+
+        plain, parsed = collector._parse_entries([{**entry, "doc_fields": None}, entry])
+
+        assert plain.parsed_doc is None
+        assert parsed.parsed_doc_style == "rst"
+        assert parsed.parsed_doc == ParsedDocstring(
+            description="Foo.", params=[ParamDoc("x", "The x")], returns=ReturnsDoc("The foo")
+        )
+
+    def test_flag_passed_to_extractor(self, mocker, tmp_path):
+        """Test that structured_docs adds the extractor flag."""
+        collector = NimCollector(["src"], tmp_path, structured_docs=True)
+        mocker.patch.object(collector, "_ensure_nimdocinfo_compiled", return_value=Path("nd"))
+        stdout = f'{_JSON_START_MARKER}{{"module": "m", "file": "m.nim", "entries": []}}{_JSON_END_MARKER}'
+        run = mocker.patch(
+            "mkdocstrings_handlers.nim.collector.subprocess.run",
+            return_value=mocker.Mock(returncode=0, stdout=stdout, stderr=""),
+        )
+        collector._run_nimdocinfo(tmp_path / "m.nim")
+
+        assert run.call_args.args[0] == ["nd", "--structured-docs", str(tmp_path / "m.nim")]
+
+
+class TestExtractionStats:
+    """Tests for nimdocinfo's self-reported stats."""
+
+    _STATS = {
+        "read_ms": 1.5,
+        "parse_ms": 10.0,
+        "walk_ms": 2.0,
+        "serialize_ms": 3.0,
+        "ast_nodes": 400,
+        "entries": 7,
+        "output_bytes": 2048,
+    }
+
+    def _run(self, mocker, tmp_path, output, args):
+        collector = NimCollector(["src"], tmp_path, collect_stats=True)
+        mocker.patch.object(collector, "_ensure_nimdocinfo_compiled", return_value=Path("nd"))
+        run = mocker.patch(
+            "mkdocstrings_handlers.nim.collector.subprocess.run",
+            return_value=mocker.Mock(
+                returncode=0,
+                stdout=f"{_JSON_START_MARKER}{json.dumps(output)}{_JSON_END_MARKER}",
+                stderr="",
+            ),
+        )
+        data = collector._run_extractor(args, tmp_path, 60)
+        return collector, data, run.call_args.args[0]
+
+    def test_stats_moved_out_of_output(self, mocker, tmp_path):
+        """Test that --stats is passed and the reported stats are recorded, not cached."""
+        module = {"module": "m", "file": str(tmp_path / "m.nim"), "entries": []}
+        collector, data, command = self._run(
+            mocker, tmp_path, {**module, "stats": self._STATS}, [str(tmp_path / "m.nim")]
+        )
+
+        assert command == ["nd", "--stats", str(tmp_path / "m.nim")]
+        assert data == module
+        [stats] = collector.stats
+        assert stats.file == "m.nim"
+        assert stats.parse_ms == 10.0
+        assert stats.entries == 7
+        assert stats.process_ms > 0
+
+    def test_project_pass_is_one_run(self, mocker, tmp_path):
+        """Test that modules of a project pass share their run."""
+        modules = [
+            {"module": name, "file": f"{name}.nim", "entries": [], "stats": self._STATS}
+            for name in ("a", "b")
+        ]
+        collector, data, _ = self._run(mocker, tmp_path, {"modules": modules}, [])
+
+        assert [m.get("stats") for m in data["modules"]] == [None, None]
+        assert [s.file for s in collector.stats] == ["a.nim", "b.nim"]
+        assert len({s.run for s in collector.stats}) == 1
+
+        summary = summarize_stats(collector.stats)
+        assert summary.startswith("nimdocinfo extracted 2 modules (14 entries, 800 AST nodes")
+        assert "parse 20 ms" in summary
+        assert summary.endswith("over 1 run")
+
+    def test_doc_fields_time_reported(self, mocker, tmp_path):
+        """Test that doc field parsing is summarized apart from serialization."""
+        module = {"module": "m", "file": "m.nim", "entries": []}
+        collector, _, _ = self._run(
+            mocker, tmp_path, {**module, "stats": {**self._STATS, "doc_fields_ms": 4.0}}, []
+        )
+
+        assert collector.stats[0].doc_fields_ms == 4.0
+        summary = summarize_stats(collector.stats)
+        assert "walk 2 ms, doc fields 4 ms, serialize 3 ms" in summary
+        assert "doc fields" not in summarize_stats([replace(collector.stats[0], doc_fields_ms=0.0)])
+
+
+class TestDeclarationsOnly:
+    """Tests for declarations-only extraction."""
+
+    def _run(self, mocker, tmp_path, **kwargs):
+        collector = NimCollector(["src"], tmp_path, **kwargs)
+        mocker.patch.object(collector, "_ensure_nimdocinfo_compiled", return_value=Path("nd"))
+        stdout = f'{_JSON_START_MARKER}{{"module": "m", "file": "m.nim", "entries": []}}{_JSON_END_MARKER}'
+        run = mocker.patch(
+            "mkdocstrings_handlers.nim.collector.subprocess.run",
+            return_value=mocker.Mock(returncode=0, stdout=stdout, stderr=""),
+        )
+        collector._run_nimdocinfo(tmp_path / "m.nim")
+        return run.call_args.args[0]
+
+    def test_flag_passed_to_extractor(self, mocker, tmp_path):
+        """Test that declarations_only adds the extractor flag."""
+        args = self._run(mocker, tmp_path, declarations_only=True)
+
+        assert args == ["nd", "--declarations-only", str(tmp_path / "m.nim")]
+
+    def test_full_parse_by_default(self, mocker, tmp_path):
+        """Test that full parsing is the default."""
+        args = self._run(mocker, tmp_path)
+
+        assert "--declarations-only" not in args
+
+
+class TestTimeout:
+    """Tests for the extractor timeout."""
+
+    def _timeout(self, mocker, tmp_path, source):
+        (tmp_path / "m.nim").write_text(source)
+        collector = NimCollector(["src"], tmp_path)
+        mocker.patch.object(collector, "_ensure_nimdocinfo_compiled", return_value=Path("nd"))
+        stdout = f'{_JSON_START_MARKER}{{"module": "m", "file": "m.nim", "entries": []}}{_JSON_END_MARKER}'
+        run = mocker.patch(
+            "mkdocstrings_handlers.nim.collector.subprocess.run",
+            return_value=mocker.Mock(returncode=0, stdout=stdout, stderr=""),
+        )
+        collector._run_nimdocinfo(tmp_path / "m.nim")
+        return run.call_args.kwargs["timeout"]
+
+    def test_scales_with_file_size(self, mocker, tmp_path):
+        """Test that large files get more time than the base timeout."""
+        small = self._timeout(mocker, tmp_path, "proc a*() = discard\n")
+        large = self._timeout(mocker, tmp_path, "const X* = 0\n" * 200_000)
+
+        assert 60 <= small < 61
+        assert large > small + 100
+
+    def test_reported_on_expiry(self, mocker, tmp_path):
+        """Test that the timeout used is part of the error."""
+        collector = NimCollector(["src"], tmp_path)
+        mocker.patch.object(collector, "_ensure_nimdocinfo_compiled", return_value=Path("nd"))
+        mocker.patch(
+            "mkdocstrings_handlers.nim.collector.subprocess.run",
+            side_effect=subprocess.TimeoutExpired("nd", 60),
+        )
+
+        with pytest.raises(CollectionError, match="timed out after 60 s"):
+            collector._run_nimdocinfo(tmp_path / "m.nim")
+
+
+def _module_json(path: Path, names: list[str]) -> dict:
+    """Build nimdocinfo output for a module with the given proc names."""
+    return {
+        "module": path.stem,
+        "file": str(path),
+        "doc": f"{path.stem} doc",
+        "entries": [
+            {"name": n, "kind": "proc", "line": i + 1, "signature": f"proc {n}()"}
+            for i, n in enumerate(names)
+        ],
+    }
+
+
+class TestProjectMode:
+    """Tests for whole-project extraction."""
+
+    @pytest.fixture
+    def project(self, tmp_path):
+        """Create a small project tree and return (tmp_path, files)."""
+        src = tmp_path / "src"
+        (src / "pkg").mkdir(parents=True)
+        files = {
+            "pkg.a": src / "pkg" / "a.nim",
+            "pkg.b": src / "pkg" / "b.nim",
+            "top": src / "top.nim",
+        }
+        for path in files.values():
+            path.write_text("## doc\n")
+        return tmp_path, files
+
+    def _collector(self, mocker, base_dir, files, **kwargs):
+        collector = NimCollector(["src"], base_dir, **kwargs)
+        output = {"modules": [_module_json(p, [p.stem + "Proc"]) for p in files.values()]}
+        run = mocker.patch.object(collector, "_run_extractor", return_value=output)
+        return collector, run
+
+    def test_collect_project_single_pass(self, mocker, project):
+        """Test that the project pass extracts all modules with one extractor call."""
+        base_dir, files = project
+        collector, run = self._collector(
+            mocker, base_dir, files, include=["pkg/**"], exclude=["**/b.nim"]
+        )
+
+        modules = collector.collect_project()
+
+        assert list(modules) == ["pkg.a", "pkg.b", "top"]
+        run.assert_called_once()
+        args = run.call_args.args[0]
+        assert args == [
+            f"--project={base_dir / 'src'}",
+            "--include=pkg/**",
+            "--exclude=**/b.nim",
+        ]
+
+    def test_collect_hits_project_cache(self, mocker, project):
+        """Test that project mode serves later collects from the cache."""
+        base_dir, files = project
+        collector, run = self._collector(mocker, base_dir, files, project_mode=True)
+
+        module = collector.collect("pkg.b")
+
+        assert module.entries[0].name == "bProc"
+        run.assert_called_once()
+
+    def test_cache_grows_to_project_size(self, mocker, project, monkeypatch):
+        """Test that a project larger than the LRU bound is fully cached."""
+        monkeypatch.setattr("mkdocstrings_handlers.nim.collector._MAX_CACHE_SIZE", 2)
+        base_dir, files = project
+        collector, _ = self._collector(mocker, base_dir, files)
+
+        collector.collect_project()
+
+        assert len(collector._cache) == 3
+
+    def test_collect_package_prefix(self, mocker, project):
+        """Test that wildcard identifiers select modules by prefix."""
+        base_dir, files = project
+        collector, run = self._collector(mocker, base_dir, files)
+
+        package = collector.collect_package("pkg.*")
+
+        assert package.name == "pkg.*"
+        assert [m.module for m in package.modules] == ["a", "b"]
+        assert len(collector.collect_package("*").modules) == 3
+        run.assert_called_once()
+
+    def test_included_files_not_modules(self, mocker, project):
+        """Test that a file another project file includes is not a module of its own."""
+        base_dir, files = project
+        collector = NimCollector(["src"], base_dir)
+        top = {**_module_json(files["top"], ["t"]), "includes": [{"path": "pkg/b", "line": 1}]}
+        output = {
+            "modules": [
+                _module_json(files["pkg.a"], ["a"]),
+                _module_json(files["pkg.b"], ["b"]),
+                top,
+            ]
+        }
+        mocker.patch.object(collector, "_run_extractor", return_value=output)
+
+        modules = collector.collect_project()
+
+        assert list(modules) == ["pkg.a", "top"]
+        assert [e.name for e in modules["top"].entries] == ["t", "b"]
+        assert [m.module for m in collector.collect_package("*").modules] == ["a", "top"]
+
+    def test_project_failure_falls_back(self, mocker, project):
+        """Test that a failed project pass falls back to per-module extraction."""
+        base_dir, files = project
+        collector = NimCollector(["src"], base_dir, project_mode=True)
+        mocker.patch.object(collector, "_run_extractor", side_effect=CollectionError("boom"))
+        per_file = mocker.patch.object(
+            collector, "_run_nimdocinfo", return_value=_module_json(files["top"], ["t"])
+        )
+
+        module = collector.collect("top")
+
+        assert module.entries[0].name == "t"
+        per_file.assert_called_once_with(files["top"])
+
+
+class TestIncludes:
+    """Tests for following include statements."""
+
+    @pytest.fixture
+    def project(self, tmp_path):
+        """Create two modules sharing one included file."""
+        src = tmp_path / "src"
+        (src / "private").mkdir(parents=True)
+        files = {
+            "a": src / "a.nim",
+            "b": src / "b.nim",
+            "shared": src / "private" / "shared.nim",
+        }
+        for path in files.values():
+            path.write_text("## doc\n")
+        return tmp_path, files
+
+    def _collector(self, mocker, base_dir, files):
+        outputs = {
+            files["a"]: {
+                **_module_json(files["a"], ["before", "after"]),
+                "includes": [{"path": "private/shared", "line": 1}],
+            },
+            files["b"]: {
+                **_module_json(files["b"], ["own"]),
+                "includes": [{"path": "private/shared.nim", "line": 5}],
+            },
+            files["shared"]: _module_json(files["shared"], ["helper"]),
+        }
+        collector = NimCollector(["src"], base_dir)
+        run = mocker.patch.object(
+            collector, "_run_nimdocinfo", side_effect=lambda path: outputs[path]
+        )
+        return collector, run
+
+    def test_included_entries_spliced_and_tagged(self, mocker, project):
+        """Test that included entries appear at the include and carry their own file."""
+        base_dir, files = project
+        collector, _ = self._collector(mocker, base_dir, files)
+
+        module = collector.collect("a")
+
+        assert [e.name for e in module.entries] == ["before", "helper", "after"]
+        assert module.entries[1].file == "src/private/shared.nim"
+        assert module.entries[0].file == ""
+
+    def test_shared_include_extracted_once(self, mocker, project):
+        """Test that a file included by several modules is extracted only once."""
+        base_dir, files = project
+        collector, run = self._collector(mocker, base_dir, files)
+
+        a = collector.collect("a")
+        b = collector.collect("b")
+
+        assert [e.name for e in b.entries] == ["own", "helper"]
+        assert [call.args[0] for call in run.call_args_list] == [
+            files["a"],
+            files["shared"],
+            files["b"],
+        ]
+        # Each includer gets its own entries, since rendering mutates them
+        assert a.entries[1] is not b.entries[1]
+
+    def test_include_change_invalidates_includer(self, mocker, project):
+        """Test that editing an included file refreshes modules including it."""
+        base_dir, files = project
+        collector, run = self._collector(mocker, base_dir, files)
+        collector.collect("a")
+        collector.collect("a")
+        assert run.call_count == 2
+
+        stat = files["shared"].stat()
+        os.utime(files["shared"], (stat.st_atime, stat.st_mtime + 10))
+        collector.collect("a")
+
+        assert run.call_args.args[0] == files["shared"]
+        assert run.call_count == 3
+
+    def test_include_cycle_skipped(self, mocker, tmp_path):
+        """Test that a file including itself does not recurse forever."""
+        src = tmp_path / "src"
+        src.mkdir()
+        path = src / "loop.nim"
+        path.write_text("include loop\n")
+        collector = NimCollector(["src"], tmp_path)
+        mocker.patch.object(
+            collector,
+            "_run_nimdocinfo",
+            return_value={**_module_json(path, ["x"]), "includes": [{"path": "loop", "line": 1}]},
+        )
+
+        assert [e.name for e in collector.collect("loop").entries] == ["x"]
+
+
+class TestReexports:
+    """Tests for re-exported symbols."""
+
+    @pytest.fixture
+    def project(self, tmp_path):
+        """Create a facade re-exporting from two submodules."""
+        src = tmp_path / "src"
+        (src / "lib").mkdir(parents=True)
+        files = {
+            "lib": src / "lib.nim",
+            "lib.core": src / "lib" / "core.nim",
+            "lib.utils": src / "lib" / "utils.nim",
+        }
+        for path in files.values():
+            path.write_text("## doc\n")
+        return tmp_path, files
+
+    def _collector(self, mocker, base_dir, files, exports):
+        core = _module_json(files["lib.core"], ["open", "close", "internal"])
+        core["entries"][2]["exported"] = False
+        outputs = {
+            files["lib"]: {
+                **_module_json(files["lib"], ["own"]),
+                "imports": [
+                    {"path": "lib/core", "line": 1},
+                    {"path": "lib/utils", "line": 1},
+                    {"path": "std/os", "line": 2},
+                ],
+                "exports": exports,
+            },
+            files["lib.core"]: core,
+            files["lib.utils"]: _module_json(files["lib.utils"], ["helper", "other"]),
+        }
+        collector = NimCollector(["src"], base_dir)
+        run = mocker.patch.object(
+            collector, "_run_nimdocinfo", side_effect=lambda path: outputs[path]
+        )
+        return collector, run
+
+    def test_module_and_symbol_exports(self, mocker, project):
+        """Test that `export mod` takes all public symbols and `export mod.sym` only one."""
+        base_dir, files = project
+        collector, _ = self._collector(
+            mocker,
+            base_dir,
+            files,
+            [{"path": "core", "line": 3}, {"path": "utils.helper", "line": 3}],
+        )
+
+        module = collector.collect("lib")
+
+        assert [e.name for e in module.entries] == ["own"]
+        assert [e.name for e in module.reexports] == ["open", "close", "helper"]
+        assert module.reexports[0].file == "src/lib/core.nim"
+
+    def test_export_except_and_bare_symbol(self, mocker, project):
+        """Test `export mod except x` and a bare symbol found in any import."""
+        base_dir, files = project
+        collector, _ = self._collector(
+            mocker,
+            base_dir,
+            files,
+            [{"path": "core", "line": 3, "except": ["close"]}, {"path": "other", "line": 4}],
+        )
+
+        module = collector.collect("lib")
+
+        assert [e.name for e in module.reexports] == ["open", "other"]
+
+    def test_reuses_cached_submodules(self, mocker, project):
+        """Test that re-exports come from cached modules rather than re-extraction."""
+        base_dir, files = project
+        collector, run = self._collector(mocker, base_dir, files, [{"path": "core", "line": 3}])
+
+        core = collector.collect("lib.core")
+        facade = collector.collect("lib")
+
+        assert run.call_count == 2
+        # The facade gets copies, so rendering one page cannot alter another
+        assert facade.reexports[0].name == core.entries[0].name
+        assert facade.reexports[0] is not core.entries[0]
+        assert core.entries[0].file == ""
+
+    def test_submodule_change_invalidates_facade(self, mocker, project):
+        """Test that editing a re-exported module refreshes the facade."""
+        base_dir, files = project
+        collector, run = self._collector(mocker, base_dir, files, [{"path": "core", "line": 3}])
+        collector.collect("lib")
+
+        stat = files["lib.core"].stat()
+        os.utime(files["lib.core"], (stat.st_atime, stat.st_mtime + 10))
+        collector.collect("lib")
+
+        assert [call.args[0] for call in run.call_args_list] == [
+            files["lib"],
+            files["lib.core"],
+            files["lib.core"],
+        ]
+
+
+class TestFailureCache:
+    """Tests for remembering failed lookups and extractions."""
+
+    def test_unresolved_identifier_retried_after_file_appears(self, tmp_path):
+        """Test that a missing module is looked up again once a file is created."""
+        (tmp_path / "src").mkdir()
+        collector = NimCollector(["src"], tmp_path)
+
+        for _ in range(2):
+            with pytest.raises(CollectionError, match="Could not find Nim file"):
+                collector._resolve_identifier("pkg.mod")
+        assert "pkg.mod" in collector._unresolved
+
+        (tmp_path / "src" / "pkg").mkdir()
+        (tmp_path / "src" / "pkg" / "mod.nim").write_text("## doc\n")
+
+        assert collector._resolve_identifier("pkg.mod") == tmp_path / "src" / "pkg" / "mod.nim"
+        assert "pkg.mod" not in collector._unresolved
+
+    def test_failed_extraction_not_retried_until_file_changes(self, mocker, tmp_path):
+        """Test that nimdocinfo runs once on a broken file until it is modified."""
+        path = tmp_path / "src" / "broken.nim"
+        path.parent.mkdir()
+        path.write_text("proc (\n")
+        collector = NimCollector(["src"], tmp_path)
+        run = mocker.patch.object(
+            collector, "_run_nimdocinfo", side_effect=ExtractorError("nimdocinfo failed")
+        )
+
+        for _ in range(3):
+            with pytest.raises(CollectionError, match="nimdocinfo failed"):
+                collector.collect("broken")
+        run.assert_called_once()
+
+        path.write_text("proc fixed*() = discard\n")
+        os.utime(path, (path.stat().st_atime, path.stat().st_mtime + 10))
+        run.side_effect = None
+        run.return_value = _module_json(path, ["fixed"])
+
+        assert collector.collect("broken").entries[0].name == "fixed"
+        assert run.call_count == 2
+
+    def test_failed_project_pass_not_retried_until_project_changes(self, mocker, tmp_path):
+        """Test that a failing project pass runs once until a project file changes."""
+        path = tmp_path / "src" / "a.nim"
+        path.parent.mkdir()
+        path.write_text("## doc\n")
+        collector = NimCollector(["src"], tmp_path)
+        run = mocker.patch.object(collector, "_run_extractor", side_effect=ExtractorError("boom"))
+
+        for _ in range(2):
+            with pytest.raises(CollectionError, match="boom"):
+                collector.collect_package("*")
+        run.assert_called_once()
+
+        (tmp_path / "src" / "b.nim").write_text("## doc\n")
+        with pytest.raises(CollectionError, match="boom"):
+            collector.collect_package("*")
+        assert run.call_count == 2
+
+    def test_missing_compiler_not_remembered(self, mocker, tmp_path):
+        """Test that extraction is retried once Nim is installed, without touching the file."""
+        path = tmp_path / "src" / "mod.nim"
+        path.parent.mkdir()
+        path.write_text("proc a*() = discard\n")
+        collector = NimCollector(["src"], tmp_path)
+        compiled = mocker.patch.object(
+            collector,
+            "_ensure_nimdocinfo_compiled",
+            side_effect=CollectionError("Nim compiler not found"),
+        )
+
+        for _ in range(2):
+            with pytest.raises(CollectionError, match="Nim compiler not found"):
+                collector.collect("mod")
+        assert compiled.call_count == 2
+        assert not collector._failed
+
+        compiled.side_effect = None
+        compiled.return_value = Path("nimdocinfo")
+        stdout = f"{_JSON_START_MARKER}{json.dumps(_module_json(path, ['a']))}{_JSON_END_MARKER}"
+        mocker.patch(
+            "mkdocstrings_handlers.nim.collector.subprocess.run",
+            return_value=mocker.Mock(returncode=0, stdout=stdout, stderr=""),
+        )
+
+        assert collector.collect("mod").entries[0].name == "a"
+
+    def test_timeout_not_remembered(self, mocker, tmp_path):
+        """Test that a file that timed out is extracted again by the next call."""
+        path = tmp_path / "src" / "mod.nim"
+        path.parent.mkdir()
+        path.write_text("proc a*() = discard\n")
+        collector = NimCollector(["src"], tmp_path)
+        mocker.patch.object(collector, "_ensure_nimdocinfo_compiled", return_value=Path("nd"))
+        run = mocker.patch(
+            "mkdocstrings_handlers.nim.collector.subprocess.run",
+            side_effect=subprocess.TimeoutExpired("nd", 60),
+        )
+
+        for _ in range(2):
+            with pytest.raises(CollectionError, match="timed out"):
+                collector.collect("mod")
+        assert run.call_count == 2
@@ -0,0 +1,138 @@
+"""Tests for deferring entry bodies to fragment files."""
+
+import json
+
+import pytest
+from markupsafe import Markup
+from mkdocs.plugins import PluginCollection
+from mkdocs_autorefs import fix_refs
+
+from mkdocstrings_handlers.nim import deferred
+from mkdocstrings_handlers.nim.collector import NimEntry, NimField, NimModule, NimParam
+from mkdocstrings_handlers.nim.handler import NimHandler, get_handler
+
+MODULE = NimModule(
+    module="big",
+    file="src/big.nim",
+    doc="A big module.",
+    entries=[
+        NimEntry(
+            name="scale",
+            kind="proc",
+            line=3,
+            signature="proc scale*(v: Vec; k: float): Vec",
+            doc='Scales a <autoref identifier="Vec">Vec</autoref>.',
+            params=[NimParam(name="k", type="float")],
+        ),
+        NimEntry(
+            name="Vec",
+            kind="type",
+            line=1,
+            signature="Vec* = object",
+            doc="A vector.",
+            fields=[NimField(name="x", type="float")],
+        ),
+    ],
+)
+
+
+@pytest.fixture
+def handler(tmp_path):
+    """Create a handler rendering without a Markdown pipeline."""
+    handler = NimHandler(paths=["src"], base_dir=tmp_path, mdx=[], mdx_config={})
+    handler.env.filters["convert_markdown"] = lambda text, *_args, **_kwargs: Markup(text)
+    handler.env.filters["heading"] = lambda text, level, **kwargs: (
+        f'<h{level} id="{kwargs.get("id", "")}">{text}</h{level}>'
+    )
+    return handler
+
+
+def _render(handler, **local_options):
+    options = handler.get_options(local_options)
+    return handler.render(handler._prepare_module(MODULE, options), options)
+
+
+def _fragments(site_dir):
+    return sorted((site_dir / deferred.FRAGMENT_DIR).iterdir())
+
+
+def test_inline_by_default(handler):
+    """Test that bodies are rendered in the page without defer_bodies."""
+    result = _render(handler)
+
+    assert "Scales a" in result
+    assert "doc-deferred" not in result
+    assert "<script>" not in result
+
+
+def test_bodies_held_until_page_complete(handler):
+    """Test that rendering keeps bodies in their placeholders, for autorefs to see."""
+    result = _render(handler, defer_bodies=True)
+
+    assert 'id="scale"' in result
+    assert "proc scale*(v: Vec; k: float): Vec" in result
+    assert result.count('<details class="doc-deferred">') == 2
+    assert f"<{deferred.BODY_TAG}>" in result
+    assert "Scales a" in result
+    assert "<script>" in result
+
+
+def test_bodies_moved_to_fragment(handler, tmp_path):
+    """Test that the complete page keeps placeholders pointing at a page-relative fragment."""
+    result = deferred.move_bodies(_render(handler, defer_bodies=True), tmp_path, "api/big/")
+
+    assert "Scales a" not in result
+    assert "doc-field-list" not in result
+    assert "A big module." in result
+    assert deferred.BODY_TAG not in result
+
+    [fragment] = _fragments(tmp_path)
+    assert fragment.name.startswith("api_big-")
+    url = f"../../{deferred.FRAGMENT_DIR}/{fragment.name}"
+    assert f'data-fragment="{url}" data-key="0"' in result
+    assert f'data-fragment="{url}" data-key="1"' in result
+    bodies = json.loads(fragment.read_text())
+    assert "Scales a" in bodies[0]
+    assert "doc-section-parameters" in bodies[0]
+    assert "doc-field-list" in bodies[1]
+
+
+def test_cross_references_resolved(handler, tmp_path):
+    """Test that autorefs in deferred bodies are resolved before the bodies move."""
+    html = _render(handler, defer_bodies=True)
+    html, unmapped = fix_refs(html, lambda identifier: (f"#{identifier}", None))
+    assert not unmapped
+
+    deferred.move_bodies(html, tmp_path, "big.html")
+
+    [fragment] = _fragments(tmp_path)
+    body = json.loads(fragment.read_text())[0]
+    assert '<a class="autorefs autorefs-internal"' in body
+    assert 'href="#Vec"' in body
+    assert "<autoref" not in body
+
+
+def test_fragment_names_differ_by_content(handler, tmp_path):
+    """Test that a page rebuilt with other bodies gets its own fragment."""
+    deferred.move_bodies(_render(handler, defer_bodies=True), tmp_path, "big/")
+    deferred.move_bodies(_render(handler, defer_bodies=True, show_source=False), tmp_path, "big/")
+    deferred.move_bodies(_render(handler, defer_bodies=True), tmp_path, "big/")
+
+    assert len(_fragments(tmp_path)) == 2
+
+
+def test_post_page_hook_registered(handler, tmp_path, mocker):
+    """Test that get_handler adds the hook moving bodies once each page is complete."""
+    plugins = PluginCollection()
+    config = mocker.Mock(plugins=plugins, config_file_path=str(tmp_path / "mkdocs.yml"))
+    get_handler({}, config, mdx=[], mdx_config={})
+    get_handler({}, config, mdx=[], mdx_config={})
+
+    assert len(plugins.events["post_page"]) == 1
+    page = mocker.Mock(url="")
+    output = plugins.on_post_page(
+        _render(handler, defer_bodies=True), page=page, config={"site_dir": str(tmp_path)}
+    )
+
+    [fragment] = _fragments(tmp_path)
+    assert f'data-fragment="{deferred.FRAGMENT_DIR}/{fragment.name}"' in output
@@ -1,6 +1,15 @@
 """Tests for docstring parsing."""
 
-from mkdocstrings_handlers.nim.docstring import DocstringStyle, parse_docstring
+import pytest
+
+from mkdocstrings_handlers.nim.docstring import (
+    DocstringStyle,
+    DocstringStyleError,
+    detect_docstring_style,
+    infer_docstring_style,
+    parse_docstring,
+    summary_line,
+)
 
 
 class TestRstDocstring:
@@ -268,6 +277,14 @@ class TestEdgeCases:
         result = parse_docstring(doc, style=DocstringStyle.RST)
         assert "Description" in result.description
 
+    def test_no_fallback(self):
+        """Test that without fallback, a docstring not in the given style raises."""
+        doc = "Do.\n\nArgs:\n    x"
+
+        assert parse_docstring(doc, style=DocstringStyle.GOOGLE).description.startswith("Do.")
+        with pytest.raises(DocstringStyleError, match="Not a google docstring"):
+            parse_docstring(doc, style=DocstringStyle.GOOGLE, fallback=False)
+
     def test_long_description(self):
         """Test docstring with short and long description."""
         doc = """Short description.
@@ -279,3 +296,45 @@ multiple lines and provides more detail.
 
         assert "Short description" in result.description
         assert "longer description" in result.description
+
+
+class TestStyleInference:
+    """Tests for inferring a module's docstring style."""
+
+    def test_detect_each_style(self):
+        """Test that section markers identify the style of one docstring."""
+        assert detect_docstring_style(":param x: The x\n:returns: Done") is DocstringStyle.RST
+        assert detect_docstring_style("Do.\n\nArgs:\n    x: The x") is DocstringStyle.GOOGLE
+        numpy = "Do.\n\nParameters\n----------\nx : int\n    The x"
+        assert detect_docstring_style(numpy) is DocstringStyle.NUMPY
+        assert detect_docstring_style("@param x: The x") is DocstringStyle.EPYDOC
+        assert detect_docstring_style("Just prose.") is None
+
+    def test_dominant_style_and_misdetected_count(self):
+        """Test that the most common style wins and the others are counted."""
+        docs = [
+            "Prose only.",
+            "Do.\n\nArgs:\n    x: The x",
+            "Do.\n\nReturns:\n    Done",
+            ":param y: The y",
+        ]
+
+        assert infer_docstring_style(docs) == (DocstringStyle.GOOGLE, 1)
+
+    def test_no_sections_defaults_to_rst(self):
+        """Test that modules without structured docstrings are parsed as RST."""
+        assert infer_docstring_style(["Prose.", "More prose."]) == (DocstringStyle.RST, 0)
+
+
+class TestSummaryLine:
+    """Tests for one-line docstring summaries."""
+
+    def test_first_paragraph_joined(self):
+        """Test that the first paragraph is joined onto one line."""
+        assert summary_line("  Adds two\n  numbers.\n\n  More detail.") == "Adds two numbers."
+
+    def test_stops_at_sections(self):
+        """Test that field lists and section headers end the summary."""
+        assert summary_line("Adds.\n:param x: The x") == "Adds."
+        assert summary_line("Adds.\nArgs:\n    x: The x") == "Adds."
+        assert summary_line("@param x: The x") == ""
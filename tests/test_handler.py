@@ -1,8 +1,10 @@
 """Tests for the Nim handler."""
 
+from dataclasses import replace
 from pathlib import Path
 
-from mkdocstrings_handlers.nim.collector import NimCollector
+from mkdocstrings_handlers.nim.collector import NimCollector, NimEntry, NimModule, NimParam
+from mkdocstrings_handlers.nim.docstring import DocstringStyle
 from mkdocstrings_handlers.nim.handler import NimHandler
 
 
@@ -150,6 +152,70 @@ class TestConfigValidation:
         options = handler.get_options({})
         assert options["source_ref"] == "develop"
 
+    def test_detect_git_branch_reads_head(self, mocker, tmp_path):
+        """Test that the branch is read from .git/HEAD without running git."""
+        self._init_git_repo(tmp_path, "feature/x")
+        (tmp_path / "docs").mkdir()
+        run = mocker.patch("mkdocstrings_handlers.nim.handler.subprocess.run")
+
+        assert NimHandler._detect_git_branch(tmp_path / "docs") == "feature/x"
+        run.assert_not_called()
+
+    def test_detect_git_branch_detached_and_worktree(self, tmp_path):
+        """Test detached HEADs and `.git` files pointing at the git directory."""
+        git_dir = tmp_path / "gitdir"
+        git_dir.mkdir()
+        (git_dir / "HEAD").write_text("0123456789abcdef0123456789abcdef01234567\n")
+        checkout = tmp_path / "checkout"
+        checkout.mkdir()
+        (checkout / ".git").write_text(f"gitdir: {git_dir}\n")
+
+        assert NimHandler._detect_git_branch(checkout) is None
+
+        (git_dir / "HEAD").write_text("ref: refs/heads/release\n")
+        assert NimHandler._detect_git_branch(checkout) == "release"
+
+    def test_construction_is_lazy(self, mocker, tmp_path):
+        """Test that constructing a handler runs no subprocess and opens no database."""
+        self._init_git_repo(tmp_path, "develop")
+        run = mocker.patch("mkdocstrings_handlers.nim.handler.subprocess.run")
+        detect = mocker.spy(NimHandler, "_detect_git_branch")
+
+        handler = NimHandler(
+            paths=["src"],
+            base_dir=tmp_path,
+            mdx=[],
+            mdx_config={},
+            config_options={"cache_dir": ".cache", "cache_backend": "sqlite"},
+        )
+
+        detect.assert_not_called()
+        assert handler.collector.store._connection is None
+        assert not (tmp_path / ".cache").exists()
+
+        assert handler.get_options({})["source_ref"] == "develop"
+        assert handler.get_options({})["source_ref"] == "develop"
+        detect.assert_called_once()
+        run.assert_not_called()
+
+    def test_docstring_parser_imported_lazily(self):
+        """Test that importing the handler does not import docstring_parser."""
+        import subprocess
+        import sys
+
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys, mkdocstrings_handlers.nim; print('docstring_parser' in sys.modules)",
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        assert result.stdout.strip() == "False"
+
     def test_source_ref_explicit_overrides_auto(self, tmp_path):
         """Test that explicit source_ref overrides auto-detection."""
         self._init_git_repo(tmp_path, "develop")
@@ -303,3 +369,283 @@ def test_type_field_doc_style_passed_to_render(tmp_path):
     assert options["type_field_doc_style"] == "docstring"
     # The actual rendering should not fail with this config
     assert result is not None
+
+
+class TestMarkdownMemo:
+    """Tests for memoized docstring Markdown conversion."""
+
+    def _make_handler(self, tmp_path):
+        from markdown import Markdown
+
+        handler = NimHandler(paths=["src"], base_dir=tmp_path, mdx=["toc"], mdx_config={})
+        handler._update_env(Markdown())
+        return handler
+
+    def test_identical_docstrings_converted_once(self, tmp_path, mocker):
+        """Test that identical docstrings in the same context are converted once."""
+        handler = self._make_handler(tmp_path)
+        spy = mocker.spy(handler.md, "convert")
+
+        first = handler.do_convert_markdown("Shared *doc*.", 3, "add")
+        second = handler.do_convert_markdown("Shared *doc*.", 3, "add")
+
+        assert first == second
+        assert "<em>doc</em>" in first
+        assert spy.call_count == 1
+
+    def test_heading_context_is_part_of_key(self, tmp_path, mocker):
+        """Test that heading level and id produce separate conversions."""
+        handler = self._make_handler(tmp_path)
+        spy = mocker.spy(handler.md, "convert")
+
+        handler.do_convert_markdown("Shared doc.", 3, "add")
+        handler.do_convert_markdown("Shared doc.", 4, "add")
+        handler.do_convert_markdown("Shared doc.", 3, "sub")
+
+        assert spy.call_count == 3
+
+    def test_new_markdown_instance_drops_memo(self, tmp_path):
+        """Test that the memo is reset when a new page's Markdown instance is installed."""
+        from markdown import Markdown
+
+        handler = self._make_handler(tmp_path)
+        handler.do_convert_markdown("Shared doc.", 3, "add")
+        assert len(handler._markdown_cache) == 1
+
+        handler._update_env(Markdown())
+        handler.do_convert_markdown("Other doc.", 3, "add")
+
+        assert list(handler._markdown_cache) == [("Other doc.", 3, "add", False, None)]
+
+    def test_headings_reported_on_hits(self, tmp_path):
+        """Test that a memoized conversion reports its headings again for the TOC."""
+        handler = self._make_handler(tmp_path)
+
+        handler.do_convert_markdown("# Usage\n\nShared doc.", 3, "add")
+        first = handler.get_headings()
+        handler.do_convert_markdown("# Usage\n\nShared doc.", 3, "add")
+        second = handler.get_headings()
+
+        assert [h.get("id") for h in first] == ["add--usage"]
+        assert [h.get("id") for h in second] == ["add--usage"]
+
+    def test_autoref_context_is_part_of_key(self, tmp_path, mocker):
+        """Test that conversions with an autoref hook are memoized per hook context."""
+        from mkdocs_autorefs import AutorefsHookInterface
+
+        class Hook(AutorefsHookInterface):
+            def __init__(self, origin):
+                self.origin = origin
+
+            def expand_identifier(self, identifier):
+                return identifier
+
+            def get_context(self):
+                return AutorefsHookInterface.Context("nim", "proc", self.origin, "a.nim", 1)
+
+        handler = self._make_handler(tmp_path)
+        spy = mocker.spy(handler.md, "convert")
+
+        handler.do_convert_markdown("Shared doc.", 3, "add", autoref_hook=Hook("mylib.add"))
+        handler.do_convert_markdown("Shared doc.", 3, "add", autoref_hook=Hook("mylib.add"))
+        handler.do_convert_markdown("Shared doc.", 3, "add", autoref_hook=Hook("other.add"))
+        handler.do_convert_markdown("Shared doc.", 3, "add")
+
+        assert spy.call_count == 3
+
+    def test_overloads_converted_once_when_rendering(self, tmp_path, mocker):
+        """Test that rendering a module converts a docstring shared by overloads once."""
+        handler = self._make_handler(tmp_path)
+        handler.env.filters["heading"] = lambda text, level, **kwargs: (
+            f'<h{level} id="{kwargs.get("id", "")}">{text}</h{level}>'
+        )
+        module = NimModule(
+            module="vec",
+            file="src/vec.nim",
+            doc="Vectors.",
+            entries=[
+                NimEntry(name="add", kind="proc", line=i, signature="", doc="Adds vectors.")
+                for i in range(1, 4)
+            ]
+            + [NimEntry(name="sub", kind="proc", line=5, signature="", doc="Subtracts.")],
+        )
+        spy = mocker.spy(handler.md, "convert")
+
+        options = handler.get_options({})
+        result = handler.render(handler._prepare_module(module, options), options)
+
+        assert result.count("Adds vectors.") == 3
+        assert spy.call_count == 3  # module doc, "add" overloads, "sub"
+
+
+class TestCacheDir:
+    """Tests for the cache_dir option."""
+
+    def test_relative_to_base_dir(self, tmp_path):
+        """Test that cache_dir is resolved against the project directory."""
+        handler = NimHandler(
+            paths=["src"],
+            base_dir=tmp_path,
+            config_options={"cache_dir": ".cache/nim"},
+            mdx=[],
+            mdx_config={},
+        )
+
+        assert handler.collector.store is not None
+        assert handler.collector.store.root == tmp_path / ".cache/nim"
+
+    def test_default_is_project_local(self, tmp_path):
+        """Test that the cache defaults to .cache/mkdocstrings-nim in the project directory."""
+        handler = NimHandler(paths=["src"], base_dir=tmp_path, mdx=[], mdx_config={})
+
+        assert handler.collector.store is not None
+        assert handler.collector.store.root == tmp_path / ".cache/mkdocstrings-nim"
+        assert handler.collector.nimcache == tmp_path / ".cache/mkdocstrings-nim/nimcache"
+
+    def test_nimcache_follows_cache_dir(self, tmp_path):
+        """Test that the semantic backend's nimcache lives in the configured cache directory."""
+        handler = NimHandler(
+            paths=["src"],
+            base_dir=tmp_path,
+            config_options={"cache_dir": "build/cache"},
+            mdx=[],
+            mdx_config={},
+        )
+
+        assert handler.collector.nimcache == tmp_path / "build/cache/nimcache"
+
+    def test_disabled(self, tmp_path):
+        """Test that cache_dir: false turns the persistent store off."""
+        handler = NimHandler(
+            paths=["src"],
+            base_dir=tmp_path,
+            config_options={"cache_dir": False},
+            mdx=[],
+            mdx_config={},
+        )
+
+        assert handler.collector.store is None
+
+
+class TestPrepareModule:
+    """Tests for turning collected modules into renderable ones."""
+
+    def _module(self):
+        return NimModule(
+            module="m",
+            file="src/m.nim",
+            entries=[
+                NimEntry(
+                    name="a",
+                    kind="proc",
+                    line=1,
+                    signature="proc a*(x: int): int",
+                    doc="Do a.\n\nArgs:\n    x: The x\n\nReturns:\n    The a",
+                    params=[NimParam(name="x", type="int")],
+                ),
+                NimEntry(
+                    name="b",
+                    kind="proc",
+                    line=2,
+                    signature="proc b*(y: int)",
+                    doc="Do b.\n\nArgs:\n    y: The y",
+                    params=[NimParam(name="y", type="int")],
+                ),
+                NimEntry(name="c", kind="proc", line=3, signature="proc c()", exported=False),
+            ],
+        )
+
+    def _handler(self, tmp_path, **options):
+        return NimHandler(
+            paths=["src"],
+            base_dir=tmp_path,
+            config_options={"cache_dir": False, **options},
+            mdx=[],
+            mdx_config={},
+        )
+
+    def test_collected_module_unchanged(self, tmp_path):
+        """Test that preparing a module twice gives the same result."""
+        handler = self._handler(tmp_path, docstring_style="google")
+        module = self._module()
+        options = handler.get_options({})
+
+        first = handler._prepare_module(module, options)
+        second = handler._prepare_module(module, options)
+
+        assert first == second
+        assert [e.name for e in first.entries] == ["a", "b"]
+        assert first.entries[0].doc == "Do a."
+        assert first.entries[0].params[0].description == "The x"
+        assert module.entries[0].doc.startswith("Do a.\n\nArgs:")
+        assert module.entries[0].params[0].description == ""
+
+    def test_auto_style_inferred_once(self, mocker, tmp_path):
+        """Test that docstring_style auto infers one style per module and reuses it."""
+        from mkdocstrings_handlers.nim import handler as handler_module
+
+        handler = self._handler(tmp_path, docstring_style="auto")
+        infer = mocker.spy(handler_module, "infer_docstring_style")
+        parse = mocker.spy(handler_module, "parse_docstring")
+        module = self._module()
+        options = handler.get_options({})
+
+        handler._prepare_module(module, options)
+        prepared = handler._prepare_module(module, options)
+
+        infer.assert_called_once()
+        assert module.docstring_style == "google"
+        assert module.misdetected_docstrings == 0
+        assert {call.args[1] for call in parse.call_args_list} == {DocstringStyle.GOOGLE}
+        assert prepared.entries[0].returns_doc == "The a"
+
+    def test_auto_style_failure_is_misdetection(self, mocker, tmp_path):
+        """Test that a docstring failing in the inferred style is kept as text, not re-detected."""
+        import docstring_parser
+
+        handler = self._handler(tmp_path, docstring_style="auto")
+        module = self._module()
+        module.entries[1].doc = "Do b.\n\nArgs:\n    y\n"
+        parse = mocker.spy(docstring_parser, "parse")
+
+        prepared = handler._prepare_module(module, handler.get_options({}))
+
+        assert module.docstring_style == "google"
+        assert all(call.kwargs.get("style") for call in parse.call_args_list)
+        assert prepared.entries[1].doc == "Do b.\n\nArgs:\n    y"
+        assert prepared.entries[1].params[0].description == ""
+        assert prepared.entries[0].doc == "Do a."
+        assert prepared.misdetected_docstrings == 1
+        assert module.misdetected_docstrings == 0
+
+    def test_native_docstrings_used_when_style_matches(self, mocker, tmp_path):
+        """Test that docstrings parsed by nimdocinfo are not parsed again in the same style."""
+        from mkdocstrings_handlers.nim import handler as handler_module
+        from mkdocstrings_handlers.nim.docstring import ParamDoc, ParsedDocstring
+
+        module = self._module()
+        module.entries[0] = replace(
+            module.entries[0],
+            parsed_doc=ParsedDocstring(description="Do a.", params=[ParamDoc("x", "The x")]),
+            parsed_doc_style="google",
+        )
+        module.entries[1] = replace(
+            module.entries[1],
+            doc="Do b.",
+            parsed_doc=ParsedDocstring(description="Do b."),
+            parsed_doc_style="",
+        )
+        parse = mocker.spy(handler_module, "parse_docstring")
+
+        handler = self._handler(tmp_path, docstring_style="google")
+        prepared = handler._prepare_module(module, handler.get_options({}))
+
+        parse.assert_not_called()
+        assert prepared.entries[0].doc == "Do a."
+        assert prepared.entries[0].params[0].description == "The x"
+        assert prepared.entries[1].doc == "Do b."
+
+        handler = self._handler(tmp_path, docstring_style="rst")
+        handler._prepare_module(module, handler.get_options({}))
+
+        assert [call.args[0] for call in parse.call_args_list] == [module.entries[0].doc]
@@ -0,0 +1,91 @@
+"""Tests for cross-process locking of nimdocinfo compilation."""
+
+import multiprocessing
+import os
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+
+from mkdocstrings_handlers.nim import collector as collector_module
+from mkdocstrings_handlers.nim.collector import NimCollector
+from mkdocstrings_handlers.nim.lock import FileLock
+
+
+class TestFileLock:
+    """Tests for FileLock."""
+
+    def test_exclusive(self, tmp_path):
+        """Test that a held lock cannot be acquired again until released."""
+        path = tmp_path / "x.lock"
+        with FileLock(path, timeout=1), pytest.raises(TimeoutError):
+            FileLock(path, timeout=0.2, poll_interval=0.05).acquire()
+        with FileLock(path, timeout=0.2):
+            assert path.exists()
+        assert not path.exists()
+
+    def test_dead_holder_recovered(self, tmp_path):
+        """Test that a lock left by a process that died is taken over."""
+        path = tmp_path / "x.lock"
+        dead = subprocess.Popen(["true"])
+        dead.wait()
+        lock = FileLock(path, timeout=1)
+        path.write_text(f"{lock._host}\n{dead.pid}\n{time.time()}\n")
+
+        with lock:
+            assert path.read_text().split()[1] == str(os.getpid())
+
+    def test_old_lock_recovered(self, tmp_path):
+        """Test that a lock older than stale_after is taken over, whoever holds it."""
+        path = tmp_path / "x.lock"
+        path.write_text(f"other-host\n1\n{time.time() - 3600}\n")
+
+        with FileLock(path, timeout=1, stale_after=60):
+            assert path.read_text().split()[1] == str(os.getpid())
+
+
+def _fake_nim(command, **_kwargs):
+    """Pretend to compile nimdocinfo, slowly, logging each compile."""
+    outdir = Path(next(arg for arg in command if arg.startswith("--outdir:"))[len("--outdir:") :])
+    with open(outdir.parent / "compiles.log", "a") as f:
+        f.write("x")
+    time.sleep(0.5)
+    (outdir / "nimdocinfo").write_text("binary")
+    return subprocess.CompletedProcess(command, 0, "", "")
+
+
+def _ensure_compiled(cache_dir):
+    collector_module._CACHE_DIR = cache_dir
+    collector_module.subprocess.run = _fake_nim
+    NimCollector([], cache_dir)._ensure_nimdocinfo_compiled()
+
+
+class TestCompileLock:
+    """Tests for compiling nimdocinfo once across processes."""
+
+    def test_concurrent_processes_compile_once(self, tmp_path):
+        """Test that processes racing on a cold cache share one compile."""
+        processes = [
+            multiprocessing.Process(target=_ensure_compiled, args=(tmp_path,)) for _ in range(4)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(30)
+
+        assert [p.exitcode for p in processes] == [0, 0, 0, 0]
+        assert (tmp_path / "compiles.log").read_text() == "x"
+        assert (tmp_path / "nimdocinfo").read_text() == "binary"
+        assert not (tmp_path / "nimdocinfo.lock").exists()
+
+    def test_lock_timeout_compiles_anyway(self, mocker, tmp_path, monkeypatch):
+        """Test that a stuck lock does not stop compilation."""
+        monkeypatch.setattr(collector_module, "_CACHE_DIR", tmp_path)
+        monkeypatch.setattr(collector_module, "_COMPILE_TIMEOUT", -30)
+        mocker.patch.object(collector_module.subprocess, "run", side_effect=_fake_nim)
+        (tmp_path / "nimdocinfo.lock").write_text(f"host\n{os.getpid()}\n{time.time()}\n")
+
+        binary = NimCollector([], tmp_path)._ensure_nimdocinfo_compiled()
+
+        assert binary.read_text() == "binary"
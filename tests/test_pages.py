@@ -0,0 +1,137 @@
+"""Tests for splitting modules across pages."""
+
+import logging
+
+import pytest
+
+from mkdocstrings_handlers.nim.collector import NimEntry, NimModule
+from mkdocstrings_handlers.nim.handler import NimHandler
+from mkdocstrings_handlers.nim.pages import module_pages, page_name
+
+
+def _entry(name, kind="proc", **kwargs):
+    return NimEntry(name=name, kind=kind, line=1, signature="", doc=f"Doc of {name}.", **kwargs)
+
+
+MODULE = NimModule(
+    module="big",
+    file="src/big.nim",
+    doc="A big module.",
+    entries=[
+        _entry("Matrix", "type"),
+        _entry("add"),
+        _entry("apply", "iterator"),
+        _entry("benchmark", "template"),
+        _entry("MAX", "const"),
+        _entry("_hidden", exported=False),
+    ],
+)
+
+
+@pytest.fixture
+def handler(tmp_path):
+    """Create a handler rendering without a Markdown pipeline."""
+    handler = NimHandler(paths=["src"], base_dir=tmp_path, mdx=[], mdx_config={})
+    handler.env.filters["convert_markdown"] = lambda text, *_args, **_kwargs: text
+    handler.env.filters["heading"] = lambda text, level, **kwargs: (
+        f'<h{level} id="{kwargs.get("id", "")}">{text}</h{level}>'
+    )
+    return handler
+
+
+def _render(handler, **local_options):
+    options = handler.get_options(local_options)
+    return handler.render(handler._prepare_module(MODULE, options), options)
+
+
+class TestModulePages:
+    """Tests for assigning entries to pages."""
+
+    def test_by_kind(self):
+        """Test that kinds are grouped in a fixed order, with unknown kinds last."""
+        entries = [*MODULE.entries, _entry("x", "unknown")]
+
+        pages = module_pages("big", entries, "kind")
+
+        assert [(p.name, p.entries) for p in pages] == [
+            ("types", 1),
+            ("procs", 3),
+            ("templates", 1),
+            ("consts", 1),
+            ("other", 1),
+        ]
+        assert pages[1].title == "Procs"
+        assert pages[1].html_id == "big--procs"
+
+    def test_by_initial(self):
+        """Test that initials are case-insensitive and non-letters go to the other page."""
+        assert page_name(_entry("Matrix"), "alpha") == "m"
+        assert page_name(_entry("_hidden"), "alpha") == "other"
+
+        pages = module_pages("big", MODULE.entries, "alpha")
+
+        assert [(p.name, p.title) for p in pages] == [
+            ("a", "A"),
+            ("b", "B"),
+            ("m", "M"),
+            ("other", "Other"),
+        ]
+
+
+class TestSplitRendering:
+    """Tests for rendering the index and pages of a split module."""
+
+    def test_unsplit_by_default(self, handler):
+        """Test that every entry renders on one page without split_by."""
+        result = _render(handler)
+
+        assert 'id="big"' in result
+        assert "add" in result
+        assert "MAX" in result
+
+    def test_index(self, handler):
+        """Test that the index has the module doc and links to each page, but no entries."""
+        result = _render(handler, split_by="kind")
+
+        assert 'id="big"' in result
+        assert "A big module." in result
+        assert '<autoref identifier="big--procs" optional>Procs</autoref>' in result
+        assert "<small>(2)</small>" in result  # _hidden is not exported
+        assert "Doc of add." not in result
+
+    def test_page(self, handler):
+        """Test that a page renders its entries under its own heading, keeping entry anchors."""
+        result = _render(handler, split_by="kind", page="procs")
+
+        assert 'id="big--procs"' in result
+        assert 'id="big"' not in result
+        assert "A big module." not in result
+        assert 'id="add"' in result
+        assert 'id="apply"' in result
+        assert "Matrix" not in result
+
+    def test_page_docstrings_only(self, handler, mocker):
+        """Test that only the page's docstrings are parsed."""
+        parse = mocker.spy(handler, "_parse_entry_docstring")
+
+        _render(handler, split_by="alpha", page="m")
+
+        assert [call.args[0].name for call in parse.call_args_list] == ["Matrix", "MAX"]
+
+    def test_empty_page(self, handler):
+        """Test that a page no entry belongs to still renders its heading."""
+        result = _render(handler, split_by="alpha", page="z")
+
+        assert 'id="big--z"' in result
+        assert "Doc of" not in result
+
+    def test_invalid_options(self, handler, caplog):
+        """Test that invalid split options fall back with a warning."""
+        with caplog.at_level(logging.WARNING):
+            assert handler.get_options({"split_by": "size"})["split_by"] is None
+            assert handler.get_options({"page": "procs"})["page"] is None
+            assert handler.get_options({"split_by": "kind", "page": "a"})["page"] is None
+
+        assert "unknown split_by 'size'" in caplog.text
+        assert "ignored without split_by" in caplog.text
+        assert "not a page of split_by: kind" in caplog.text
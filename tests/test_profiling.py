@@ -0,0 +1,76 @@
+"""Tests for per-identifier profiling."""
+
+import pstats
+
+from mkdocstrings_handlers.nim import profiling
+from mkdocstrings_handlers.nim.handler import NimHandler
+
+
+def _busy(n):
+    return sum(i * i for i in range(n))
+
+
+class TestProfiler:
+    """Tests for Profiler."""
+
+    def test_profiles_and_summary(self, tmp_path):
+        """Test that each identifier gets a profile and the slowest come first."""
+        profiler = profiling.Profiler(tmp_path / "prof", top=5)
+        with profiler.profile("fast"):
+            _busy(10)
+        with profiler.profile("pkg.*"):
+            _busy(200_000)
+        with profiler.profile("fast"):
+            _busy(10)
+
+        summary = profiler.write()
+
+        assert sorted(p.name for p in (tmp_path / "prof").iterdir()) == [
+            "fast.prof",
+            "pkg._.prof",
+            "summary.txt",
+        ]
+        modules = summary.splitlines()[1:3]
+        assert modules[0].endswith("pkg.*")
+        assert modules[1].endswith("fast")
+        assert "_busy" in summary
+        stats = pstats.Stats(str(tmp_path / "prof" / "fast.prof"))
+        assert any(func[2] == "_busy" and stat[0] == 2 for func, stat in stats.stats.items())
+
+    def test_nothing_profiled(self, tmp_path):
+        """Test that nothing is written if nothing was profiled."""
+        assert profiling.Profiler(tmp_path / "prof").write() == ""
+        assert not (tmp_path / "prof").exists()
+
+
+class TestHandlerProfiling:
+    """Tests for profiling through the handler."""
+
+    def test_collect_and_render_profiled_per_identifier(self, tmp_path, mocker, monkeypatch):
+        """Test that rendering is profiled under the identifier it was collected for."""
+        monkeypatch.delenv(profiling.PROFILE_ENV_VAR, raising=False)
+        (tmp_path / "src" / "pkg").mkdir(parents=True)
+        (tmp_path / "src" / "pkg" / "m.nim").write_text("proc m*() = discard\n")
+        handler = NimHandler(
+            paths=["src"],
+            base_dir=tmp_path,
+            config_options={"cache_dir": False, "profile_dir": "prof"},
+            mdx=[],
+            mdx_config={},
+        )
+        mocker.patch.object(
+            handler.collector,
+            "_run_nimdocinfo",
+            return_value={"module": "m", "file": "src/pkg/m.nim", "entries": []},
+        )
+        render = mocker.patch.object(handler.env, "get_template")
+        options = handler.get_options({})
+
+        handler.render(handler.collect("pkg.m", options), options)
+        handler.teardown()
+
+        render.assert_called_once()
+        assert sorted(p.name for p in (tmp_path / "prof").iterdir()) == [
+            "pkg.m.prof",
+            "summary.txt",
+        ]
@@ -0,0 +1,278 @@
+"""Tests for the semantic (nim jsondoc) extraction backend."""
+
+import json
+from pathlib import Path
+
+import pytest
+from mkdocstrings import CollectionError
+
+from mkdocstrings_handlers.nim import semantic
+from mkdocstrings_handlers.nim.collector import NimCollector
+
+
+def _entry(name: str, line: int, **kwargs) -> dict:
+    return {"name": name, "kind": "proc", "line": line, "signature": f"proc {name}()", **kwargs}
+
+
+def _entries(*entries: dict) -> list:
+    return NimCollector([], Path())._parse_entries(list(entries))
+
+
+def _jsondoc_item(name: str, line: int, returns: str = "", pragmas=(), kind: str = "skProc"):
+    return {
+        "name": name,
+        "type": kind,
+        "line": line,
+        "code": f"proc {name}*()",
+        "description": f"<p>{name} doc</p>",
+        "signature": {"return": returns, "arguments": [], "pragmas": list(pragmas)},
+    }
+
+
+def _module_json(name: str, directory: Path, entries: list) -> dict:
+    return {"module": name, "file": str(directory / f"{name}.nim"), "entries": entries}
+
+
+class TestOverlay:
+    """Tests for merging jsondoc output into nimdocinfo output."""
+
+    def test_resolves_auto_return_type(self):
+        """Test that `auto` and missing return types take the compiler's type."""
+        entries = _entries(_entry("a", 1, returns="auto"), _entry("b", 2, returns="int"))
+        jsondoc = {"entries": [_jsondoc_item("a", 1, "seq[int]"), _jsondoc_item("b", 2, "int")]}
+
+        semantic.overlay(entries, jsondoc)
+
+        assert entries[0].returns == "seq[int]"
+        assert entries[1].returns == "int"
+
+    def test_inferred_raises_only_when_undeclared(self):
+        """Test that inferred raises fill in, but never replace, declared ones."""
+        entries = _entries(_entry("a", 1), _entry("b", 2, raises=["IOError"]))
+        pragmas = ["raises: [ValueError, KeyError]", "tags: []"]
+        jsondoc = {"entries": [_jsondoc_item("a", 1, pragmas=pragmas), _jsondoc_item("b", 2)]}
+
+        semantic.overlay(entries, jsondoc)
+
+        assert entries[0].raises == ["ValueError", "KeyError"]
+        assert entries[1].raises == ["IOError"]
+
+    def test_overloads_matched_by_line(self):
+        """Test that overloads are matched to the compiler's entries by line."""
+        entries = _entries(_entry("f", 1, returns="auto"), _entry("f", 5, returns="auto"))
+        jsondoc = {"entries": [_jsondoc_item("f", 5, "string"), _jsondoc_item("f", 1, "int")]}
+
+        semantic.overlay(entries, jsondoc)
+
+        assert [e.returns for e in entries] == ["int", "string"]
+
+    def test_generated_routines_returned(self):
+        """Test that routines generated by templates or macros become entries."""
+        entries = _entries(_entry("a", 1), _entry("c", 9))
+        jsondoc = {
+            "entries": [
+                _jsondoc_item("a", 1),
+                _jsondoc_item("generated", 4, "int", kind="skFunc"),
+                {"name": "T", "type": "skType", "line": 6},
+            ]
+        }
+
+        [generated] = semantic.overlay(entries, jsondoc)
+
+        assert [e.name for e in entries] == ["a", "c"]
+        assert generated["name"] == "generated"
+        assert generated["kind"] == "func"
+        assert generated["returns"] == "int"
+        assert generated["doc"] == "generated doc"
+        assert generated["exported"] is True
+
+    def test_included_routines_not_generated(self):
+        """Test that routines of included files, listed by jsondoc too, are not added again."""
+        entries = _entries(_entry("a", 1), _entry("helper", 3, returns="auto"))
+        entries[1].file = "src/private/shared.nim"
+        jsondoc = {"entries": [_jsondoc_item("a", 1), _jsondoc_item("helper", 3, "int")]}
+
+        assert semantic.overlay(entries, jsondoc) == []
+        assert entries[1].returns == "int"
+
+    def test_generated_routine_visibility_and_doc(self):
+        """Test that private generated routines stay private and raw docs are preferred."""
+        private = {**_jsondoc_item("helper", 2), "code": "proc helper(x: int)"}
+        operator = {
+            **_jsondoc_item("+", 3),
+            "code": "proc `+`*(a, b: V): V",
+            "rawDescription": "Adds *vectors*.",
+        }
+
+        generated = semantic.overlay([], {"entries": [private, operator]})
+
+        assert [(e["name"], e["exported"]) for e in generated] == [("helper", False), ("+", True)]
+        assert generated[1]["doc"] == "Adds *vectors*."
+
+
+class TestRunJsondoc:
+    """Tests for running the compiler and reusing its output."""
+
+    @pytest.fixture
+    def source(self, tmp_path):
+        path = tmp_path / "m.nim"
+        path.write_text("proc a*(): auto = 1\n")
+        return path
+
+    def _fake_nim(self, mocker, returncode=0):
+        def run(command, **_kwargs):
+            out = next(arg for arg in command if arg.startswith("--out:"))[len("--out:") :]
+            if returncode == 0:
+                Path(out).write_text(json.dumps({"entries": [_jsondoc_item("a", 1, "int")]}))
+            return mocker.Mock(returncode=returncode, stderr="Error: boom")
+
+        return mocker.patch("subprocess.run", side_effect=run)
+
+    def test_output_reused_until_inputs_change(self, mocker, tmp_path, source):
+        """Test that warm runs reuse the jsondoc output kept in the nimcache."""
+        run = self._fake_nim(mocker)
+        kwargs = {"nimcache": tmp_path / "cache", "search_paths": [tmp_path], "timeout": 5}
+
+        first = semantic.run_jsondoc(source, inputs_key="a", **kwargs)
+        second = semantic.run_jsondoc(source, inputs_key="a", **kwargs)
+        assert first == second
+        assert run.call_count == 1
+        command = run.call_args.args[0]
+        assert command[:2] == ["nim", "jsondoc"]
+        assert f"--nimcache:{tmp_path / 'cache'}" in command
+
+        semantic.run_jsondoc(source, inputs_key="b", **kwargs)
+        assert run.call_count == 2
+
+    def test_failure_raises(self, mocker, tmp_path, source):
+        """Test that a module that fails to compile raises CollectionError."""
+        self._fake_nim(mocker, returncode=1)
+
+        with pytest.raises(CollectionError, match="nim jsondoc failed"):
+            semantic.run_jsondoc(
+                source, nimcache=tmp_path, search_paths=[], timeout=5, inputs_key="a"
+            )
+
+
+class TestCollectorBackend:
+    """Tests for the collector's backend option."""
+
+    def _collector(self, mocker, tmp_path, backend):
+        src = tmp_path / "src"
+        src.mkdir()
+        path = src / "m.nim"
+        path.write_text("")
+        collector = NimCollector(["src"], tmp_path, backend=backend)
+        output = {"module": "m", "file": str(path), "entries": [_entry("a", 1, returns="auto")]}
+        mocker.patch.object(collector, "_run_nimdocinfo", return_value=output)
+        mocker.patch.object(semantic, "compiler_version", return_value="Nim Compiler 2.2.0")
+        return collector
+
+    def test_semantic_backend_overlays(self, mocker, tmp_path):
+        """Test that the semantic backend resolves types through jsondoc."""
+        collector = self._collector(mocker, tmp_path, "semantic")
+        mocker.patch.object(
+            semantic, "run_jsondoc", return_value={"entries": [_jsondoc_item("a", 1, "int")]}
+        )
+
+        assert collector.collect("m").entries[0].returns == "int"
+
+    def test_included_routines_documented_once(self, mocker, tmp_path):
+        """Test that routines of an included file are not added again, nor the file compiled."""
+        src = tmp_path / "src"
+        (src / "private").mkdir(parents=True)
+        (src / "m.nim").write_text("include private/shared\n")
+        (src / "private" / "shared.nim").write_text("proc helper*() = discard\n")
+        outputs = {
+            "m": {
+                **_module_json("m", src, [_entry("a", 1), _entry("b", 9)]),
+                "includes": [{"path": "private/shared", "line": 2}],
+            },
+            "shared": _module_json("shared", src / "private", [_entry("helper", 1)]),
+        }
+        collector = NimCollector(["src"], tmp_path, backend="semantic")
+        mocker.patch.object(collector, "_run_nimdocinfo", side_effect=lambda p: outputs[p.stem])
+        mocker.patch.object(semantic, "compiler_version", return_value="Nim Compiler 2.2.0")
+        jsondoc = {
+            "entries": [
+                _jsondoc_item("a", 1),
+                _jsondoc_item("helper", 1, "int"),
+                _jsondoc_item("generated", 5),
+                _jsondoc_item("b", 9),
+            ]
+        }
+        run = mocker.patch.object(semantic, "run_jsondoc", return_value=jsondoc)
+
+        module = collector.collect("m")
+
+        assert [e.name for e in module.entries] == ["a", "helper", "generated", "b"]
+        assert module.entries[1].returns == "int"
+        assert [call.args[0].name for call in run.call_args_list] == ["m.nim"]
+        assert run.call_args.kwargs["nimcache"] == tmp_path / ".cache/mkdocstrings-nim/nimcache"
+
+    def test_ast_backend_skips_compiler(self, mocker, tmp_path):
+        """Test that the default backend never runs the compiler."""
+        collector = self._collector(mocker, tmp_path, "ast")
+        run = mocker.patch.object(semantic, "run_jsondoc")
+
+        assert collector.collect("m").entries[0].returns == "auto"
+        run.assert_not_called()
+
+    def test_compile_failure_falls_back_to_ast(self, mocker, tmp_path):
+        """Test that modules the compiler rejects are still documented."""
+        collector = self._collector(mocker, tmp_path, "semantic")
+        mocker.patch.object(semantic, "run_jsondoc", side_effect=CollectionError("boom"))
+
+        assert collector.collect("m").entries[0].returns == "auto"
+
+    def test_imported_module_change_refreshes(self, mocker, tmp_path):
+        """Test that editing an imported project module invalidates the compiler's output."""
+        src = tmp_path / "src"
+        src.mkdir()
+        (src / "m.nim").write_text("import dep\n")
+        dep = src / "dep.nim"
+        dep.write_text("template gen*() = discard\n")
+        (src / "other.nim").write_text("")
+        collector = NimCollector(["src"], tmp_path, backend="semantic")
+
+        def nimdocinfo(path):
+            imports = [{"path": "dep"}] if path.stem == "m" else []
+            return {"module": path.stem, "file": str(path), "entries": [], "imports": imports}
+
+        mocker.patch.object(collector, "_run_nimdocinfo", side_effect=nimdocinfo)
+        version = mocker.patch.object(semantic, "compiler_version", return_value="Nim 2.2.0")
+        run = mocker.patch.object(semantic, "run_jsondoc", return_value={"entries": []})
+        m = (src / "m.nim").resolve()
+
+        collector._jsondoc(m)
+        collector._jsondoc(m)
+        first_key = run.call_args.kwargs["inputs_key"]
+        assert run.call_count == 1
+
+        (src / "other.nim").write_text("proc x*() = discard\n")
+        collector._jsondoc(m)
+        assert run.call_count == 1
+
+        dep.write_text("template gen*() = echo 1\n")
+        collector._jsondoc(m)
+        assert run.call_count == 2
+        assert run.call_args.kwargs["inputs_key"] != first_key
+        assert version.call_count == 1
+
+    def test_missing_compiler_not_remembered(self, mocker, tmp_path):
+        """Test that a missing compiler falls back to the AST until it is installed."""
+        collector = self._collector(mocker, tmp_path, "semantic")
+        mocker.patch.object(
+            semantic, "compiler_version", side_effect=CollectionError("Nim compiler not found")
+        )
+        run = mocker.patch.object(
+            semantic, "run_jsondoc", return_value={"entries": [_jsondoc_item("a", 1, "int")]}
+        )
+        path = (tmp_path / "src" / "m.nim").resolve()
+
+        assert collector._jsondoc(path) is None
+        run.assert_not_called()
+
+        semantic.compiler_version.side_effect = None
+        semantic.compiler_version.return_value = "Nim Compiler 2.2.0"
+        assert collector._jsondoc(path) == run.return_value
@@ -191,3 +191,207 @@ type NodeKind* = enum
         assert ">nkString<" in result
         # Should not show "= <code>" for implicit values
         assert "= <code></code>" not in result
+
+
+class TestPackageRendering:
+    """Tests for rendering wildcard (multi-module) identifiers."""
+
+    def test_package_renders_each_module_once_with_single_attribution(self, handler):
+        """Test that every module renders and the attribution footer appears once."""
+        from mkdocstrings_handlers.nim.collector import NimEntry, NimModule, NimPackage
+
+        package = NimPackage(
+            name="pkg.*",
+            modules=[
+                NimModule(
+                    module=name,
+                    file=f"src/pkg/{name}.nim",
+                    doc=f"Module {name}.",
+                    entries=[NimEntry(name=f"{name}Proc", kind="proc", line=1, signature="")],
+                )
+                for name in ("a", "b")
+            ],
+        )
+
+        result = handler.render(package, handler.get_options({}))
+
+        assert 'id="a"' in result
+        assert 'id="b"' in result
+        assert "aProc" in result
+        assert "bProc" in result
+        assert result.count("Generated with") == 1
+
+
+class TestSourceLocation:
+    """Tests for source location links."""
+
+    def test_included_entry_links_to_its_own_file(self, handler):
+        """Test that entries from included files link to that file, not the module."""
+        from mkdocstrings_handlers.nim.collector import NimEntry, NimModule
+
+        module = NimModule(
+            module="facade",
+            file="src/facade.nim",
+            entries=[
+                NimEntry(name="local", kind="proc", line=3, signature=""),
+                NimEntry(
+                    name="helper",
+                    kind="proc",
+                    line=7,
+                    signature="",
+                    file="src/private/impl.nim",
+                ),
+            ],
+        )
+
+        result = handler.render(module, handler.get_options({}))
+
+        assert "src/facade.nim:3" in result
+        assert "src/private/impl.nim:7" in result
+        assert "src/facade.nim:7" not in result
+
+
+class TestReexportRendering:
+    """Tests for rendering re-exported symbols."""
+
+    def _module(self):
+        from mkdocstrings_handlers.nim.collector import NimEntry, NimModule
+
+        return NimModule(
+            module="lib",
+            file="src/lib.nim",
+            entries=[NimEntry(name="own", kind="proc", line=1, signature="")],
+            reexports=[
+                NimEntry(name="helper", kind="proc", line=4, signature="", file="src/lib/utils.nim")
+            ],
+        )
+
+    def test_reexports_rendered_by_default(self, handler):
+        """Test that re-exported symbols render after the module's own, with their source."""
+        result = handler.render(self._module(), handler.get_options({}))
+
+        assert result.index("own") < result.index("helper")
+        assert "src/lib/utils.nim:4" in result
+
+    def test_reexports_hidden(self, handler):
+        """Test that show_reexports: false leaves re-exported symbols out."""
+        result = handler.render(self._module(), handler.get_options({"show_reexports": False}))
+
+        assert "own" in result
+        assert "helper" not in result
+
+
+class TestSummaryRendering:
+    """Tests for summary-only rendering."""
+
+    def _module(self):
+        from mkdocstrings_handlers.nim.collector import NimEntry, NimModule, NimParam
+
+        return NimModule(
+            module="geo",
+            file="src/geo.nim",
+            doc="Geometry.\n\nLong description.",
+            entries=[
+                NimEntry(
+                    name="area",
+                    kind="proc",
+                    line=3,
+                    signature="proc area*(s: Shape): float",
+                    doc="Area of a shape.\n\n:param s: The shape",
+                    params=[NimParam(name="s", type="Shape")],
+                ),
+                NimEntry(name="Shape", kind="type", line=1, signature="", doc="A shape."),
+                NimEntry(name="PI2", kind="const", line=2, signature="", doc="Two pi."),
+            ],
+        )
+
+    def test_table_without_bodies(self, handler, mocker):
+        """Test that symbols are listed with one-line docs, without parsing or converting."""
+        parse = mocker.spy(handler, "_parse_entry_docstring")
+        convert = mocker.Mock(side_effect=lambda text, *_args, **_kwargs: text)
+        handler.env.filters["convert_markdown"] = convert
+        options = handler.get_options({"summary_only": True})
+
+        result = handler.render(handler._prepare_module(self._module(), options), options)
+
+        assert 'id="geo--summary"' in result
+        assert "Geometry." in result
+        assert "Long description." not in result
+        assert '<autoref identifier="area" optional hover>area</autoref>' in result
+        assert "<td>Area of a shape.</td>" in result
+        assert result.index("Shape") < result.index("area") < result.index("PI2")
+        assert "doc-section-parameters" not in result
+        assert "doc-source" not in result
+        parse.assert_not_called()
+        convert.assert_not_called()
+
+    def test_package(self, handler):
+        """Test that a package summary lists its modules, then each module's symbols."""
+        from mkdocstrings_handlers.nim.collector import NimPackage
+
+        options = handler.get_options({"summary_only": True})
+        module = handler._prepare_module(self._module(), options)
+
+        result = handler.render(NimPackage(name="*", modules=[module]), options)
+
+        assert '<autoref identifier="geo" optional hover>geo</autoref>' in result
+        assert 'id="geo--summary"' in result
+        assert "<td>Two pi.</td>" in result
+        assert result.count("Generated with") == 1
+
+
+class TestOverloadGrouping:
+    """Tests for rendering overloads as one block."""
+
+    def _module(self):
+        from mkdocstrings_handlers.nim.collector import NimEntry, NimModule
+
+        def overload(signature, doc, line):
+            return NimEntry(
+                name="+", kind="proc", line=line, signature=signature, doc=doc, pragmas=["inline"]
+            )
+
+        return NimModule(
+            module="vec",
+            file="src/vec.nim",
+            entries=[
+                overload("proc +(a, b: Vec2): Vec2", "Adds vectors.", 1),
+                NimEntry(name="Vec2", kind="type", line=2, signature=""),
+                overload("proc +(a, b: Vec3): Vec3", "Adds vectors.", 3),
+                overload("proc +(a: Vec3; s: float): Vec3", "Adds a scalar.", 4),
+                NimEntry(name="+", kind="template", line=5, signature="template +(a: Vec4)"),
+            ],
+        )
+
+    def _render(self, handler, **local_options):
+        options = handler.get_options(local_options)
+        return handler.render(handler._prepare_module(self._module(), options), options)
+
+    def test_separate_by_default(self, handler):
+        """Test that each overload has its own heading without group_overloads."""
+        result = self._render(handler)
+
+        assert result.count('id="+"') == 4
+        assert result.count("Adds vectors.") == 2
+
+    def test_grouped(self, handler):
+        """Test that overloads share one heading and shared docs render once."""
+        result = self._render(handler, group_overloads=True)
+
+        # One heading per (kind, name): the procs, and the template
+        assert result.count('id="+"') == 2
+        assert result.count("doc-overloads") == 1
+        assert result.index("Vec2):") < result.index("Vec3):") < result.index("Vec2</span>")
+        assert result.count("Adds vectors.") == 1
+        assert result.count("Adds a scalar.") == 1
+        assert "src/vec.nim:4" in result
+        assert result.count('data-label="inline"') == 3
+
+    def test_cached_module_unchanged(self, handler):
+        """Test that grouping leaves the collected entries alone."""
+        module = self._module()
+        options = handler.get_options({"group_overloads": True})
+
+        handler._prepare_module(module, options)
+
+        assert [e.overloads for e in module.entries] == [[]] * 5
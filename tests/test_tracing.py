@@ -0,0 +1,79 @@
+"""Tests for trace-event export."""
+
+import json
+import threading
+
+from mkdocstrings_handlers.nim import tracing
+from mkdocstrings_handlers.nim.handler import NimHandler
+
+
+class TestTracer:
+    """Tests for recording and writing spans."""
+
+    def test_spans_written_with_threads(self, tmp_path):
+        """Test that spans from several threads are written as complete events."""
+        tracing.start(tmp_path / "trace.json")
+        with tracing.span("outer", identifier="m"):
+            with tracing.span("inner"):
+                pass
+            thread = threading.Thread(target=self._record, name="worker")
+            thread.start()
+            thread.join()
+        tracing.stop()
+
+        trace = json.loads((tmp_path / "trace.json").read_text())
+        spans = {event["name"]: event for event in trace["traceEvents"] if event["ph"] == "X"}
+        threads = {
+            event["args"]["name"]
+            for event in trace["traceEvents"]
+            if event["name"] == "thread_name"
+        }
+        assert set(spans) == {"outer", "inner", "worker span"}
+        assert spans["outer"]["args"] == {"identifier": "m"}
+        assert spans["outer"]["dur"] >= spans["inner"]["dur"]
+        assert spans["worker span"]["tid"] != spans["outer"]["tid"]
+        assert "worker" in threads
+
+    @staticmethod
+    def _record():
+        with tracing.span("worker span"):
+            pass
+
+    def test_off_by_default(self, tmp_path):
+        """Test that spans are not recorded and nothing is written without a tracer."""
+        with tracing.span("ignored"):
+            pass
+        tracing.stop()
+
+        assert tracing._tracer is None
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestHandlerTracing:
+    """Tests for tracing a build through the handler."""
+
+    def test_trace_file_written_on_teardown(self, tmp_path, mocker, monkeypatch):
+        """Test that collect and render are traced and written at teardown."""
+        monkeypatch.delenv(tracing.TRACE_ENV_VAR, raising=False)
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "m.nim").write_text("proc m*() = discard\n")
+        handler = NimHandler(
+            paths=["src"],
+            base_dir=tmp_path,
+            config_options={"cache_dir": False, "trace_file": "out/trace.json"},
+            mdx=[],
+            mdx_config={},
+        )
+        mocker.patch.object(
+            handler.collector,
+            "_run_nimdocinfo",
+            return_value={"module": "m", "file": "src/m.nim", "entries": []},
+        )
+
+        handler.collect("m", handler.get_options({}))
+        handler.teardown()
+
+        trace = json.loads((tmp_path / "out" / "trace.json").read_text())
+        names = [event["name"] for event in trace["traceEvents"] if event["ph"] == "X"]
+        assert {"collect", "resolve", "parse module"} <= set(names)
+        assert tracing._tracer is None
@@ -0,0 +1,289 @@
+"""Tests for re-extracting changed files in the background."""
+
+import logging
+import os
+import threading
+
+import pytest
+from mkdocs.plugins import PluginCollection
+
+from mkdocstrings_handlers.nim import watcher
+from mkdocstrings_handlers.nim.cache import SQLiteStore
+from mkdocstrings_handlers.nim.collector import NimCollector
+from mkdocstrings_handlers.nim.handler import NimHandler, get_handler
+from mkdocstrings_handlers.nim.watcher import Watcher
+
+
+class FakeCollector:
+    """Collector recording the files it is asked to extract."""
+
+    def __init__(self, root):
+        self.root = root
+        self.store = None
+        self.extracted = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def _project_roots(self):
+        return [self.root]
+
+    def _extract_file(self, path):
+        self.release.wait(5)
+        self.extracted.append(path.name)
+        return {}
+
+
+@pytest.fixture
+def src(tmp_path):
+    """Create a source directory with one module."""
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "mylib.nim").write_text("proc a*() = discard\n")
+    return src
+
+
+@pytest.fixture
+def polling(monkeypatch):
+    """Make watchers poll, as if watchdog were not installed."""
+
+    def no_watchdog(*_args):
+        raise ImportError("No module named 'watchdog'")
+
+    monkeypatch.setattr(Watcher, "_start_watchdog", no_watchdog)
+
+
+@pytest.fixture
+def serving(monkeypatch):
+    """Act as if mkdocs serve were serving the site."""
+    monkeypatch.setattr(watcher, "_serving", True)
+
+
+@pytest.fixture(autouse=True)
+def _stop_watchers():
+    yield
+    watcher.stop_all()
+
+
+def _save(path, text):
+    path.write_text(text)
+    # Modification times can be coarse; make sure polling sees the change
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestWatcher:
+    """Tests for the watcher itself."""
+
+    @pytest.mark.usefixtures("polling")
+    def test_polling(self, src):
+        """Test that polling finds saved Nim files, and ignores other files."""
+        collector = FakeCollector(src)
+        w = Watcher(collector, poll_interval=0.05)
+        w.start()
+        try:
+            assert w.backend == "polling"
+            _save(src / "mylib.nim", "proc b*() = discard\n")
+            _save(src / "notes.txt", "text")
+
+            threading.Event().wait(0.3)
+            assert w.wait_idle(5)
+        finally:
+            w.stop()
+
+        assert collector.extracted == ["mylib.nim"]
+
+    def test_watchdog(self, src):
+        """Test that watchdog events trigger extraction."""
+        pytest.importorskip("watchdog")
+        collector = FakeCollector(src)
+        w = Watcher(collector)
+        w.start()
+        try:
+            assert w.backend == "watchdog"
+            (src / "other.nim").write_text("proc c*() = discard\n")
+
+            for _ in range(50):
+                if collector.extracted:
+                    break
+                threading.Event().wait(0.1)
+            assert w.wait_idle(5)
+        finally:
+            w.stop()
+
+        assert "other.nim" in collector.extracted
+
+    def test_wait_idle(self, src):
+        """Test that wait_idle blocks while changes are being extracted."""
+        collector = FakeCollector(src)
+        collector.release.clear()
+        w = Watcher(collector)
+        w._start_thread(w._extract_changes)
+        try:
+            w.notify(src / "mylib.nim")
+
+            assert not w.wait_idle(0.3)
+            collector.release.set()
+            assert w.wait_idle(5)
+        finally:
+            w.stop()
+
+        assert collector.extracted == ["mylib.nim"]
+
+    def test_failed_extraction(self, src):
+        """Test that a file failing to extract does not stop the watcher."""
+        collector = FakeCollector(src)
+        extract = collector._extract_file
+
+        def fail_once(path):
+            if not collector.extracted:
+                collector.extracted.append("failed")
+                raise RuntimeError("parse error")
+            return extract(path)
+
+        collector._extract_file = fail_once
+        w = Watcher(collector)
+        w._start_thread(w._extract_changes)
+        try:
+            w.notify(src / "mylib.nim")
+            assert w.wait_idle(5)
+            w.notify(src / "mylib.nim")
+            assert w.wait_idle(5)
+        finally:
+            w.stop()
+
+        assert collector.extracted == ["failed", "mylib.nim"]
+
+    def test_stop_closes_store(self, src, tmp_path):
+        """Test that stopping the watcher closes its collector's SQLite store."""
+        collector = FakeCollector(src)
+        collector.store = SQLiteStore(tmp_path / "extractions.sqlite3")
+        collector.store.put("key", {})
+        w = Watcher(collector)
+        w._start_thread(w._extract_changes)
+
+        w.stop()
+
+        assert collector.store._connection is None
+
+
+@pytest.mark.usefixtures("polling", "serving", "src")
+class TestHandlerWatch:
+    """Tests for the watch option."""
+
+    def _handler(self, tmp_path, **config):
+        return NimHandler(
+            paths=["src"],
+            base_dir=tmp_path,
+            config_options={"watch": True, "cache_dir": ".cache", **config},
+            mdx=[],
+            mdx_config={},
+        )
+
+    def test_shared_across_rebuilds(self, tmp_path, mocker):
+        """Test that handlers of successive rebuilds share one running watcher."""
+        mocker.patch.object(NimCollector, "collect")
+        mocker.patch.object(NimHandler, "_prepare_module")
+        first = self._handler(tmp_path)
+        second = self._handler(tmp_path)
+        other = self._handler(tmp_path, declarations_only=True)
+
+        for handler in (first, second, other):
+            handler.collect("mylib", handler.get_options({}))
+
+        assert first._watcher is second._watcher
+        assert first._watcher is not other._watcher
+        assert first._watcher.collector is not first.collector
+        assert first._watcher.backend == "polling"
+
+    def test_off_by_default(self, tmp_path, mocker):
+        """Test that no watcher is started without the watch option."""
+        mocker.patch.object(NimCollector, "collect")
+        mocker.patch.object(NimHandler, "_prepare_module")
+        handler = self._handler(tmp_path, watch=False)
+
+        handler.collect("mylib", handler.get_options({}))
+
+        assert handler._watcher is None
+        assert not watcher._watchers
+
+    def test_needs_cache(self, tmp_path, mocker, caplog):
+        """Test that watch is disabled with a warning when the cache is disabled."""
+        mocker.patch.object(NimCollector, "collect")
+        mocker.patch.object(NimHandler, "_prepare_module")
+        handler = self._handler(tmp_path, cache_dir=False)
+
+        with caplog.at_level(logging.WARNING):
+            handler.collect("mylib", handler.get_options({}))
+            handler.collect("mylib", handler.get_options({}))
+
+        assert caplog.text.count("watch needs the extraction cache") == 1
+        assert not watcher._watchers
+
+    def test_stopped_by_teardown(self, tmp_path, mocker, monkeypatch):
+        """Test that teardown leaves watchers running under serve, and stops them otherwise."""
+        mocker.patch.object(NimCollector, "collect")
+        mocker.patch.object(NimHandler, "_prepare_module")
+        handler = self._handler(tmp_path)
+        handler.collect("mylib", handler.get_options({}))
+
+        handler.teardown()
+        assert watcher._watchers
+
+        monkeypatch.setattr(watcher, "_serving", False)
+        handler.teardown()
+        assert not watcher._watchers
+
+
+@pytest.mark.usefixtures("polling", "src")
+class TestServeHook:
+    """Tests for starting watchers only under mkdocs serve."""
+
+    def test_not_started_by_build(self, tmp_path, mocker):
+        """Test that a build outside mkdocs serve starts no watcher."""
+        mocker.patch.object(NimCollector, "collect")
+        mocker.patch.object(NimHandler, "_prepare_module")
+        handler = NimHandler(
+            paths=["src"],
+            base_dir=tmp_path,
+            config_options={"watch": True, "cache_dir": ".cache"},
+            mdx=[],
+            mdx_config={},
+        )
+
+        handler.collect("mylib", handler.get_options({}))
+
+        assert handler._watcher is None
+        assert not watcher._watchers
+
+    def test_serve_events(self, tmp_path, mocker, monkeypatch):
+        """Test that the hook added by get_handler tracks mkdocs serve and stops watchers."""
+        monkeypatch.setattr(watcher, "_serving", False)
+        plugins = PluginCollection()
+        config = mocker.Mock(plugins=plugins, config_file_path=str(tmp_path / "mkdocs.yml"))
+        options = {"options": {"watch": True, "cache_dir": ".cache"}}
+        handler = get_handler(options, config, mdx=[], mdx_config={})
+        get_handler(options, config, mdx=[], mdx_config={})
+        assert len(plugins.events["shutdown"]) == 1
+        mocker.patch.object(NimCollector, "collect")
+        mocker.patch.object(NimHandler, "_prepare_module")
+
+        server = object()
+        assert plugins.on_serve(server, config=config, builder=None) is server
+        assert watcher.serving()
+        handler.collect("mylib", handler.get_options({}))
+        assert watcher._watchers
+
+        plugins.on_shutdown()
+        assert not watcher.serving()
+        assert not watcher._watchers
+
+    def test_not_registered_without_watch(self, tmp_path, mocker):
+        """Test that get_handler adds no serve hook unless watch is enabled."""
+        plugins = PluginCollection()
+        config = mocker.Mock(plugins=plugins, config_file_path=str(tmp_path / "mkdocs.yml"))
+
+        get_handler({"options": {"cache_dir": ".cache"}}, config, mdx=[], mdx_config={})
+
+        assert watcher.PLUGIN_NAME not in plugins
+        assert not plugins.events["serve"]
+        assert not plugins.events["shutdown"]